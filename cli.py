@@ -7,7 +7,7 @@ CLI for PyTuring (experimental)
 """
 
 from __future__ import unicode_literals, print_function
-import argparse, pyturing, io, os, sys
+import argparse, io, os, sys
 
 # Python 2.x and 3.x compatibility
 if sys.version_info.major == 2:
@@ -16,31 +16,186 @@ if sys.version_info.major == 2:
 
 # Simple argument parsing CLI
 parser = argparse.ArgumentParser(description="PyTuring CLI")
-parser.add_argument("machine", help="Turing Machine rules source file name")
+parser.add_argument("machine", nargs="?",
+                    help="Turing Machine rules source file name")
+parser.add_argument("--tape",
+                    help="Whitespace-separated input tape from index 0 "
+                         "(asked when not given)")
+parser.add_argument("--moves", type=int,
+                    help="Amount of moves (asked when not given), counted "
+                         "from the start of the run even when resuming, "
+                         "so the same command line continues a run")
+parser.add_argument("--checkpoint", metavar="FILE",
+                    help="Periodically store the run state in this file")
+parser.add_argument("--every", metavar="N", type=int,
+                    help="Amount of moves between checkpoints (100000 "
+                         "when neither this nor --seconds is given)")
+parser.add_argument("--seconds", metavar="T", type=float,
+                    help="Seconds between checkpoints")
+parser.add_argument("--resume", action="store_true",
+                    help="Continue the run stored in the checkpoint file")
+parser.add_argument("--profile", metavar="PATTERN",
+                    help="Profile the time and space growth for input tapes "
+                         "with n copies of this whitespace-separated pattern")
+parser.add_argument("--sizes", default="1,2,4,8,16,32,64,128,256,512,1024",
+                    help="Comma-separated input sizes n for --profile")
+parser.add_argument("--steps", type=int, default=10 ** 6,
+                    help="Maximum amount of moves for each --profile run")
+parser.add_argument("--processes", type=int,
+                    help="Amount of worker processes for --profile")
+parser.add_argument("--window", metavar="RADIUS", type=int,
+                    help="Only show the squares at most RADIUS squares far "
+                         "from the head in the resulting tape")
+parser.add_argument("--runs", type=int,
+                    help="Maximum amount of runs of equal symbols to show "
+                         "in the resulting tape")
+parser.add_argument("--cursor", metavar="INDEX", type=int,
+                    help="Show the resulting tape from this index, like "
+                         "the one told for the squares beyond the --runs")
+parser.add_argument("--utm-benchmark", metavar="N", type=int,
+                    help="Report the guest moves per second of the universal "
+                         "machine simulating N moves of the machine, with "
+                         "and without the host-assisted acceleration")
+parser.add_argument("--max-cells", type=int,
+                    help="Stop the run when the tape would have more than "
+                         "this amount of non-blank cells")
+parser.add_argument("--max-bytes", type=int,
+                    help="Stop the run when the tape would have more than "
+                         "this estimated size in bytes")
+parser.add_argument("--stats", action="store_true",
+                    help="Print the runtime metrics (parse latency, steps, "
+                         "locks, caches) at the end")
+parser.add_argument("--serve", metavar="SOCKET",
+                    help="Daemon mode: keep the parsed machines warm, "
+                         "running the requests sent to this Unix socket")
+parser.add_argument("--socket", metavar="SOCKET",
+                    help="Client mode: send the run to the daemon listening "
+                         "at this Unix socket")
 args = parser.parse_args()
+if args.runs is not None and args.runs < 1:
+    parser.error("The --runs should be positive")
+
+# Daemon mode
+if args.serve:
+    import tmserve
+    try:
+        server = tmserve.Server(args.serve)
+    except EnvironmentError as exc:
+        sys.exit("Can't listen at {}: {}".format(args.serve, exc))
+    print("Listening at {}".format(args.serve))
+    tmserve.serve(server)
+    sys.exit()
+
 machine_filename = args.machine
+if machine_filename is None:
+    parser.error("Machine file name required")
 if not os.path.isfile(machine_filename):
     parser.error("Machine file not found")
 
+# Client mode, without importing (and parsing) anything else
+if args.socket:
+    import tmserve
+    if args.tape is None:
+        args.tape = input("Input tape from index 0 (whitespace-separated):\n")
+    if args.moves is None:
+        args.moves = int(input("\nAmount of moves "
+                               "(machine instructions to follow): "))
+    try:
+        response = tmserve.request(args.socket, machine_filename,
+                                   args.tape.split(), args.moves,
+                                   window=args.window, runs=args.runs,
+                                   cursor=args.cursor,
+                                   max_cells=args.max_cells,
+                                   max_bytes=args.max_bytes)
+    except EnvironmentError as exc:
+        sys.exit("Daemon not available at {}: {}".format(args.socket, exc))
+    if "error" in response:
+        sys.exit(response["error"])
+    print(response["output"])
+    sys.exit()
+
+import pyturing, tmmetrics, tmview
+if args.runs is None:
+    args.runs = tmview.MAX_RUNS
+if args.resume and not (args.checkpoint and
+                        os.path.isfile(args.checkpoint)):
+    parser.error("Checkpoint file not found")
+
 # "Builds" the machine
 with io.open(machine_filename, "r", encoding="utf-8") as f:
-    tm = pyturing.TuringMachine(f.read())
+    source = f.read()
+tm = pyturing.TuringMachine(source)
 print("Machine file open {}\n".format(machine_filename))
 
+# Complexity profiling mode
+if args.profile:
+    import tmprofile
+    pattern = args.profile.split()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    result = tmprofile.profile(source, lambda n: pattern * n, sizes,
+                               args.steps, args.processes)
+    print("{:>10} {:>12} {:>10} {:>10}".format("Size", "Steps", "Extent",
+                                               "Seconds"))
+    for row in result.rows:
+        print("{:>10} {:>12} {:>10} {:>10}".format(
+            row.size, "~{}".format(row.steps) if row.estimated else row.steps,
+            "~{}".format(row.extent) if row.estimated else row.extent,
+            "-" if row.seconds is None else "{:.4f}".format(row.seconds)))
+    for name, fit in [("Time", result.time), ("Space", result.space)]:
+        if fit:
+            print("{}: {} (power law exponent {:.2f})"
+                  .format(name, fit.order, fit.exponent))
+        else:
+            print("{}: not enough halting runs to find the order"
+                  .format(name))
+    if args.stats:
+        print("\n" + tmmetrics.render(), end="")
+    sys.exit()
+
+# Universal machine benchmark mode
+if args.utm_benchmark:
+    import tmutm
+    if args.tape is None:
+        args.tape = input("Input tape from index 0 (whitespace-separated):\n")
+    tm.tape = args.tape.split()
+    result = tmutm.benchmark(tm, args.utm_benchmark)
+    print("Guest moves: {}".format(result.guest_steps))
+    print("Plain: {:.4f} s ({:.1f} moves/s)"
+          .format(result.plain_seconds, result.plain_rate))
+    print("Accelerated: {:.4f} s ({:.1f} moves/s)"
+          .format(result.accelerated_seconds, result.accelerated_rate))
+    if args.stats:
+        print("\n" + tmmetrics.render(), end="")
+    sys.exit()
+
 # Gets some needed inputs
-tm.tape = input("Input tape from index 0 (whitespace-separated):\n").split()
-moves = int(input("\nAmount of moves (machine instructions to follow): "))
-print()
+if args.resume:
+    tm.resume(args.checkpoint)
+    print("Resuming from the checkpoint {} after {} moves"
+          .format(args.checkpoint, tm.steps))
+else:
+    if args.tape is None:
+        args.tape = input("Input tape from index 0 (whitespace-separated):\n")
+    tm.tape = args.tape.split()
+moves = args.moves
+if moves is None:
+    moves = int(input("\nAmount of moves (machine instructions to follow): "))
+    print()
 
 # Run the tape typed as a whitespace-separated line
 print("Running the machine from the index {}".format(tm.index))
-for move in range(moves):
-    tm.move()
+tm.max_cells = args.max_cells
+tm.max_bytes = args.max_bytes
+every = args.every
+if every is None and args.seconds is None:
+    every = 100000
+try: # The moves count from the start of the run, also when resuming
+    tm.run(max(moves - tm.steps, 0), checkpoint=args.checkpoint,
+           every=every, seconds=args.seconds)
+except pyturing.TMMemoryExceeded as exc:
+    print("Memory budget exceeded after {} moves: {}".format(tm.steps, exc))
 
 # Show the resulting configuration
-tape = tm.tape
-first, last = min(tape), max(tape)
-print("Last m-configuration: {}".format(tm.mconf))
-print("Last machine index on the tape: {}".format(tm.index))
-print("Resulting tape (from index {first} to {last}):".format(**locals()))
-print(" ".join(tape.get(idx, "None") for idx in range(first, last + 1)))
+print(tmview.report(tm, args.window, args.runs, args.cursor))
+if args.stats:
+    print("\n" + tmmetrics.render(), end="")
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+# Created on Sun Oct 18 10:31:07 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Test collection configuration (py.test) """
+
+import sys
+
+collect_ignore = []
+if sys.version_info < (3, 7): # No asyncio.run (nor "async def" before 3.6)
+    collect_ignore.append("test_tmasync.py")
@@ -4,10 +4,21 @@
 # MIT Licensed. See COPYING.TXT for more information.
 """ Main application file """
 
-from flask import Flask, render_template, request, jsonify
-from pyturing import TuringMachine
+from flask import (Flask, Response, abort, render_template, request,
+                   jsonify, stream_with_context)
+from pyturing import InstanceTable, TMLocked, TuringMachine, pre_tokenizer
+from tmdecide import Decider
+from threading import Lock
+import json, time, tmgrade, tmmetrics, tmstream, tmview
+
+MAX_CELLS = 10 ** 6 # Memory budget of each simulation tape
+BLOCK_CACHE_SIZE = 10 ** 4 # Compiled blocks of rules kept for any source
 
 app = Flask(__name__)
+editor = TuringMachine() # Recompiled for each simulation request
+editor.max_cells = MAX_CELLS # Also for the copies
+block_cache = InstanceTable(BLOCK_CACHE_SIZE) # Shared by all sessions
+editor_lock = Lock()
 
 @app.route("/")
 def index():
@@ -15,10 +26,78 @@ def index():
 
 @app.route("/", methods=["POST"])
 def ajax_simulate():
-    tm = TuringMachine(request.form["machine"])
-    for el in range(3000):
-      tm.move()
-    return jsonify(tm.tape)
+    with editor_lock:
+      # Only reparses the edited rules not seen in other recent sources
+      editor.recompile(request.form["machine"], block_cache)
+      tm = editor.copy() # Runs without holding the lock
+    tm.reset()
+    decider = Decider(tm, bouncers=False)
+    start_time = time.time()
+    timeout = True # Unless it's proven to cycle
+    try:
+      for el in range(3000):
+        tm.move()
+        certificate = decider.observe()
+        if certificate and certificate.kind == "cycler":
+          # Fast-forward: the configuration repeats with that period
+          for el in range((3000 - tm.steps) % certificate.period):
+            tm.move()
+          timeout = False
+          break
+    except TMLocked:
+      tmmetrics.record_run(tm.steps, time.time() - start_time, locked=True)
+      raise
+    tmmetrics.record_run(tm.steps, time.time() - start_time, timeout=timeout)
+    # Bounded response, optionally paging with the cursor
+    form = {key: int(request.form[key])
+            for key in ["radius", "cursor", "max_runs"]
+            if request.form.get(key)}
+    form["max_runs"] = max(min(form.get("max_runs", tmview.MAX_RUNS),
+                               tmview.MAX_RUNS), 1)
+    if "radius" in form:
+      view = tmview.window(tm, **form)
+    else:
+      view = tmview.view(tm, **form)
+    return jsonify(tmview.as_dict(view))
+
+@app.route("/stream", methods=["POST"])
+def stream():
+    with editor_lock:
+      editor.recompile(request.form["machine"], block_cache)
+      tm = editor.copy()
+    tm.reset()
+    tm.tape = " ".join(pre_tokenizer(request.form.get("tape", ""))).split()
+    steps = min(int(request.form.get("steps", 3000)), 10 ** 7)
+    fps = float(request.form.get("fps", tmstream.FPS))
+    if not fps > 0: # Checked before the response starts
+      abort(400, "The fps should be positive")
+    lines = (json.dumps(frame) + "\n"
+             for frame in tmstream.frames(tm, steps, fps=fps))
+    return Response(stream_with_context(lines),
+                    mimetype="application/x-ndjson")
+
+@app.route("/grade", methods=["POST"])
+def grade():
+    # Cases as a JSON list of {"tape", "expected", "halts", "mconf"} dicts
+    try:
+      cases = tmgrade.load_cases(json.loads(request.form["cases"]))
+    except ValueError as exc: # Also for invalid JSON
+      abort(400, str(exc))
+    steps = min(int(request.form.get("steps", tmgrade.STEPS)), 10 ** 6)
+    grades = tmgrade.grade(request.form["machine"], cases, steps,
+                           max_cells=MAX_CELLS)
+    return jsonify({
+      "passed": sum(g.passed for g in grades),
+      "total": len(grades),
+      "cases": [dict(g._asdict(), certificate=g.certificate and
+                                              g.certificate.kind)
+                for g in grades],
+    })
+
+@app.route("/metrics")
+def metrics():
+    return Response(tmmetrics.render(),
+                    mimetype="text/plain; version=0.0.4")
 
 if __name__ == "__main__":
     app.run(debug=True)
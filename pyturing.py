@@ -5,16 +5,32 @@
 
 from __future__ import unicode_literals, print_function
 from functools import wraps
-from collections import OrderedDict
-import re
+from collections import OrderedDict, deque
+import re, os, sys, json, time, hashlib, tmmetrics
 
-__all__ = ["TMSyntaxError", "TMLocked", "pre_tokenizer", "tokenizer",
-           "raw_rule_generator", "sequence_cant_have",
-           "evaluate_symbol_query", "config_parser",
-           "action_parser", "TuringMachine"]
+__all__ = ["TMSyntaxError", "TMLocked", "TMMemoryExceeded", "pre_tokenizer",
+           "tokenizer", "raw_rule_generator", "sequence_cant_have",
+           "evaluate_symbol_query", "join_parentheses", "split_mconf",
+           "substitute", "config_parser", "action_parser", "rule_blocks",
+           "compile_block", "absence_row", "encode_tape", "decode_tape",
+           "InstanceTable", "TuringMachine"]
 
 __version__ = "0.1dev"
 
+# Python 2.x and 3.x compatibility
+if sys.version_info.major == 2:
+    range = xrange
+
+DESCRIPTION_DIGITS = {"A": "1", "C": "2", "D": "3", "L": "4", "R": "5",
+                      "N": "6", ";": "7"}
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_BATCH = 4096 # Moves between clock readings when checkpointing
+
+MFUNCTION_CACHE_SIZE = 4096 # Default maximum amount of m-function instances
+
+CELL_KEY_BYTES = sys.getsizeof(2 ** 40) # Estimated size of a tape index
+
 
 class TMSyntaxError(SyntaxError):
     """ Syntax errors for a Turing machine code (rules description) """
@@ -24,6 +40,10 @@ class TMLocked(Exception):
     """ No action assigned to current configuration, the machine is locked """
 
 
+class TMMemoryExceeded(Exception):
+    """ The move would make the tape exceed the machine memory budget """
+
+
 def pre_tokenizer(data, comment_symbol="#"):
     """
     Line generator that removes empty lines and comments from the given
@@ -42,6 +62,9 @@ TOKENIZER_REGEX = re.compile(
 )
 
 
+CALL_REGEX = re.compile(r"[^\s()]+\(") # Start of an m-function call
+
+
 def tokenizer(data):
     """
     Lexical tokenizer for raw text data containing Turing machine rules.
@@ -57,7 +80,7 @@ def tokenizer(data):
                 blocks.append(" ")
         elif keep_last and not blocks: # Corner case (starting with an space)
             blocks.append(" ")
-        blocks.extend(re.findall(TOKENIZER_REGEX, line))
+        blocks.extend(TOKENIZER_REGEX.findall(line))
     for token in blocks:
         yield token
     yield "\n"
@@ -112,6 +135,16 @@ def sequence_cant_have(*invalids):
     return decorator
 
 
+@sequence_cant_have("Not", "[", "]")
+def _symbols_without_not(args):
+    """ Tuple of symbols from a single symbol or a "[" ... "]" group """
+    if len(args) == 1:
+        return args
+    if len(args) == 2 or args[0] != "[" or args[-1] != "]":
+        raise TMSyntaxError("Invalid grouping of symbols")
+    return args[1:-1]
+
+
 def evaluate_symbol_query(*args):
     """
     Validate the symbol query and returns a tuple (tuple of symbols,
@@ -126,34 +159,91 @@ def evaluate_symbol_query(*args):
     resource without having to care about how many symbols are in the
     alphabet for a given use of the machine.
     """
-    @sequence_cant_have("Not", "[", "]")
-    def find_tuple_of_symbols_without_not(fargs):
-        if len(fargs) == 1:
-            return fargs
-        if len(fargs) == 2 or fargs[0] != "[" or fargs[-1] != "]":
-            raise TMSyntaxError("Invalid grouping of symbols")
-        return fargs[1:-1]
-
     if not args:
         return tuple(), False # Everything as "not nothing"
     if args[0] == "Not":
         if len(args) == 1:
             raise TMSyntaxError("Missing symbols for the 'Not' keyword")
-        return find_tuple_of_symbols_without_not(args[1:]), False
-    return find_tuple_of_symbols_without_not(args), True
+        return _symbols_without_not(args[1:]), False
+    return _symbols_without_not(args), True
+
+
+def join_parentheses(args, last=False):
+    """
+    Joins the tokens of the m-configuration at the start of the given
+    tokens (or at their end, when last is True), as the m-function calls
+    like ``f(C, B, a)`` are split by the tokenizer. The joined token has no
+    whitespace, i.e., it's ``f(C,B,a)``. The other tokens (symbols and
+    tasks) are kept as they are, even when they have parentheses.
+    """
+    args = tuple(args)
+    edge = args[-1] if last else args[0]
+    if "(" not in edge and ")" not in edge:
+        return args
+    for size in range(1, len(args) + 1):
+        call = "".join(args[-size:] if last else args[:size])
+        if CALL_REGEX.match(call):
+            depth = 0
+            for idx, char in enumerate(call, 1):
+                depth += (char == "(") - (char == ")")
+                if char == ")" and not depth:
+                    break
+            if idx == len(call) and not depth: # A single whole call
+                return args[:-size] + (call,) if last else \
+                       (call,) + args[size:]
+    raise TMSyntaxError("Unbalanced parentheses")
+
+
+def split_mconf(mconf):
+    """
+    Splits the m-configuration in a (name, arguments tuple) pair, where the
+    arguments are the ones in an m-function call (without whitespace), like
+    ``("f", ("e(C,a)", "B", "a"))`` for ``f(e(C,a),B,a)``.
+    """
+    if not mconf.endswith(")") or "(" not in mconf:
+        return mconf, ()
+    name, inner = mconf[:-1].split("(", 1)
+    args, depth, start = [], 0, 0
+    for idx, char in enumerate(inner):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and not depth:
+            args.append(inner[start:idx])
+            start = idx + 1
+    args.append(inner[start:])
+    return name, tuple(args)
+
+
+def substitute(mconf, mapping):
+    """
+    Replaces the m-function parameters in the m-configuration expression
+    by the values in the given mapping, including the nested calls.
+    """
+    if mconf in mapping:
+        return mapping[mconf]
+    name, args = split_mconf(mconf)
+    if not args:
+        return mconf
+    return "{}({})".format(name, ",".join(substitute(arg, mapping)
+                                          for arg in args))
 
 
 def config_parser(*args):
     """
     <config> ::= <m-confs> <symbols>
-    <m-confs> ::= " " | <id> | "[" <id> {<id>} "]"
+    <m-confs> ::= " " | <m-conf> | "[" <m-conf> {<m-conf>} "]"
+    <m-conf> ::= <id> | <id> "(" <m-conf> {"," <m-conf>} ")"
     <symbols> ::= [["Not"] (<id> | "[" <id> {<id>} "]")]
 
     Empty spaces in <m-confis> means "keep the previous input m-configuration
     list <m-confs>". Both "None" and "Any", as symbol <id>s, have special
     meaning: a the "blank"/empty square and a non-"blank"/non-empty square,
-    respectively.
+    respectively. An m-configuration with parentheses is an m-function,
+    whose parameters might appear in the symbols and in the action.
     """
+    args = join_parentheses(args)
     if len(args) == 1:
         return args, []
     return args[:1], args[1:] # For now, only a single m-conf
@@ -168,10 +258,142 @@ def action_parser(*args):
 
     The "P" (for the printing task) isn't separated from the <id> by the
     tokenizer. See TuringMachine.perform for more information about the tasks.
+    The resulting m-configuration might be an m-function call (see
+    config_parser).
     """
+    args = join_parentheses(args, last=True)
     return args[:-1], args[-1]
 
 
+def rule_blocks(data):
+    """
+    Splits the raw string data with the rules in blocks (strings) with a
+    non-indented line and the indented lines that follow it, the ones that
+    keep its m-configuration. A block only ends after a "->". Comments and
+    empty lines are removed.
+    """
+    blocks, arrow = [], False
+    for line in pre_tokenizer(data):
+        if blocks and (line.startswith(" ") or not arrow):
+            blocks[-1] += "\n" + line
+        else:
+            blocks.append(line)
+            arrow = False
+        arrow = arrow or ("->" in line and
+                          "->" in TOKENIZER_REGEX.findall(line))
+    return blocks
+
+
+def compile_block(block):
+    """
+    Parses a block of rules (see rule_blocks), returning a triple with the
+    list of (m-configurations, symbols, evaluated symbol query, action)
+    rules, the set of m-configurations and the set of m-function names
+    found in the rules input. The evaluated symbol query is None for the
+    m-function templates, as their symbols might have parameters.
+    """
+    rules, mconfs, functions = [], set(), set()
+    last_m = ""
+    quad_gen = (config_parser(*config) + action_parser(*action)
+                for config, action in raw_rule_generator(block))
+    for mconfs_in, symbols_in, tasks, mco in quad_gen:
+        if mconfs_in == (" ",):
+            if not last_m:
+                raise TMSyntaxError("Missing m-configuration in "
+                                    "the first rule")
+            mconfs_in = last_m
+        last_m = mconfs_in
+        query = None
+        for mci in mconfs_in:
+            name, params = split_mconf(mci)
+            if params:
+                functions.add(name)
+            else:
+                mconfs.add(mci)
+                query = evaluate_symbol_query(*symbols_in)
+        rules.append((mconfs_in, symbols_in, query, (tasks, mco)))
+    return rules, frozenset(mconfs), frozenset(functions)
+
+
+def absence_row(inv_rules):
+    """
+    Sparse row with the "inverse" rules of an m-configuration, given as a
+    list of (symbols, action) pairs in priority order, where the action
+    applies to the symbols not in the tuple of symbols. It's an
+    (exceptions, default) pair where the default action (or None, when
+    there's no rule) applies to every symbol but the ones in the exceptions
+    dict, which are the symbols of the first rule and their actions (None
+    when no rule applies). Its size depends only on the first rule, and
+    symbols never seen in the rules get the default action.
+    """
+    if not inv_rules:
+        return {}, None
+    first_symbs, default = inv_rules[0]
+    exceptions = {}
+    for symb in first_symbs:
+        exceptions[symb] = next((act for symbs, act in inv_rules[1:]
+                                     if symb not in symbs), None)
+    return exceptions, default
+
+
+def encode_tape(tape):
+    """
+    Compact JSON-friendly representation of a tape dictionary, as a list of
+    ``[start_index, [symbol, symbol, ...]]`` segments of contiguous
+    non-blank squares, sorted by their starting index.
+    """
+    segments = []
+    for idx in sorted(tape):
+        if segments and segments[-1][0] + len(segments[-1][1]) == idx:
+            segments[-1][1].append(tape[idx])
+        else:
+            segments.append([idx, [tape[idx]]])
+    return segments
+
+
+def decode_tape(segments):
+    """ Tape dictionary from the encode_tape segments list """
+    return {start + offset: symbol
+            for start, symbols in segments
+            for offset, symbol in enumerate(symbols)}
+
+
+class InstanceTable(OrderedDict):
+    """
+    Bounded table of m-function instances (or of any other value built by
+    a factory, like the compiled blocks of TuringMachine.recompile), where
+    the least recently used instance is discarded when it's full. The counters tells how many
+    instances were created, found (hits) and discarded (evictions).
+    """
+    def __init__(self, maxsize=MFUNCTION_CACHE_SIZE):
+        super(InstanceTable, self).__init__()
+        self.maxsize = maxsize
+        self.created = self.hits = self.evictions = 0
+
+    def instance(self, mconf, factory):
+        """ Instance for the m-configuration, calling factory when needed """
+        try:
+            value = self.pop(mconf)
+            self.hits += 1
+        except KeyError:
+            value = factory(mconf)
+            self.created += 1
+        self[mconf] = value
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def without(self, functions):
+        """ New table without the instances of the given m-functions """
+        table = InstanceTable(self.maxsize)
+        table.update((mconf, value) for mconf, value in self.items()
+                                    if split_mconf(mconf)[0] not in functions)
+        table.created, table.hits = self.created, self.hits
+        table.evictions = self.evictions
+        return table
+
+
 class TuringMachine(OrderedDict):
     """
     Turing a-machine (automatic-machine) based on his model from "On
@@ -187,40 +409,179 @@ class TuringMachine(OrderedDict):
         - self.tape = []
         - self.mconf = First m-configuration in data (machine source)
 
+        The self.steps counter starts at zero and counts the moves performed.
+        Moves aren't recorded for undoing unless self.enable_undo is called.
+        There's no memory budget for the tape unless self.max_cells and/or
+        self.max_bytes are assigned (see self.check_budget).
+
         If data is empty (no rule is given), self.mconf isn't initialized,
         and should be assigned before any rule querying self[m_conf, symbol]
         and before any self.move() call.
+
+        The rules of m-functions (m-configurations with parameters, like
+        ``f(C, B, a)``) are kept as templates in self.mfunctions, and they're
+        only instantiated when a run reaches them (see self.instances).
         """
         super(TuringMachine, self).__init__()
         self._tape = {} # Tape is a dictionary whose keys are integers
         self.index = 0 # Starting index in tape
+        self.steps = 0 # Amount of moves performed
+        self.undo_log = None # Deque of (mconf, index, overwritten cells)
+        self.max_cells = None # Memory budget, as the amount of tape cells
+        self.max_bytes = None # Memory budget, as the tape size in bytes
         self.inv_dict = OrderedDict() # "Inverse" rules ("Not" and blank),
                                       # with lower priority
-        quad_gen = (config_parser(*config) + action_parser(*action)
-                    for config, action in raw_rule_generator(data))
-        last_m = ""
-        for mconfs_in, symbols_in, tasks, mco in quad_gen:
-            # Rule m-configuration determination
-            if mconfs_in == (" ",):
-                if last_m:
-                    mconfs_in = last_m
+        self.mfunctions = OrderedDict() # Name: (parameters, raw rules)
+        self.instances = InstanceTable() # M-function instances
+        self.blocks = [] # Compiled blocks, see self.recompile
+        self.rows = {} # Absence rows (see absence_row), built when needed
+        self.recompile(data)
+        mconf = self.first_mconf()
+        if mconf is not None:
+            self.mconf = mconf # 1st m-config. is from 1st rule
+
+    def first_mconf(self):
+        """ First m-configuration in the rules (or None), for starting """
+        for text, rules, mconfs, functions in self.blocks:
+            for mconfs_in, symbols_in, query, act in rules:
+                if not split_mconf(mconfs_in[0])[1]:
+                    return mconfs_in[0]
+        return None
+
+    def reset(self):
+        """
+        Restarts the complete configuration, with an empty tape, the index
+        0 and the first m-configuration (unassigned when there's no rule),
+        without moves.
+        """
+        self.tape = []
+        self.index = 0
+        self.steps = 0
+        mconf = self.first_mconf()
+        if mconf is None:
+            self.__dict__.pop("mconf", None)
+        else:
+            self.mconf = mconf
+
+    def recompile(self, data, block_cache=None):
+        """
+        Replaces the rules by the ones in the given raw string data,
+        reparsing only the blocks of rules (see rule_blocks) that changed
+        since the last compilation, and only the ones not found in the
+        block_cache, an optional InstanceTable of compiled blocks by their
+        text that can be shared by several machines. When the changed blocks have the same
+        rule keys (in the same order), only the rules of the m-configurations
+        and m-functions in these blocks are replaced, in place, otherwise the
+        rule dicts are rebuilt from all the compiled blocks. Either way, the
+        result is the same of a fresh parse (including the order of the
+        rules, as seen by self.alphabet, self.mconfs and self.rules_hash).
+        The copies (see self.copy) keep their rules, as they have their own
+        dicts, and the lists and tuples in them are replaced, never changed.
+        Only the absence rows and the m-function instances of what changed
+        are discarded. Nothing changes when there's some TMSyntaxError.
+        Returns the set of m-configurations and m-function names whose rules
+        changed. The metrics (see tmmetrics) aren't updated when there's
+        nothing to parse, like when creating the empty machine of self.copy.
+        """
+        if not (data or self.blocks):
+            return frozenset()
+        start_time = time.time()
+        texts = rule_blocks(data)
+
+        # The changed blocks are the ones between the common prefix/suffix
+        old_blocks = self.blocks
+        size = min(len(old_blocks), len(texts))
+        start = 0
+        while start < size and old_blocks[start][0] == texts[start]:
+            start += 1
+        end = 0
+        while end < size - start and \
+              old_blocks[-1 - end][0] == texts[-1 - end]:
+            end += 1
+        old_region = old_blocks[start:len(old_blocks) - end]
+        cache = {block[0]: block for block in old_region}
+        new_region = []
+        compiled = 0
+        factory = lambda text: (text,) + compile_block(text)
+        for text in texts[start:len(texts) - end]:
+            if text not in cache:
+                if block_cache is None:
+                    cache[text] = factory(text)
+                    compiled += 1
                 else:
-                    raise TMSyntaxError("Missing m-configuration in "
-                                        "the first rule")
+                    created = block_cache.created
+                    cache[text] = block_cache.instance(text, factory)
+                    compiled += block_cache.created - created
+            new_region.append(cache[text])
+        new_blocks = old_blocks[:start] + new_region + \
+                     old_blocks[len(old_blocks) - end:]
+        changed = old_region + new_region
+        mconfs = frozenset().union(*[block[2] for block in changed])
+        functions = frozenset().union(*[block[3] for block in changed])
+
+        # Replace the changed rules, keeping the block order
+        if changed:
+            old_keys = [list(rules) for rules in self._build(
+                old_region, mconfs, functions)]
+            new_keys = [list(rules) for rules in self._build(
+                new_region, mconfs, functions)]
+            if old_keys == new_keys: # In place
+                presence, inv, templates = self._build(new_blocks, mconfs,
+                                                       functions)
+                self.update(presence)
+                self.inv_dict.update(inv)
+                self.mfunctions.update(templates)
             else:
-                if not last_m and not hasattr(self, "mconf"):
-                    self.mconf = mconfs_in[0] # 1st m-config. is from 1st rule
-                last_m = mconfs_in
-
-            # Rule storage
-            for mci in mconfs_in:
-                symbs, presence = evaluate_symbol_query(*symbols_in)
-                act = (tasks, mco)
-                if presence:
-                    for s in symbs:
-                        self.setdefault((mci, s), act) # Changes only if unset
-                else:
-                    self.inv_dict.setdefault(mci, []).append((symbs, act))
+                presence, inv, templates = self._build(new_blocks)
+                self.clear()
+                self.update(presence)
+                self.inv_dict = inv
+                self.mfunctions = templates
+            for mconf in mconfs:
+                self.rows.pop(mconf, None)
+            if functions:
+                self.instances = self.instances.without(functions)
+        self.blocks = new_blocks
+        tmmetrics.BLOCKS_COMPILED.inc(compiled)
+        tmmetrics.BLOCK_CACHE_HITS.inc(len(new_blocks) - compiled)
+        tmmetrics.PARSE_SECONDS.observe(time.time() - start_time)
+        return mconfs | functions
+
+    def _build(self, blocks, mconfs=None, functions=None):
+        """
+        Rules of the given m-configurations and m-functions (all of them
+        when both are None) from the compiled blocks, as a triple of new
+        dicts with the presence rules, "inverse" rules and m-function
+        templates, in the block order.
+        """
+        presence, inv, templates = OrderedDict(), OrderedDict(), OrderedDict()
+        everything = mconfs is None and functions is None
+        mconfs, functions = mconfs or frozenset(), functions or frozenset()
+        for text, rules, block_mconfs, block_functions in blocks:
+            if not (everything or mconfs & block_mconfs
+                               or functions & block_functions):
+                continue
+            for mconfs_in, symbols_in, query, act in rules:
+                for mci in mconfs_in:
+                    if mci not in block_mconfs: # M-function template
+                        name, params = split_mconf(mci)
+                        if not (everything or name in functions):
+                            continue
+                        old_params, trules = \
+                            templates.setdefault(name, (params, []))
+                        if old_params != params:
+                            raise TMSyntaxError("Inconsistent parameters for "
+                                                "the '{}' m-function"
+                                                .format(name))
+                        trules.append((symbols_in,) + act)
+                    elif everything or mci in mconfs:
+                        symbs, flag = query
+                        if flag:
+                            for s in symbs:
+                                presence.setdefault((mci, s), act)
+                        else:
+                            inv.setdefault(mci, []).append((symbs, act))
+        return presence, inv, templates
 
     @property
     def tape(self):
@@ -229,9 +590,18 @@ class TuringMachine(OrderedDict):
     @tape.setter
     def tape(self, value):
         if isinstance(value, dict):
-            self._tape = {k: v for k, v in value.items() if v != "None"}
+            tape = {k: v for k, v in value.items() if v != "None"}
         else:
-            self._tape = {k: v for k, v in enumerate(value) if v != "None"}
+            tape = {k: v for k, v in enumerate(value) if v != "None"}
+        old_tape, self._tape = self._tape, tape
+        if self.max_cells is not None or self.max_bytes is not None:
+            try:
+                self.check_budget()
+            except TMMemoryExceeded:
+                self._tape = old_tape
+                raise
+        if self.undo_log is not None:
+            self.undo_log.clear()
 
     def scan(self):
         """
@@ -278,18 +648,460 @@ class TuringMachine(OrderedDict):
         Perform one rule in the machine, changing its complete configuration
         (self.index, self.tape and self.mconf) where needed, accordingly.
         """
-        tasks, mco = self[getattr(self, "mconf", None), self.scan()]
-        for task in tasks:
-            self.perform(task)
+        mconf = getattr(self, "mconf", None)
+        tasks, mco = self[mconf, self.scan()]
+        if self.max_cells is not None or self.max_bytes is not None:
+            growth = self.tape_growth(tasks)
+            if growth > 0:
+                self.check_budget(growth)
+        if self.undo_log is None:
+            for task in tasks:
+                self.perform(task)
+        else:
+            record = mconf, self.index, self.overwritten_cells(tasks)
+            for task in tasks:
+                self.perform(task)
+            self.undo_log.append(record)
         self.mconf = mco
+        self.steps += 1
+
+    def overwritten_cells(self, tasks):
+        """
+        Tuple of (index, symbol) pairs with the current symbol of every
+        square that would be printed or erased by the given tasks, starting
+        from the current index. Each index appears only once.
+        """
+        cells = OrderedDict()
+        idx = self.index
+        for task in tasks:
+            if task == "R":
+                idx += 1
+            elif task == "L":
+                idx -= 1
+            elif (task == "E" or task.startswith("P")) and idx not in cells:
+                cells[idx] = self.tape.get(idx, "None")
+        return tuple(cells.items())
+
+    def tape_growth(self, tasks):
+        """
+        Amount of cells the tape would gain (or lose, when negative) by
+        performing the given tasks from the current index.
+        """
+        final = {}
+        idx = self.index
+        for task in tasks:
+            if task == "R":
+                idx += 1
+            elif task == "L":
+                idx -= 1
+            elif task == "E":
+                final[idx] = "None"
+            elif task.startswith("P"):
+                final[idx] = task[1:]
+        tape = self.tape
+        return sum((symbol != "None") - (idx in tape)
+                   for idx, symbol in final.items())
+
+    def tape_bytes(self, extra=0):
+        """
+        Estimated memory size of the tape in bytes (the symbols themselves
+        are shared with the rules), with the given amount of extra cells.
+        """
+        return sys.getsizeof(self.tape) + \
+               (len(self.tape) + extra) * CELL_KEY_BYTES
+
+    def check_budget(self, extra=0):
+        """
+        Raises TMMemoryExceeded when the tape with the given amount of extra
+        cells would have more than self.max_cells cells or more than
+        self.max_bytes bytes (see self.tape_bytes). It's checked before the
+        moves that make the tape grow, so the machine stays in the last
+        complete configuration within the budget.
+        """
+        cells = len(self.tape) + extra
+        if self.max_cells is not None and cells > self.max_cells:
+            raise TMMemoryExceeded("The tape would have {} cells, more than "
+                                   "{}".format(cells, self.max_cells))
+        if self.max_bytes is not None:
+            size = self.tape_bytes(extra)
+            if size > self.max_bytes:
+                raise TMMemoryExceeded("The tape would have about {} bytes, "
+                                       "more than {}".format(size,
+                                                             self.max_bytes))
+
+    def enable_undo(self, maxlen=None):
+        """
+        Starts recording each move in self.undo_log, a ring buffer holding
+        at most maxlen moves (or every move when maxlen is None). Only the
+        squares a move overwrites are stored, not the whole tape. Assigning
+        a tape to the machine clears the log.
+        """
+        self.undo_log = deque(maxlen=maxlen)
+
+    def step_back(self, n=1):
+        """
+        Undo the last n moves recorded in self.undo_log, restoring the
+        complete configuration and decrementing self.steps. Raises a
+        ValueError when there's not enough recorded moves.
+        """
+        if self.undo_log is None or n > len(self.undo_log):
+            raise ValueError("Not enough moves in the undo log")
+        for unused in range(n):
+            self.mconf, self.index, cells = self.undo_log.pop()
+            for idx, symbol in cells:
+                if symbol == "None":
+                    self.tape.pop(idx, None)
+                else:
+                    self.tape[idx] = symbol
+            self.steps -= 1
+
+    def seek(self, step):
+        """
+        Goes to the complete configuration after the given amount of moves,
+        stepping back through the undo log or moving forward.
+        """
+        if step < self.steps:
+            self.step_back(self.steps - step)
+        else:
+            self.run(step - self.steps)
+
+    def run(self, steps, checkpoint=None, every=None, seconds=None):
+        """
+        Perform the given amount of moves, as calling self.move() that many
+        times. A TMLocked exception stops the run (it's raised as usual).
+
+        When a checkpoint file name is given, the complete configuration is
+        atomically stored in that file (see self.checkpoint) every ``every``
+        moves and/or every ``seconds`` seconds, besides at the end of the
+        run and when the machine gets locked. The clock is read only once
+        per batch of at most CHECKPOINT_BATCH moves, so checkpointing doesn't
+        slow down the run.
+
+        A TMMemoryExceeded exception (see self.check_budget) stops the run
+        the same way. The run metrics (see tmmetrics) are updated once,
+        after the run.
+        """
+        start_steps, start_time = self.steps, time.time()
+        instances = self.instances
+        start_created, start_hits = instances.created, instances.hits
+        locked = exceeded = False
+        try:
+            self._run(steps, checkpoint, every, seconds)
+        except TMLocked:
+            locked = True
+            raise
+        except TMMemoryExceeded:
+            exceeded = True
+            raise
+        finally:
+            tmmetrics.record_run(self.steps - start_steps,
+                                 time.time() - start_time, locked=locked,
+                                 exceeded=exceeded)
+            tmmetrics.MFUNCTION_INSTANCES.inc(instances.created -
+                                              start_created)
+            tmmetrics.MFUNCTION_CACHE_HITS.inc(instances.hits - start_hits)
+
+    def _moves(self, steps):
+        """
+        Same as calling self.move() the given amount of times, but the
+        checks for the memory budget and the undo log are done once, not in
+        every move. Without them, the complete configuration is kept in
+        local variables while moving.
+        """
+        if self.max_cells is not None or self.max_bytes is not None or \
+           self.undo_log is not None:
+            for unused in range(steps):
+                self.move()
+            return
+        perform = self.perform
+        index, tape = self.index, self.tape
+        mconf = getattr(self, "mconf", None)
+        done = 0
+        try:
+            while done < steps:
+                tasks, mco = self[mconf, tape.get(index, "None")]
+                for task in tasks:
+                    if task == "R":
+                        index += 1
+                    elif task == "L":
+                        index -= 1
+                    else:
+                        self.index = index
+                        perform(task)
+                mconf = mco
+                done += 1
+        finally:
+            self.index = index
+            if done:
+                self.mconf = mconf
+            self.steps += done
+
+    def _run(self, steps, checkpoint, every, seconds):
+        if checkpoint is None:
+            self._moves(steps)
+            return
+        remaining = steps
+        since = 0 # Moves since the last checkpoint
+        last_time = time.time()
+        try:
+            while remaining > 0:
+                batch = min(CHECKPOINT_BATCH, remaining)
+                if every:
+                    batch = min(batch, every - since)
+                self._moves(batch)
+                remaining -= batch
+                since += batch
+                now = time.time()
+                if (every and since >= every) or \
+                   (seconds is not None and now - last_time >= seconds):
+                    self.checkpoint(checkpoint)
+                    since, last_time = 0, now
+        except (TMLocked, TMMemoryExceeded):
+            self.checkpoint(checkpoint)
+            raise
+        if since or not steps: # Otherwise the last batch did it
+            self.checkpoint(checkpoint)
+
+    def arun(self, steps, yield_every=1000):
+        """
+        Coroutine for running the machine inside an asyncio event loop.
+        See tmasync.arun (requires Python 3.6+).
+        """
+        from tmasync import arun
+        return arun(self, steps, yield_every)
+
+    def aprogress(self, steps, yield_every=1000):
+        """
+        Asynchronous iterator of progress snapshots while running the
+        machine. See tmasync.aprogress (requires Python 3.6+).
+        """
+        from tmasync import aprogress
+        return aprogress(self, steps, yield_every)
+
+    def rules_hash(self):
+        """
+        Hexadecimal SHA-1 hash of the rules, including the "inverse" ones.
+        It doesn't depend on the ordering of the presence rules, whose
+        priority was already solved when parsing them.
+        """
+        rules = [sorted(json.dumps(item) for item in self.items()),
+                 list(self.inv_dict.items())]
+        if self.mfunctions:
+            rules.append(list(self.mfunctions.items()))
+        dump = json.dumps(rules)
+        return hashlib.sha1(dump.encode("utf-8")).hexdigest()
+
+    def checkpoint(self, filename):
+        """
+        Atomically stores the complete configuration (self.mconf,
+        self.index and self.tape), the self.steps counter and the rules hash
+        in the given JSON file name, by writing a temporary file first.
+        """
+        data = {
+            "version": CHECKPOINT_VERSION,
+            "rules": self.rules_hash(),
+            "mconf": getattr(self, "mconf", None),
+            "index": self.index,
+            "steps": self.steps,
+            "tape": encode_tape(self.tape),
+        }
+        temp_filename = filename + ".tmp"
+        with open(temp_filename, "w") as f:
+            f.write(json.dumps(data))
+            f.flush()
+            os.fsync(f.fileno())
+        getattr(os, "replace", os.rename)(temp_filename, filename)
+
+    def resume(self, filename):
+        """
+        Loads the complete configuration and the steps counter stored by
+        self.checkpoint, so that the run continues exactly from where it
+        stopped. Raises a ValueError when the checkpoint was created by a
+        machine with other rules.
+        """
+        with open(filename, "r") as f:
+            data = json.loads(f.read())
+        if data.get("version") != CHECKPOINT_VERSION:
+            raise ValueError("Unknown checkpoint version")
+        if data["rules"] != self.rules_hash():
+            raise ValueError("The checkpoint is from a machine with "
+                             "different rules")
+        if data["mconf"] is not None:
+            self.mconf = data["mconf"]
+        self.index = data["index"]
+        self.steps = data["steps"]
+        self.tape = decode_tape(data["tape"])
 
     def __missing__(self, key):
+        """
+        Action from the "inverse" rules, with a lookup in the m-configuration
+        absence row (see absence_row), built in its first query (rows of
+        m-function instances are kept in the instances table).
+        """
         mci, symb = key
-        if mci in self.inv_dict:
-            for symbs, act in self.inv_dict[mci]:
-                if symb not in symbs:
-                    return act
-        raise TMLocked("No rule found for the current configuration")
+        row = self.rows.get(mci)
+        if row is None:
+            if self.mfunctions and mci not in self.inv_dict and \
+                                   split_mconf(mci)[1]:
+                presence, row = self.instances.instance(mci,
+                                                        self._instance_rows)
+                if symb in presence:
+                    return presence[symb]
+            else:
+                row = self.rows[mci] = absence_row(self.inv_dict.get(mci,
+                                                                     []))
+        exceptions, default = row
+        act = exceptions.get(symb, default)
+        if act is None:
+            raise TMLocked("No rule found for the current configuration")
+        return act
+
+    def _instance_rows(self, mconf):
+        presence, inv_rules = self.instantiate(mconf)
+        return presence, absence_row(inv_rules)
+
+    def instantiate(self, mconf):
+        """
+        Rules for the m-function call m-configuration, as a pair with the
+        {symbol: action} presence rules and the [(symbols, action), ...]
+        "inverse" ones. The parameters are replaced by the arguments in
+        the symbols, in the printing tasks and in the resulting
+        m-configurations.
+        """
+        name, args = split_mconf(mconf)
+        params, rules = self.mfunctions.get(name, (args, []))
+        if len(params) != len(args):
+            raise TMSyntaxError("The '{}' m-function has {} parameters"
+                                .format(name, len(params)))
+        mapping = dict(zip(params, args))
+        presence, inv_rules = {}, []
+        for symbols_in, tasks, mco in rules:
+            symbs, flag = evaluate_symbol_query(*[mapping.get(s, s)
+                                                  for s in symbols_in])
+            act = (tuple("P" + mapping.get(task[1:], task[1:])
+                         if task.startswith("P") else task
+                         for task in tasks),
+                   substitute(mco, mapping))
+            if flag:
+                for s in symbs:
+                    presence.setdefault(s, act)
+            else:
+                inv_rules.append((symbs, act))
+        return presence, inv_rules
+
+    def alphabet(self):
+        """
+        List of the symbols used explicitly by some rule, in the order of
+        their first occurrences, starting with the blank "None" symbol.
+        """
+        symbols = ["None"]
+        def add(symbol):
+            if symbol not in symbols:
+                symbols.append(symbol)
+        def add_tasks(tasks):
+            for task in tasks:
+                if task.startswith("P"):
+                    add(task[1:])
+        for (mconf, symbol), (tasks, mco) in self.items():
+            add(symbol)
+            add_tasks(tasks)
+        for rules in self.inv_dict.values():
+            for symbs, (tasks, mco) in rules:
+                for symbol in symbs:
+                    add(symbol)
+                add_tasks(tasks)
+        return symbols
+
+    def mconfs(self):
+        """
+        List of the m-configurations used by some rule (either as input or
+        as output), in the order of their first occurrences, starting with
+        the first m-configuration (when assigned).
+        """
+        mconfs = [self.mconf] if hasattr(self, "mconf") else []
+        def add(mconf):
+            if mconf not in mconfs:
+                mconfs.append(mconf)
+        for (mconf, symbol), (tasks, mco) in self.items():
+            add(mconf)
+            add(mco)
+        for mconf, rules in self.inv_dict.items():
+            add(mconf)
+            for symbs, (tasks, mco) in rules:
+                add(mco)
+        return mconfs
+
+    def standard_rules(self):
+        """
+        Rules in Turing's standard form, as a list of (i, j, k, move, l)
+        tuples meaning ``q_i S_j -> P(S_k) move q_l``, where move is "L",
+        "R" or "N", S_0 is the blank and q_1 is the first m-configuration
+        (see self.alphabet and self.mconfs for the indices). Behaviours with
+        more than a single printing and moving pair of tasks are split,
+        creating new m-configurations after the existing ones.
+        """
+        symbols = self.alphabet()
+        mconfs = self.mconfs()
+        mconf_number = {mconf: i for i, mconf in enumerate(mconfs, 1)}
+        chains = {} # Memoized m-configuration numbers for behaviour tails
+        result = []
+
+        def split(tasks):
+            pairs, printing = [], None
+            for task in tasks:
+                if task in ("L", "R", "N"):
+                    pairs.append((printing, task))
+                    printing = None
+                elif task == "E":
+                    printing = "None"
+                elif task.startswith("P"):
+                    printing = task[1:]
+                else:
+                    raise ValueError("Unknown task")
+            if printing is not None or not pairs:
+                pairs.append((printing, "N"))
+            return pairs
+
+        def chain(pairs, mco):
+            if not pairs:
+                return mconf_number[mco]
+            key = tuple(pairs), mco
+            if key not in chains:
+                chains[key] = i = len(mconfs) + len(chains) + 1
+                l = chain(pairs[1:], mco)
+                printing, move = pairs[0]
+                for j, symbol in enumerate(symbols):
+                    k = j if printing is None else symbols.index(printing)
+                    result.append((i, j, k, move, l))
+            return chains[key]
+
+        for i, mconf in enumerate(mconfs, 1):
+            for j, symbol in enumerate(symbols):
+                try:
+                    tasks, mco = self[mconf, symbol]
+                except TMLocked:
+                    continue
+                pairs = split(tasks)
+                printing, move = pairs[0]
+                k = j if printing is None else symbols.index(printing)
+                result.append((i, j, k, move, chain(pairs[1:], mco)))
+        return sorted(result)
+
+    def standard_description(self):
+        """
+        Turing's standard description of the machine (S.D), as a string
+        like "DADDCRDAA;DAADDRDAAA;" (see self.standard_rules).
+        """
+        return "".join("D{}D{}D{}{}D{};".format("A" * i, "C" * j, "C" * k,
+                                                move, "A" * l)
+                       for i, j, k, move, l in self.standard_rules())
+
+    def description_number(self):
+        """
+        Turing's description number (D.N) of the machine, as a string
+        """
+        return "".join(DESCRIPTION_DIGITS[char]
+                       for char in self.standard_description())
 
     def copy(self):
         """
@@ -302,9 +1114,15 @@ class TuringMachine(OrderedDict):
         # Copy the rules
         tm.update(self)
         tm.inv_dict.update(self.inv_dict)
+        tm.mfunctions.update(self.mfunctions)
+        tm.instances = self.instances # Shared until a recompile
+        tm.blocks = self.blocks
+        tm.max_cells = self.max_cells
+        tm.max_bytes = self.max_bytes
 
         # Copy the complete configuration
         tm.index = self.index
+        tm.steps = self.steps
         if hasattr(self, "mconf"):
             tm.mconf = self.mconf
         tm.tape = self.tape
@@ -25,7 +25,10 @@ metadata = {
   "url": "http://github.com/danilobellini/pyturing",
   "description": "A simple Turing machine simulator using Python.",
   "license": "MIT",
-  "py_modules": ["pyturing"],
+  "py_modules": ["pyturing", "tmasync", "tmbatch", "tmprofile",
+                 "tmenum", "tmdecide", "tmmulti", "tmutm", "tmview",
+                 "tmstream", "tmfuzz", "tmmetrics", "tmdist", "tmserve",
+                 "tmgrade"],
   "tests_require": ["tox"],
   "cmdclass": {"test": Tox},
 }
@@ -6,9 +6,13 @@
 
 from __future__ import unicode_literals, print_function
 import pyturing
-from pyturing import (TMSyntaxError, TMLocked, pre_tokenizer, tokenizer,
+from pyturing import (TMSyntaxError, TMLocked, TMMemoryExceeded,
+                      pre_tokenizer, tokenizer,
                       raw_rule_generator, sequence_cant_have,
-                      evaluate_symbol_query, TuringMachine)
+                      evaluate_symbol_query, join_parentheses, split_mconf,
+                      substitute, rule_blocks, compile_block, absence_row,
+                      encode_tape, decode_tape, InstanceTable,
+                      TuringMachine)
 from pytest import raises, mark
 from types import GeneratorType
 p = mark.parametrize
@@ -502,6 +506,615 @@ class TestTuringMachine(object):
         assert not hasattr(tmcp, "mconf")
 
 
+class TestCheckpoint(object):
+
+    source = (
+        "b None -> P0  R c\n"
+        "c None ->   R   e\n"
+        "e None -> P1  R f\n"
+        "f None ->   R   b\n"
+    )
+
+    @p(("tape", "segments"), [
+        ({}, []),
+        ({0: "a"}, [[0, ["a"]]]),
+        ({-3: "x", -2: "y", 5: "z", 6: "z", 7: "w"},
+         [[-3, ["x", "y"]], [5, ["z", "z", "w"]]]),
+    ])
+    def test_encode_decode_tape(self, tape, segments):
+        assert encode_tape(tape) == segments
+        assert decode_tape(segments) == tape
+
+    def test_run_is_the_same_as_moving(self):
+        tm_run = TuringMachine(self.source)
+        tm_move = TuringMachine(self.source)
+        tm_run.run(37)
+        for unused in range(37):
+            tm_move.move()
+        assert tm_run.steps == tm_move.steps == 37
+        assert tm_run.tape == tm_move.tape
+        assert tm_run.index == tm_move.index
+        assert tm_run.mconf == tm_move.mconf
+
+    @p("source", ["a 0 -> P1 R b\nb -> L PNone c", "a -> R Q b"])
+    def test_run_stops_as_moving(self, source):
+        tm_run = TuringMachine(source)
+        tm_move = TuringMachine(source)
+        tm_run.tape = tm_move.tape = ["0", "x"]
+        with raises((TMLocked, ValueError)):
+            tm_run.run(5)
+        with raises((TMLocked, ValueError)):
+            for unused in range(5):
+                tm_move.move()
+        assert (tm_run.steps, tm_run.mconf, tm_run.index, tm_run.tape) == \
+               (tm_move.steps, tm_move.mconf, tm_move.index, tm_move.tape)
+
+    def test_resume_continues_exactly(self, tmpdir):
+        filename = str(tmpdir.join("run.json"))
+        tm_full = TuringMachine(self.source)
+        tm_full.run(1000)
+        tm_first = TuringMachine(self.source)
+        tm_first.run(413, checkpoint=filename)
+        tm_second = TuringMachine(self.source)
+        tm_second.resume(filename)
+        assert tm_second.steps == 413
+        tm_second.run(587)
+        assert tm_second.steps == tm_full.steps
+        assert tm_second.tape == tm_full.tape
+        assert tm_second.index == tm_full.index
+        assert tm_second.mconf == tm_full.mconf
+        assert tmpdir.listdir() == [tmpdir.join("run.json")] # No temp file
+
+    def test_periodic_checkpoint(self, tmpdir, monkeypatch):
+        filename = str(tmpdir.join("run.json"))
+        saved_steps = []
+        original = TuringMachine.checkpoint
+        def checkpoint(tm, fname):
+            saved_steps.append(tm.steps)
+            original(tm, fname)
+        monkeypatch.setattr(TuringMachine, "checkpoint", checkpoint)
+        TuringMachine(self.source).run(250, checkpoint=filename, every=100)
+        assert saved_steps == [100, 200, 250]
+
+    def test_seconds_with_a_large_every(self, tmpdir, monkeypatch):
+        filename = str(tmpdir.join("run.json"))
+        saved_steps = []
+        original = TuringMachine.checkpoint
+        def checkpoint(tm, fname):
+            saved_steps.append(tm.steps)
+            original(tm, fname)
+        class FakeTime(object): # A second per clock reading
+            now = 0
+            @classmethod
+            def time(cls):
+                cls.now += 1
+                return cls.now
+        tm = TuringMachine(self.source)
+        monkeypatch.setattr(TuringMachine, "checkpoint", checkpoint)
+        monkeypatch.setattr(pyturing, "CHECKPOINT_BATCH", 10)
+        monkeypatch.setattr(pyturing, "time", FakeTime)
+        tm.run(50, checkpoint=filename, every=10 ** 6, seconds=2.5)
+        assert saved_steps == [30, 50]
+
+    def test_checkpoint_when_locked(self, tmpdir):
+        filename = str(tmpdir.join("run.json"))
+        tm = TuringMachine("a -> R b\nb -> R c")
+        with raises(TMLocked):
+            tm.run(10, checkpoint=filename, every=5)
+        tm_resumed = TuringMachine("a -> R b\nb -> R c")
+        tm_resumed.resume(filename)
+        assert tm_resumed.steps == 2
+        assert tm_resumed.index == 2
+        assert tm_resumed.mconf == "c"
+
+    def test_resume_with_other_rules(self, tmpdir):
+        filename = str(tmpdir.join("run.json"))
+        TuringMachine(self.source).run(10, checkpoint=filename)
+        tm = TuringMachine(self.source.replace("P1", "P2"))
+        with raises(ValueError):
+            tm.resume(filename)
+
+    def test_rules_hash_ignores_presence_rules_ordering(self):
+        tm1 = TuringMachine("a 0 -> R a\na 1 -> L a\na Not 2 -> a")
+        tm2 = TuringMachine("a 1 -> L a\na 0 -> R a\na Not 2 -> a")
+        tm3 = TuringMachine("a 1 -> L a\na 0 -> R a\na Not 3 -> a")
+        assert tm1.rules_hash() == tm2.rules_hash() != tm3.rules_hash()
+
+
+class TestUndo(object):
+
+    source = (
+        "b None ->   P0   b\n"
+        "     0 -> R R P1 b\n"
+        "     1 -> R R P0 b\n"
+    )
+
+    @staticmethod
+    def configuration(tm):
+        return tm.mconf, tm.index, dict(tm.tape), tm.steps
+
+    def test_undo_disabled_by_default(self):
+        tm = TuringMachine(self.source)
+        tm.move()
+        assert tm.undo_log is None
+        with raises(ValueError):
+            tm.step_back()
+
+    def test_step_back_each_move(self):
+        tm = TuringMachine(self.source)
+        tm.tape = "1 0 1 1".split()
+        tm.enable_undo()
+        history = []
+        for unused in range(30):
+            history.append(self.configuration(tm))
+            tm.move()
+        for config in reversed(history):
+            tm.step_back()
+            assert self.configuration(tm) == config
+        with raises(ValueError):
+            tm.step_back()
+
+    def test_log_stores_only_overwritten_cells(self):
+        tm = TuringMachine("a -> P1 R P2 L PNone R R a")
+        tm.tape = ["x"]
+        tm.enable_undo()
+        tm.move()
+        assert list(tm.undo_log) == [("a", 0, ((0, "x"), (1, "None")))]
+        assert tm.tape == {1: "2"}
+        tm.step_back()
+        assert tm.tape == {0: "x"}
+
+    def test_seek_and_ring_buffer(self):
+        tm = TuringMachine(self.source)
+        reference = TuringMachine(self.source)
+        tm.enable_undo(maxlen=10)
+        tm.seek(25)
+        assert len(tm.undo_log) == 10
+        reference.run(17)
+        tm.seek(17)
+        assert self.configuration(tm) == self.configuration(reference)
+        with raises(ValueError):
+            tm.seek(14)
+        assert tm.steps == 17
+        reference.run(20)
+        tm.seek(37)
+        assert self.configuration(tm) == self.configuration(reference)
+
+    def test_tape_assignment_clears_log(self):
+        tm = TuringMachine(self.source)
+        tm.enable_undo()
+        tm.run(5)
+        tm.tape = []
+        assert len(tm.undo_log) == 0
+
+
+class TestMemoryBudget(object):
+
+    def test_tape_growth(self):
+        tm = TuringMachine()
+        tm.tape = ["0", "1"]
+        assert tm.tape_growth(["P1", "R", "PNone", "R", "P0"]) == 0
+        assert tm.tape_growth(["R", "R", "P1", "E", "L", "P0"]) == 0
+        assert tm.tape_growth(["L", "Px", "R", "R", "E"]) == 0
+        assert tm.tape_growth(["L", "Px", "R", "E", "L", "L", "P2"]) == 1
+        assert tm.tape_growth(["E", "R", "N", "R", "Px"]) == 0
+        assert tm.tape_growth(["E", "R", "PNone"]) == -2
+
+    def test_max_cells(self):
+        tm = TuringMachine("a -> P1 R P1 R a")
+        tm.max_cells = 7
+        tm.enable_undo()
+        with raises(TMMemoryExceeded):
+            tm.run(10)
+        # The move that would exceed the budget wasn't performed
+        assert (tm.steps, tm.index, len(tm.tape)) == (3, 6, 6)
+        assert len(tm.undo_log) == 3
+        tm.max_cells = None
+        tm.run(10)
+        assert len(tm.tape) == 26
+
+    def test_erasing_doesnt_need_budget(self):
+        tm = TuringMachine("a -> PNone R a")
+        tm.tape = ["1"] * 9
+        tm.max_cells = 5
+        tm.run(20)
+        assert tm.tape == {}
+
+    def test_max_bytes(self):
+        tm = TuringMachine("a -> P1 R a")
+        tm.max_bytes = 10 ** 5
+        with raises(TMMemoryExceeded):
+            tm.run(10 ** 5)
+        assert 100 < tm.steps < 10 ** 4
+        assert tm.tape_bytes(extra=1) > 10 ** 5
+
+    def test_tape_assignment_and_copy(self):
+        tm = TuringMachine("a -> P1 R a")
+        tm.tape = ["0"] * 5
+        tm.max_cells = 4
+        with raises(TMMemoryExceeded):
+            tm.tape = ["0"] * 5
+        assert tm.tape == dict.fromkeys(range(5), "0")
+        tm.tape = ["0", "None", "0", "0"]
+        assert tm.copy().max_cells == 4
+
+
+class TestAbsenceRows(object):
+
+    def test_absence_row(self):
+        assert absence_row([]) == ({}, None)
+        a, b, c = [(("R",), mco) for mco in "abc"]
+        assert absence_row([(("0", "1"), a), (("1", "2"), b), (("1",), c)]) \
+               == ({"0": b, "1": None}, a)
+        assert absence_row([((), a), (("0",), b)]) == ({}, a)
+
+    def test_large_alphabet(self):
+        symbols = ["s{}".format(idx) for idx in range(5000)]
+        tm = TuringMachine("a s0 -> P1 R a\n"
+                           "  Not [{}] -> PNone R b\n"
+                           "  Not [s2 s3] -> R a\n"
+                           "b Not 1 -> L b\n".format(" ".join(symbols[1:])))
+        tm.tape = ["s0", "s1", "s4999", "unseen", "s2"]
+        assert tm.rows == {}
+        tm.run(4)
+        exceptions, default = tm.rows["a"]
+        assert len(exceptions) == 4999
+        assert default == (("PNone", "R"), "b")
+        assert exceptions["s1"] == exceptions["s4999"] == (("R",), "a")
+        assert exceptions["s2"] is None
+        assert (tm.mconf, tm.index, tm.tape) == \
+               ("b", 4, {0: "1", 1: "s1", 2: "s4999", 4: "s2"})
+        tm.run(1)
+        assert list(tm.rows) == ["a", "b"]
+        tm = TuringMachine("a Not [x y] -> R a\n  Not x -> R a")
+        tm.tape = ["y", "x"]
+        with raises(TMLocked):
+            tm.run(3)
+        assert tm.steps == 1
+
+    def test_rows_invalidated_by_recompile(self):
+        tm = TuringMachine("a Not 0 -> R a\nb -> L b")
+        tm.tape = ["1"]
+        tm.run(1)
+        tm[("b", "0")]
+        assert set(tm.rows) == {"a", "b"}
+        tm.recompile("a Not 0 -> L a\nb -> L b")
+        assert list(tm.rows) == ["b"]
+        tm.reset()
+        tm.tape = ["1"]
+        tm.run(1)
+        assert tm.index == -1
+        assert tm.copy().rows == {}
+
+    def test_mfunction_rows(self):
+        tm = TuringMachine("b -> f(b, x)\n"
+                           "f(C, s) s -> PNone C\n"
+                           "  Not [s None] -> R f(C, s)")
+        tm.tape = ["0", "y", "x", "x"]
+        tm.run(4)
+        assert (tm.mconf, tm.index, tm.tape) == ("b", 2, {0: "0", 1: "y",
+                                                          3: "x"})
+        assert list(tm.rows) == ["b"]
+
+
+class TestStandardDescription(object):
+
+    def test_turing_first_example(self): # On p. 240 of his article
+        tm = TuringMachine(
+            "b None -> P0  R c\n"
+            "c None ->   R   e\n"
+            "e None -> P1  R f\n"
+            "f None ->   R   b\n"
+        )
+        assert tm.alphabet() == ["None", "0", "1"]
+        assert tm.mconfs() == ["b", "c", "e", "f"]
+        assert tm.standard_rules() == [(1, 0, 1, "R", 2), (2, 0, 0, "R", 3),
+                                       (3, 0, 2, "R", 4), (4, 0, 0, "R", 1)]
+        assert tm.standard_description() == \
+               "DADDCRDAA;DAADDRDAAA;DAAADDCCRDAAAA;DAAAADDRDA;"
+        assert tm.description_number() == \
+               "31332531173113353111731113322531111731111335317"
+
+    def test_split_behaviours_and_absence_rules(self):
+        tm = TuringMachine(
+            "b None -> P0 b\n"
+            "  Not None -> R R P1 L b\n"
+        )
+        assert tm.standard_rules() == [
+            (1, 0, 1, "N", 1), # Keeps the scanned symbol
+            (1, 1, 1, "R", 2), (1, 2, 2, "R", 2),
+            (2, 0, 0, "R", 3), (2, 1, 1, "R", 3), (2, 2, 2, "R", 3),
+            (3, 0, 2, "L", 1), (3, 1, 2, "L", 1), (3, 2, 2, "L", 1),
+        ]
+
+    def test_locked_configurations_are_skipped(self):
+        tm = TuringMachine("a 1 -> E a\na 2 -> b")
+        assert tm.alphabet() == ["None", "1", "2"]
+        assert tm.mconfs() == ["a", "b"]
+        assert tm.standard_description() == "DADCDNDA;DADCCDCCNDAA;"
+
+
+class TestRecompile(object):
+
+    source = (
+        "b None -> P0 R c  # Turing's first example\n"
+        "c None -> R e\n"
+        "e\n"
+        "  None -> P1 R f\n"
+        "f None -> R b\n"
+        "  0    -> E b\n"
+    )
+
+    def test_rule_blocks(self):
+        assert rule_blocks(self.source) == [
+            "b None -> P0 R c  ",
+            "c None -> R e",
+            "e\n  None -> P1 R f",
+            "f None -> R b\n  0    -> E b",
+        ]
+        assert rule_blocks("a\n0 -> b\nb -> a") == ["a\n0 -> b", "b -> a"]
+        assert rule_blocks("") == []
+
+    def test_compile_block(self):
+        rules, mconfs, functions = compile_block("f None -> R b\n  0 -> E b")
+        assert rules == [(("f",), ("None",), (("None",), True), (("R",), "b")),
+                         (("f",), ("0",), (("0",), True), (("E",), "b"))]
+        assert (mconfs, functions) == ({"f"}, set())
+        rules, mconfs, functions = compile_block("g(a) Not a -> Pa g(a)")
+        assert rules == [(("g(a)",), ("Not", "a"), None, (("Pa",), "g(a)"))]
+        assert (mconfs, functions) == (set(), {"g"})
+        with raises(TMSyntaxError):
+            compile_block("  0 -> E b")
+
+    @p(("old", "new", "changed"), [
+        ("P1 R f", "P0 R f", {"e"}),
+        ("f None -> R b\n", "f None -> R b\n  1 -> b\n", {"f"}),
+        ("c None -> R e\n", "", {"c"}),
+        ("c None -> R e\n", "c None -> R e\nb 0 -> E b\n", {"b"}),
+        ("  0    -> E b", "  0 -> E b", {"f"}), # Whitespace changes
+    ])
+    def test_changed_rules_match_a_fresh_parse(self, old, new, changed):
+        tm = TuringMachine(self.source)
+        source = self.source.replace(old, new)
+        assert tm.recompile(source) == changed
+        fresh = TuringMachine(source)
+        assert dict(tm) == dict(fresh)
+        assert dict(tm.inv_dict) == dict(fresh.inv_dict)
+        assert tm.rules_hash() == fresh.rules_hash()
+
+    def test_changed_rules_keep_their_order(self):
+        tm = TuringMachine(self.source)
+        source = self.source.replace("R b", "L b")
+        tm.recompile(source)
+        assert list(tm.items()) == list(TuringMachine(source).items())
+
+    def test_rule_order_priority(self):
+        tm = TuringMachine("a 0 -> P1 a\nb -> a\na [0 1] -> P2 a\n")
+        assert tm["a", "0"] == (("P1",), "a")
+        assert tm.recompile("a [0 1] -> P2 a\nb -> a\na 0 -> P1 a\n") == \
+               {"a", "b"}
+        assert tm["a", "0"] == (("P2",), "a")
+        assert tm["a", "1"] == (("P2",), "a")
+        tm.recompile("a 0 -> P1 a\nb -> a\n")
+        assert tm["a", "0"] == (("P1",), "a")
+        with raises(TMLocked):
+            tm["a", "1"]
+
+    def test_unchanged_and_invalid_sources(self):
+        tm = TuringMachine(self.source)
+        rules = list(tm.items())
+        assert tm.recompile(self.source + "\n# Comment\n") == set()
+        with raises(TMSyntaxError):
+            tm.recompile(self.source + "g Not -> R e\n")
+        with raises(TMSyntaxError):
+            tm.recompile(self.source.replace("R e", "R f(e"))
+        assert list(tm.items()) == rules
+        assert tm.recompile(self.source.replace("R e", "L e")) == {"c"}
+
+    def test_mfunctions(self):
+        source = "b -> f(c)\nf(C) None -> P1 C\nc -> R b\n"
+        tm = TuringMachine(source)
+        tm.run(3)
+        assert set(tm.instances) == {"f(c)"}
+        assert tm.recompile(source.replace("P1", "P2")) == {"f"}
+        assert tm.mfunctions["f"] == (("C",), [(("None",), ("P2",), "C")])
+        assert len(tm.instances) == 0
+        tm.reset()
+        tm.run(4)
+        assert tm.tape == {0: "2"}
+
+    def test_reset(self):
+        tm = TuringMachine(self.source)
+        tm.run(5)
+        tm.recompile("x -> R x\n" + self.source)
+        tm.reset()
+        assert (tm.mconf, tm.index, tm.steps, tm.tape) == ("x", 0, 0, {})
+        tm.recompile("")
+        tm.reset()
+        assert not hasattr(tm, "mconf")
+        assert len(tm) == len(tm.inv_dict) == 0
+
+    def test_copy_shares_the_compiled_blocks(self):
+        tm = TuringMachine(self.source)
+        other = tm.copy()
+        assert other.recompile(self.source.replace("P1", "P2")) == {"e"}
+        assert tm["e", "None"] == (("P1", "R"), "f")
+        assert other["e", "None"] == (("P2", "R"), "f")
+
+    def test_in_place_edits_keep_the_copies(self):
+        source = "a 0 -> R a\n  Not 0 -> P0 a\nb -> R a\n"
+        tm = TuringMachine(source)
+        other = tm.copy()
+        inv_dict = tm.inv_dict
+        assert tm.recompile(source.replace("P0", "P1")) == {"a"}
+        assert tm.inv_dict is inv_dict # Same keys, so it's patched
+        assert tm.inv_dict["a"] == [(("0",), (("P1",), "a"))]
+        assert other.inv_dict["a"] == [(("0",), (("P0",), "a"))]
+        assert other["a", "1"] == (("P0",), "a")
+
+    def test_block_cache(self):
+        cache = InstanceTable(10)
+        tm = TuringMachine()
+        tm.recompile(self.source, cache)
+        assert cache.created == 4
+        source = self.source.replace("P1", "P2")
+        other = TuringMachine()
+        assert other.recompile(source, cache) == {"b", "c", "e", "f"}
+        assert cache.created == 5
+        assert list(other.items()) == list(TuringMachine(source).items())
+
+    def test_copies_keep_their_mfunctions(self):
+        source = "b -> P0 R f(b)\nf(C) -> P1 R C"
+        tm = TuringMachine(source)
+        other = tm.copy()
+        tm.run(2)
+        tm.recompile(source.replace("P1", "P2"))
+        other.run(4)
+        assert other.tape == {0: "0", 1: "1", 2: "0", 3: "1"}
+        tm.reset()
+        tm.run(4)
+        assert tm.tape == {0: "0", 1: "2", 2: "0", 3: "2"}
+
+    @p("source", [
+        "a 0 -> R b\n  2 -> R c\nb 1 -> R a",
+        "x -> R a\na 0 -> R b\nb 1 -> R a",
+        "b 1 -> R a\na 0 -> R b",
+    ])
+    def test_same_as_a_fresh_parse(self, source):
+        tm = TuringMachine("a 0 -> R b\nb 1 -> R a")
+        tm.recompile(source)
+        tm.reset() # For the first m-configuration
+        fresh = TuringMachine(source)
+        assert list(tm.items()) == list(fresh.items())
+        assert list(tm.inv_dict.items()) == list(fresh.inv_dict.items())
+        assert tm.alphabet() == fresh.alphabet()
+        assert tm.mconfs() == fresh.mconfs()
+        assert tm.standard_description() == fresh.standard_description()
+        assert tm.rules_hash() == fresh.rules_hash()
+
+
+class TestMFunctions(object):
+
+    find_source = ( # Turing's "find" m-function, on p. 235 of his article
+        "b -> f(found, none, x)\n"
+        "f(C, B, a)\n"
+        "  ə      -> L f1(C, B, a)\n"
+        "  Not ə  -> L f(C, B, a)\n"
+        "f1(C, B, a)\n"
+        "  a      -> C\n"
+        "  None   -> R f2(C, B, a)\n"
+        "  Not a  -> R f1(C, B, a)\n"
+        "f2(C, B, a)\n"
+        "  a      -> C\n"
+        "  None   -> R B\n"
+        "  Not a  -> R f1(C, B, a)\n"
+    )
+
+    def test_join_parentheses(self):
+        assert join_parentheses(["f(C,", "B,", "a)", "R"]) == ("f(C,B,a)", "R")
+        assert join_parentheses(["f(e(C,", "a),", "b)"]) == ("f(e(C,a),b)",)
+        for args in [["f(C,", "B"], ["f)"], ["f(a))"]]:
+            with raises(TMSyntaxError):
+                join_parentheses(args)
+        assert join_parentheses(["P(", "R", "f(C,", "a)"], last=True) \
+               == ("P(", "R", "f(C,a)")
+        assert join_parentheses(["f(a,", "g(b),", "c)"], last=True) \
+               == ("f(a,g(b),c)",)
+        assert join_parentheses(["a", "(", ")"]) == ("a", "(", ")")
+        for args in [["P)", "R", "f)"], ["R", "f(x"]]:
+            with raises(TMSyntaxError):
+                join_parentheses(args, last=True)
+
+    def test_parentheses_as_symbols(self):
+        tm = TuringMachine("a ( -> P) R a\n"
+                           "a 0 -> P( R a\n"
+                           "a None -> P(x R b\n"
+                           "b [( )] -> R b\n")
+        assert tm["a", "("] == (("P)", "R"), "a")
+        assert tm["a", "0"] == (("P(", "R"), "a")
+        assert tm["a", "None"] == (("P(x", "R"), "b")
+        assert tm["b", "("] == tm["b", ")"] == (("R",), "b")
+        assert ("b", "()") not in tm
+        tm.tape = ["0", "("]
+        tm.run(3)
+        assert tm.mconf == "b"
+        assert tm.tape == {0: "(", 1: ")", 2: "(x"}
+
+    def test_split_and_substitute(self):
+        assert split_mconf("b") == ("b", ())
+        assert split_mconf("f(e(C,a),B,a)") == ("f", ("e(C,a)", "B", "a"))
+        mapping = {"C": "q", "a": "0"}
+        assert substitute("f(e(C,a),B,a)", mapping) == "f(e(q,0),B,0)"
+        assert substitute("C", mapping) == "q"
+        assert substitute("B", mapping) == "B"
+
+    def test_templates_are_not_expanded(self):
+        tm = TuringMachine(self.find_source)
+        assert tm.mconf == "b"
+        assert len(tm) == 0
+        assert list(tm.inv_dict) == ["b"]
+        assert list(tm.mfunctions) == ["f", "f1", "f2"]
+        assert tm.mfunctions["f1"] == (("C", "B", "a"), [
+            (("a",), (), "C"),
+            (("None",), ("R",), "f2(C,B,a)"),
+            (("Not", "a"), ("R",), "f1(C,B,a)"),
+        ])
+        with raises(TMSyntaxError):
+            TuringMachine("f(a) -> R f(a)\nf(b, c) -> f(b, c)")
+
+    @p(("tape", "mconf", "index"), [
+        ("ə ə 0 1 x 0 x", "found", 4),
+        ("ə ə 0 1 None 0 x", "found", 6),
+        ("ə ə 0 1 None None x", "none", 6),
+    ])
+    def test_find(self, tape, mconf, index):
+        tm = TuringMachine(self.find_source)
+        tm.tape = tape.split()
+        tm.index = 3
+        with raises(TMLocked):
+            tm.run(100)
+        assert (tm.mconf, tm.index) == (mconf, index)
+        assert set(tm.instances) <= {"f(found,none,x)", "f1(found,none,x)",
+                                     "f2(found,none,x)"}
+        assert tm.instances.created == len(tm.instances)
+
+    def test_printing_parameter(self):
+        tm = TuringMachine("b -> pe(c, 1)\n"
+                           "pe(C, a) None -> Pa pe2(C, a)\n"
+                           "          Not None -> R R pe(C, a)\n"
+                           "pe2(C, a) -> L L PNone C\n")
+        tm.tape = ["0"]
+        with raises(TMLocked):
+            tm.run(10)
+        assert tm.tape == {2: "1"}
+        assert (tm.mconf, tm.index) == ("c", 0)
+
+    def test_instances_shared_by_copies(self):
+        tm = TuringMachine(self.find_source)
+        tm.tape = "ə 0 x".split()
+        other = tm.copy()
+        tm.run(3)
+        assert tm.instances.created == 2
+        other.run(3)
+        assert other.instances is tm.instances
+        assert tm.instances.created == 2
+        assert tm.instances.hits == 2
+
+    def test_bounded_table(self):
+        tm = TuringMachine("b -> g(c)\ng(C) -> R g(g(C))")
+        tm.instances.maxsize = 8
+        tm.run(100)
+        assert tm.mconf == "g(" * 100 + "c" + ")" * 100
+        assert len(tm.instances) == 8
+        assert tm.instances.created == 99
+        assert tm.instances.evictions == 91
+
+    def test_rules_hash(self):
+        tm = TuringMachine(self.find_source)
+        other = TuringMachine(self.find_source.replace("L f1", "R f1"))
+        assert tm.rules_hash() != other.rules_hash()
+
+
 class TestTuringMachineBehaviour(object):
 
     def test_turing_first_example(self):
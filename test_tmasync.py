@@ -0,0 +1,72 @@
+#!/usr/bin/env py.test
+# -*- coding: utf-8 -*-
+# Created on Sun Oct 18 10:24:55 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Asyncio cooperative runs testing module """
+
+from pyturing import TMLocked, TuringMachine
+from tmasync import Progress
+from pytest import raises
+import asyncio
+
+SOURCE = (
+    "b None -> P0  R c\n"
+    "c None ->   R   e\n"
+    "e None -> P1  R f\n"
+    "f None ->   R   b\n"
+)
+
+
+def test_arun_is_the_same_as_run():
+    tm = TuringMachine(SOURCE)
+    reference = TuringMachine(SOURCE)
+    asyncio.run(tm.arun(1001, yield_every=100))
+    reference.run(1001)
+    assert tm.steps == 1001
+    assert tm.tape == reference.tape
+    assert tm.index == reference.index
+    assert tm.mconf == reference.mconf
+
+
+def test_aprogress_snapshots():
+    async def collect(tm):
+        return [snapshot async for snapshot in tm.aprogress(10, 4)]
+    tm = TuringMachine(SOURCE)
+    assert asyncio.run(collect(tm)) == [
+        Progress(4, "b", 4, 2),
+        Progress(8, "b", 8, 4),
+        Progress(10, "e", 10, 5),
+    ]
+
+
+def test_concurrent_runs_interleave():
+    order = []
+    async def watch(name, tm):
+        async for snapshot in tm.aprogress(30, 10):
+            order.append(name)
+    async def main():
+        await asyncio.gather(watch("a", TuringMachine(SOURCE)),
+                             watch("b", TuringMachine(SOURCE)))
+    asyncio.run(main())
+    assert order == ["a", "b"] * 3
+
+
+def test_cancel_between_batches():
+    async def main(tm):
+        task = asyncio.ensure_future(tm.arun(10 ** 9, yield_every=50))
+        for unused in range(3):
+            await asyncio.sleep(0)
+        task.cancel()
+        with raises(asyncio.CancelledError):
+            await task
+    tm = TuringMachine(SOURCE)
+    asyncio.run(main(tm))
+    assert 0 < tm.steps < 10 ** 9
+    assert tm.steps % 50 == 0
+
+
+def test_locked_machine():
+    tm = TuringMachine("a -> R b")
+    with raises(TMLocked):
+        asyncio.run(tm.arun(10))
+    assert tm.steps == 1
@@ -0,0 +1,69 @@
+#!/usr/bin/env py.test
+# -*- coding: utf-8 -*-
+# Created on Sun Oct 18 12:20:03 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Batch engine testing module """
+
+from __future__ import unicode_literals, print_function
+from pyturing import TuringMachine
+from tmbatch import is_final, execute, run_batch
+from pytest import mark
+import io
+p = mark.parametrize
+
+with io.open("examples/divisibility_by_3.tm", "r", encoding="utf-8") as f:
+    DIVISIBILITY_BY_3 = f.read()
+
+
+class TestExecute(object):
+
+    def test_final_rule(self):
+        tm = TuringMachine("a -> R b\nb -> N b")
+        assert not is_final(tm, tm[tm.mconf, tm.scan()])
+        result = execute(tm, 100)
+        assert result.halted and not result.locked
+        assert result.steps == 1
+        assert result.extent == 2
+        assert (result.mconf, result.index) == ("b", 1)
+
+    def test_locked(self):
+        result = execute(TuringMachine("a -> L L P1 b"), 100)
+        assert result.halted and result.locked
+        assert result.steps == 1
+        assert result.extent == 3
+        assert result.tape == {-2: "1"}
+
+    def test_memory_budget(self):
+        tm = TuringMachine("a -> P1 R a")
+        tm.max_cells = 10
+        result = execute(tm, 100)
+        assert result.exceeded and not result.halted
+        assert result.steps == 10
+        assert len(result.tape) == 10
+
+    def test_budget(self):
+        tm = TuringMachine("a -> P1 R a")
+        tm.tape = ["0"] * 5
+        result = execute(tm, 100)
+        assert not result.halted
+        assert result.steps == tm.steps == 100
+        assert result.extent == 101
+
+
+@p("processes", [1, 2])
+def test_run_batch(processes):
+    numbers = ["1", "11", "110", "111", "1001", "10110", "1" * 30]
+    tapes = [list(number) for number in numbers]
+    results = run_batch(DIVISIBILITY_BY_3, tapes, 1000, processes)
+    assert [r.tape for r in results] == \
+           [{0: "1" if int(number, 2) % 3 == 0 else "0"}
+            for number in numbers]
+    assert all(r.halted and r.mconf == "loop" for r in results)
+    assert [r.steps for r in results] == [2 * len(n) + 2 for n in numbers]
+
+
+def test_run_batch_memory_budget():
+    tapes = [[], ["1"] * 3, ["1"] * 7]
+    results = run_batch("a -> P1 R a", tapes, 100, 1, max_cells=5)
+    assert [(r.steps, r.exceeded) for r in results] == \
+           [(5, True), (5, True), (7, True)]
@@ -0,0 +1,118 @@
+#!/usr/bin/env py.test
+# -*- coding: utf-8 -*-
+# Created on Sun Oct 18 16:48:21 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Non-halting deciders testing module """
+
+from __future__ import unicode_literals, print_function
+from pyturing import TMLocked, TuringMachine
+from tmdecide import (RECORDS, RECORD_CELLS, Certificate, Decider,
+                     decide)
+from tmenum import enumerate_machines
+from tmbatch import run_batch
+from pytest import mark, raises
+p = mark.parametrize
+
+
+@p(("source", "certificate"), [
+    ("b None -> P0  R c\n" # Turing's first example
+     "c None ->   R   e\n"
+     "e None -> P1  R f\n"
+     "f None ->   R   b\n", Certificate("translated cycler", 1, 4, 4)),
+    ("b None ->   P0   b\n" # Its shorter version
+     "     0 -> R R P1 b\n"
+     "     1 -> R R P0 b\n", Certificate("translated cycler", 2, 2, 4)),
+    ("a None -> P1 L a", Certificate("translated cycler", 1, 1, -1)),
+    ("a -> L b\nb -> loop\nloop -> loop", Certificate("cycler", 2, 1, 0)),
+    ("a -> R b\nb -> L a", Certificate("cycler", 2, 2, 0)),
+    ("a 1    -> R a\n" # Sweeps right, appends a "1", sweeps left
+     "  None -> P1 L b\n"
+     "b 1    -> L b\n"
+     "  None -> R a\n", Certificate("bouncer", 15, 9, 1)),
+    ("a 1    -> L a\n" # Mirrored
+     "  None -> P1 R b\n"
+     "b 1    -> R b\n"
+     "  None -> L a\n", Certificate("bouncer", 15, 9, -1)),
+    ("a 0     -> P1 R a\n" # Right sweep with 0 -> 1, left with 1 -> 0
+     "  None  -> P0 L b\n"
+     "b [0 1] -> P0 L b\n"
+     "  None  -> R a\n", Certificate("bouncer", 15, 9, 1)),
+    ("q1 None -> E R q2\n" # From the enumeration, the word gets rotated
+     "   1    -> E L q1\n"
+     "q2 None -> E L q3\n"
+     "   1    -> P1 R q1\n"
+     "q3 None -> P1 L q1\n", Certificate("bouncer", 17, 17, 2)),
+])
+def test_decide(source, certificate):
+    tm = TuringMachine(source)
+    assert decide(tm, 1000) == certificate
+    assert tm.steps == certificate.start + certificate.period
+    tm.run(3000) # Never halts
+
+
+def test_cycler_period_and_start():
+    tm = TuringMachine("a -> R b\nb -> L c\nc -> L d\nd -> R c")
+    tm.enable_undo()
+    certificate = decide(tm, 100)
+    assert certificate.kind == "cycler"
+    assert certificate.period == 2
+    configuration = tm.mconf, tm.index, dict(tm.tape)
+    tm.seek(certificate.start)
+    tm.run(certificate.period)
+    assert (tm.mconf, tm.index, tm.tape) == configuration
+
+
+def test_halting_machines():
+    tm = TuringMachine("a None -> P1 R a\n  1 -> b")
+    tm.tape = "1"
+    with raises(TMLocked):
+        decide(tm, 1000)
+    tm = TuringMachine("a None -> P1 R b\nb None -> P1 R a")
+    assert decide(tm, 1) is None
+
+
+def test_translated_cycler_needs_blank_tape_ahead():
+    tm = TuringMachine("a None -> R a\n  1 -> b")
+    tm.tape = ["None"] * 20 + ["1"]
+    with raises(TMLocked):
+        decide(tm, 1000)
+
+
+def test_no_false_certificate_for_small_machines():
+    for candidate in enumerate_machines(3, 2, 25):
+        if candidate.halted:
+            with raises(TMLocked):
+                decide(candidate.machine(), 400)
+
+
+def test_bounded_records():
+    tm = TuringMachine( # Turing's second example, neither cycler nor bouncer
+        "b -> P@ R P@ R P0 R R P0 L L o\n"
+        "o 1 -> R Px L L L o\n"
+        "  0 -> q\n"
+        "q [0 1] -> R R q\n"
+        "  None -> P1 L p\n"
+        "p x -> E R q\n"
+        "  @ -> R f\n"
+        "  None -> L L p\n"
+        "f Not None -> R R f\n"
+        "  None -> P0 L L o\n"
+    )
+    decider = Decider(tm)
+    for unused in range(20000):
+        tm.move()
+        assert decider.observe() is None
+    records = decider.records[1]
+    assert decider.counts[1] > len(records) == RECORDS
+    assert max(len(record.cells) for record in records) == RECORD_CELLS
+    assert not records[-1].full
+    assert len(decider.minima[1]) <= decider.hi - decider.lo + 1
+
+
+def test_run_batch_with_decider():
+    source = "a 1 -> R a\n  None -> P1 L b\nb 1 -> L b\n  None -> R a"
+    results = run_batch(source, [[], ["1"] * 5], 10 ** 6, processes=1,
+                        decide=True)
+    assert [r.certificate.kind for r in results] == ["bouncer"] * 2
+    assert not any(r.halted for r in results)
+    assert all(r.steps < 1000 for r in results)
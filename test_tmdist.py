@@ -0,0 +1,98 @@
+#!/usr/bin/env py.test
+# -*- coding: utf-8 -*-
+# Created on Wed Oct 21 10:02:51 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Distributed batch engine testing module """
+
+from __future__ import unicode_literals, print_function
+from tmdist import (ShardFailed, Coordinator, _Dispatcher, _connect,
+                    run_batch, survey, spawn_workers)
+import tmbatch, tmenum
+from pytest import raises
+import io, time
+
+with io.open("examples/divisibility_by_3.tm", "r", encoding="utf-8") as f:
+    DIVISIBILITY_BY_3 = f.read()
+
+
+def test_run_batch():
+    tapes = [list("{:b}".format(n)) for n in range(1, 80)]
+    results = run_batch(DIVISIBILITY_BY_3, tapes, 1000, processes=3,
+                        shard_size=7)
+    expected = tmbatch.run_batch(DIVISIBILITY_BY_3, tapes, 1000, 1)
+    assert [r._replace(seconds=0) for r in results] == \
+           [r._replace(seconds=0) for r in expected]
+
+
+def test_memory_budget():
+    tapes = [[], ["1"] * 5]
+    results = run_batch("a -> P1 R a", tapes, 10 ** 6, processes=2,
+                        max_cells=8, shard_size=1)
+    assert all(r.exceeded and not r.halted for r in results)
+    assert [r.steps for r in results] == [8, 8]
+
+
+def test_survey():
+    assert survey(2, 2, 100, processes=2, shards=6) == \
+           tmenum.survey(2, 2, 100, processes=1, shards=6)
+
+
+def test_dead_worker_lease_and_stealing():
+    dispatcher = _Dispatcher(("batch", None), ["a", "b"], lease=.1,
+                             retries=1)
+    assert dispatcher.take("w1") == ("shard", 0, "a")
+    assert dispatcher.take("w2") == ("shard", 1, "b")
+    assert dispatcher.take("w2") == ("shard", 0, "a") # Stolen
+    assert dispatcher.take("w2") == ("wait",)
+    assert dispatcher.finish("w2", 0, "A")
+    assert not dispatcher.finish("w1", 0, "A") # Duplicate
+    time.sleep(.15) # Now w2 is "dead", only w3 sends heartbeats
+    assert dispatcher.take("w3") == ("shard", 1, "b")
+    assert dispatcher.attempts == [0, 1]
+    time.sleep(.15)
+    dispatcher.heartbeat("w4")
+    with raises(ShardFailed):
+        dispatcher.wait_result(1, .01)
+    assert dispatcher.take("w4") == ("done",)
+
+
+def test_ghost_worker():
+    tapes = [["1"] * n for n in range(12)]
+    job = ("batch", (DIVISIBILITY_BY_3, 100, False, None, None))
+    with Coordinator(job, [[tape] for tape in tapes],
+                     lease=.5) as coordinator:
+        ghost = _connect(coordinator.address, coordinator.authkey)
+        assert ghost.take("ghost")[:2] == ("shard", 0) # Never finished
+        workers = spawn_workers(coordinator.address, 2, coordinator.authkey)
+        results = [shard[0] for shard in coordinator.results()]
+        for process in workers:
+            process.join()
+    assert [r.tape for r in results] == \
+           [{0: "1" if n % 2 == 0 else "0"} for n in range(12)] # 2^n - 1
+
+
+def test_default_local_workers():
+    tapes = [list("{:b}".format(n)) for n in range(1, 20)]
+    results = run_batch(DIVISIBILITY_BY_3, tapes, 1000, shard_size=4)
+    assert [r.tape for r in results] == \
+           [{0: "1" if n % 3 == 0 else "0"} for n in range(1, 20)]
+
+
+def test_authentication_key():
+    job = ("batch", (DIVISIBILITY_BY_3, 100, False, None, None))
+    with Coordinator(job, []) as first, Coordinator(job, []) as second:
+        assert len(first.authkey) == 32
+        assert first.authkey != second.authkey
+        with raises(Exception):
+            _connect(first.address, second.authkey)
+    with raises(ValueError):
+        Coordinator(job, [], address=("0.0.0.0", 0))
+    with Coordinator(job, [], address=("0.0.0.0", 0),
+                     authkey=b"secret") as coordinator:
+        assert coordinator.authkey == b"secret"
+
+
+def test_failing_shard():
+    with raises(ShardFailed):
+        run_batch(DIVISIBILITY_BY_3, [["1"], 5], 100, processes=1,
+                  shard_size=1, retries=2)
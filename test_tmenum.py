@@ -0,0 +1,54 @@
+#!/usr/bin/env py.test
+# -*- coding: utf-8 -*-
+# Created on Sun Oct 18 14:05:19 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Machine enumeration testing module """
+
+from __future__ import unicode_literals, print_function
+from pyturing import TMLocked
+from tmenum import enumerate_machines, survey
+from pytest import mark, raises
+p = mark.parametrize
+
+
+def test_tree_normal_form_two_states():
+    candidates = list(enumerate_machines(2, 2, 100))
+    rules = [candidate.rules for candidate in candidates]
+    assert len(set(rules)) == len(rules) == 57
+    first_rules = set(dict(rule)["q1", "None"] for rule in rules if rule)
+    assert all(tasks[1] == "R" for tasks, mco in first_rules) # No mirror
+    assert all(len(rule) < 4 for rule in rules) # Some rule must halt
+
+
+def test_candidate_machine():
+    candidates = [c for c in enumerate_machines(2, 2, 100) if c.halted]
+    best = max(candidates, key=lambda c: c.steps)
+    tm = best.machine()
+    assert (tm.mconf, tm.index, tm.tape, tm.steps) == ("q1", 0, {}, 0)
+    tm.run(best.steps)
+    assert best.steps == 5
+    with raises(TMLocked):
+        tm.move()
+    assert best.standard_description() == tm.standard_description()
+    assert best.description_number() == tm.description_number()
+
+
+@p("shards", [2, 3, 7])
+def test_shards_partition_the_machines(shards):
+    full = set(c.rules for c in enumerate_machines(3, 2, 25))
+    sharded = [c.rules for shard in range(shards)
+                       for c in enumerate_machines(3, 2, 25, shard, shards)]
+    assert len(sharded) == len(full)
+    assert set(sharded) == full
+
+
+@p(("states", "symbols", "steps", "processes"), [
+    (2, 2, 5, 1),
+    (3, 2, 20, 2), # Busy beavers (halting rule not counted)
+    (2, 3, 37, 2),
+])
+def test_survey_busy_beavers(states, symbols, steps, processes):
+    result = survey(states, symbols, 60, processes=processes, shards=5)
+    assert result.champion_steps == steps
+    assert result.machines == result.halting + result.holdouts
+    assert result.champion.startswith("DADDCRDAA;")
@@ -0,0 +1,95 @@
+#!/usr/bin/env py.test
+# -*- coding: utf-8 -*-
+# Created on Tue Oct 20 15:02:44 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Differential fuzzing testing module """
+
+from __future__ import unicode_literals, print_function
+from pyturing import TuringMachine
+from tmfuzz import (ENGINES, Case, register, reference, random_source,
+                    compare, shrink, fuzz)
+from pytest import fixture, mark
+import random
+p = mark.parametrize
+
+
+@fixture
+def broken_engine():
+    """ Engine that doesn't erase with PNone """
+    @register("broken")
+    def broken(source, tape, checkpoints, max_cells):
+        return reference(source.replace("PNone", "N"), tape, checkpoints,
+                         max_cells)
+    yield "broken"
+    del ENGINES["broken"]
+
+
+def test_random_source():
+    rng = random.Random(42)
+    sources = [random_source(rng) for unused in range(300)]
+    for source in sources:
+        TuringMachine(source) # No TMSyntaxError
+    text = "\n".join(sources)
+    for feature in ["\n  ", "->\n", "\n    ->", "Not ", "[", "PNone", "#",
+                    "\nf(A)\n", " PA ", " f(b)"]:
+        assert feature in text
+
+
+def test_reference_locked():
+    case = Case("a -> P1 R b\nb 1 -> a", ["0", "1", "1"], [1, 2, 5, 9],
+                None)
+    snapshots = list(reference(*case))
+    assert [snap.steps for snap in snapshots] == [1, 2, 5, 5]
+    assert [snap.locked for snap in snapshots] == [False] * 3 + [True]
+    assert snapshots[-1].tape == {0: "1", 1: "1", 2: "1"}
+    assert compare(case) is None
+
+
+def test_reference_mfunctions_and_budget():
+    case = Case("b -> f(c)\n"
+                "f(C)\n"
+                "  Not [0 x] -> R f(C)\n"
+                "  x -> Px R C\n"
+                "  0 -> P1 R f(C)\n"
+                "c -> P0 R c\n",
+                ["None", "0", "x"], [1, 2, 3, 4, 6, 10], 4)
+    snapshots = list(reference(*case))
+    assert [snap.mconf for snap in snapshots] == \
+           ["f(c)", "f(c)", "f(c)", "c", "c", "c"]
+    assert [snap.exceeded for snap in snapshots] == [False] * 5 + [True]
+    assert snapshots[-1].steps == 6
+    assert snapshots[-1].tape == {1: "1", 2: "x", 3: "0", 4: "0"}
+    assert compare(case) is None
+    assert compare(case._replace(max_cells=None)) is None
+
+
+@p("seed", range(3))
+def test_engines_agree(seed):
+    assert fuzz(60, seed=seed) == []
+
+
+def test_shrink(broken_engine):
+    case = Case("a 0 -> PNone R a\n"
+                "  1 -> P0 R b\n"
+                "b Not x -> L PNone a\n"
+                "c\n"
+                "  [0 1] -> PNone R c",
+                ["0", "1", "0", "x", "0"], [20, 40, 60], None)
+    divergence = compare(case)
+    assert divergence.engine == "broken"
+    assert divergence.checkpoint == 20
+    small = shrink(divergence)
+    assert small.engine == "broken"
+    assert len(small.case.source) < len(case.source) // 3
+    assert small.case.checkpoints == [1]
+    assert len(small.case.tape) <= 1
+    assert compare(small.case) == small
+
+
+def test_fuzz_finds_divergences(broken_engine):
+    divergences = fuzz(300, seed=1, engines=[broken_engine])
+    assert divergences
+    for divergence in divergences:
+        assert "PNone" in divergence.case.source
+        assert len(divergence.case.source.splitlines()) <= 5
+        assert len(divergence.case.checkpoints) == 1
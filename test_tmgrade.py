@@ -0,0 +1,132 @@
+#!/usr/bin/env py.test
+# -*- coding: utf-8 -*-
+# Created on Wed Oct 21 16:20:14 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Coding Dojo grading engine testing module """
+
+from __future__ import unicode_literals, print_function
+from tmgrade import Case, tape_hash, load_cases, grade
+from threading import Thread
+import pytest
+import io
+
+with io.open("examples/divisibility_by_3.tm", "r", encoding="utf-8") as f:
+    DIVISIBILITY_BY_3 = f.read()
+
+RUNAWAY = "a -> R a" # Never halts, nor prints anything
+
+# Binary counter growing to the left, never halting nor repeating itself
+COUNTER = """
+inc
+  1        -> P0 L inc
+  [0 None] -> P1 R back
+back
+  [0 1] -> R back
+  None  -> L inc
+"""
+
+
+class TestTapeHash(object):
+
+    def test_equivalent_tapes(self):
+        assert tape_hash("1 0 None") == tape_hash(["1", "0"]) \
+                                     == tape_hash({1: "0", 0: "1", 5: "None"})
+
+    def test_different_tapes(self):
+        assert tape_hash("1 0") != tape_hash("0 1")
+        assert tape_hash("1") != tape_hash("None 1")
+        assert tape_hash("") != tape_hash("0")
+
+
+class TestLoadCases(object):
+
+    def test_defaults_and_dict_tapes(self):
+        cases = load_cases([{"tape": {"0": "1", "2": "1"}},
+                            {"tape": ["1"], "expected": {"-1": "0"},
+                             "halts": None, "mconf": "loop"}])
+        assert cases == [Case({0: "1", 2: "1"}, None, True, None),
+                         Case(["1"], {-1: "0"}, None, "loop")]
+
+    @pytest.mark.parametrize("data", [
+        {"tape": "1"},
+        [["1", "1"]],
+        [{"expected": "1"}],
+        [{"tape": "1", "output": "1"}],
+        [{"tape": {"a": "1"}}],
+        [{"tape": [1, 0]}],
+        [{"tape": "1", "expected": 3}],
+        [{"tape": "1", "halts": "yes"}],
+        [{"tape": "1", "mconf": 0}],
+    ])
+    def test_invalid(self, data):
+        with pytest.raises(ValueError):
+            load_cases(data)
+
+
+class TestGrade(object):
+
+    def test_divisibility_by_3(self):
+        cases = [Case("{:b}".format(n).replace("", " ").strip(),
+                      "1" if n % 3 == 0 else "0", True, "loop")
+                 for n in range(1, 30)]
+        grades = grade(DIVISIBILITY_BY_3, cases)
+        assert all(g.passed and g.halted and not g.locked for g in grades)
+        assert grades[0].steps < 10
+
+    def test_wrong_output(self):
+        grades = grade(DIVISIBILITY_BY_3, [("1 1", "0", True, None),
+                                           ("1 1", None, True, "mod0")])
+        assert [g.passed for g in grades] == [False, False]
+        assert grades[0].reason == "Wrong output"
+        assert grades[0].digest == tape_hash("1")
+        assert grades[1].reason == "Wrong final m-configuration"
+
+    def test_dict_cases(self):
+        grades = grade(DIVISIBILITY_BY_3, [{"tape": ["1", "1", "0"],
+                                            "expected": "1"},
+                                           {"tape": "1 0"}])
+        assert [g.passed for g in grades] == [True, True]
+
+    def test_early_non_halting_verdict(self):
+        steps = 10 ** 5
+        grades = grade(RUNAWAY, [Case("1", "1", True, None),
+                                 Case("1", None, False, None),
+                                 Case("1", None, None, None)], steps)
+        assert grades[0].reason.startswith("Never halts")
+        assert grades[1].passed and grades[2].passed
+        assert all(g.certificate and g.steps < steps for g in grades)
+
+    def test_halted_but_expected_not_to(self):
+        grade_, = grade(DIVISIBILITY_BY_3, [Case("1", "0", False, None)])
+        assert not grade_.passed
+        assert grade_.reason == "Halted"
+
+    def test_steps_budget(self):
+        grade_, = grade(COUNTER, [{"tape": ""}], 50)
+        assert grade_.reason == "Didn't halt within the steps budget"
+        assert grade_.steps == 50
+
+    def test_locked_halts(self):
+        grade_, = grade("a 0 -> P1 R a", [{"tape": "0 0 1",
+                                               "expected": "1 1 1"}])
+        assert grade_.passed and grade_.locked
+
+    def test_memory_budget(self):
+        grade_, = grade(COUNTER, [{"tape": ""}], max_cells=4)
+        assert grade_.reason == "Memory budget exceeded"
+        assert len(grade_.digest) == 40
+
+    def test_concurrent_threads(self):
+        cases = [{"tape": "1 1 0", "expected": "1", "mconf": "loop"}] * 20
+        results = {}
+        def target(name, source):
+            results[name] = grade(source, cases)
+        threads = [Thread(target=target, args=(name, source))
+                   for name, source in [("div3", DIVISIBILITY_BY_3),
+                                        ("other", "a -> P0 b")] * 4]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert all(g.passed for g in results["div3"])
+        assert not any(g.passed for g in results["other"])
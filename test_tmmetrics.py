@@ -0,0 +1,92 @@
+#!/usr/bin/env py.test
+# -*- coding: utf-8 -*-
+# Created on Tue Oct 20 17:21:36 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Runtime metrics testing module """
+
+from __future__ import unicode_literals, print_function
+from pyturing import TMLocked, TuringMachine
+from tmbatch import execute
+from tmmetrics import Registry, REGISTRY
+from pytest import fixture, raises
+
+
+@fixture
+def values():
+    """ Function returning the default registry sample values """
+    REGISTRY.reset()
+    yield REGISTRY.samples
+    REGISTRY.reset()
+
+
+def test_render():
+    registry = Registry()
+    steps = registry.counter("steps_total", "Moves")
+    seconds = registry.histogram("seconds", "Duration", buckets=[1, .1])
+    assert registry.counter("steps_total", "Other help") is steps
+    with raises(ValueError):
+        registry.histogram("steps_total", "Moves")
+    steps.inc(5)
+    steps.inc()
+    for value in [.05, .5, .7, 3]:
+        seconds.observe(value)
+    assert registry.render() == "\n".join([
+        "# HELP steps_total Moves",
+        "# TYPE steps_total counter",
+        "steps_total 6",
+        "# HELP seconds Duration",
+        "# TYPE seconds histogram",
+        'seconds_bucket{le="0.1"} 1',
+        'seconds_bucket{le="1.0"} 3',
+        'seconds_bucket{le="+Inf"} 4',
+        "seconds_sum 4.25",
+        "seconds_count 4",
+    ]) + "\n"
+    registry.reset()
+    assert registry.samples()["seconds_count"] == 0
+
+
+def test_run_metrics(values):
+    tm = TuringMachine("a -> P1 R b\nb -> R a")
+    tm.run(100)
+    tm.run(20)
+    assert values()["pyturing_runs_total"] == 2
+    assert values()["pyturing_steps_total"] == 120
+    assert values()["pyturing_run_seconds_count"] == 2
+    tm.move() # Single moves aren't runs
+    assert values()["pyturing_steps_total"] == 120
+    with raises(TMLocked):
+        TuringMachine("a 0 -> R a").run(10)
+    assert values()["pyturing_runs_total"] == 3
+    assert values()["pyturing_locks_total"] == 1
+
+
+def test_parse_metrics(values):
+    source = "a -> R b\nb -> R c\nc -> R a"
+    tm = TuringMachine(source)
+    assert values()["pyturing_blocks_compiled_total"] == 3
+    tm.recompile(source.replace("c -> R a", "c -> L a"))
+    assert values()["pyturing_blocks_compiled_total"] == 4
+    assert values()["pyturing_block_cache_hits_total"] == 2
+    assert values()["pyturing_parse_seconds_count"] == 2
+    for unused in range(10): # Copies and empty machines aren't parsed
+        tm.copy()
+    TuringMachine()
+    assert values()["pyturing_parse_seconds_count"] == 2
+
+
+def test_mfunction_cache_metrics(values):
+    tm = TuringMachine("b -> P0 R f(b)\nf(C) -> P1 R C")
+    tm.run(10)
+    assert values()["pyturing_mfunction_instances_total"] == 1
+    assert values()["pyturing_mfunction_cache_hits_total"] == 4
+
+
+def test_batch_timeouts(values):
+    execute(TuringMachine("a -> R a"), 50)
+    execute(TuringMachine("a -> R b"), 50)
+    execute(TuringMachine("a -> N a"), 50)
+    assert values()["pyturing_runs_total"] == 3
+    assert values()["pyturing_steps_total"] == 51
+    assert values()["pyturing_locks_total"] == 1
+    assert values()["pyturing_timeouts_total"] == 1
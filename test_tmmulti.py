@@ -0,0 +1,139 @@
+#!/usr/bin/env py.test
+# -*- coding: utf-8 -*-
+# Created on Mon Oct 19 10:02:37 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Multi-tape Turing machines testing module """
+
+from __future__ import unicode_literals, print_function
+from pyturing import TMLocked, TMSyntaxError
+from tmmulti import (MultiTapeMachine, ReducedMachine, compile_tasks,
+                     verify_reduction)
+from pytest import mark, raises
+import random
+p = mark.parametrize
+
+COPY = """
+copy
+  0    | None -> R | P0 R copy
+  1    | None -> R | P1 R copy
+  None | None -> | L back
+back
+  | Not None -> | L back
+  | None     -> | R done
+"""
+
+
+def test_compile_tasks():
+    assert compile_tasks(["P1", "R", "E", "N", "L", "PNone"]) == \
+           (("P", "1"), ("M", 1), ("P", "None"), ("M", -1), ("P", "None"))
+    with raises(TMSyntaxError):
+        compile_tasks(["X"])
+
+
+def test_rules_and_tapes_amount():
+    mtm = MultiTapeMachine(COPY)
+    assert mtm.size == 2
+    assert mtm.mconf == "copy"
+    assert mtm["copy", ("1", "None")] == (((("M", 1),),
+                                           (("P", "1"), ("M", 1))), "copy")
+    assert mtm["back", ("0", "1")] == (((), (("M", -1),)), "back")
+    assert mtm["back", ("None", "None")] == (((), (("M", 1),)), "done")
+    assert MultiTapeMachine("a -> R a").size == 1
+    assert MultiTapeMachine("a -> | | R a", tapes=3).size == 3
+    with raises(TMSyntaxError):
+        MultiTapeMachine("a 0 | 1 -> R | R | R a")
+    with raises(TMSyntaxError):
+        MultiTapeMachine(" -> | R a")
+
+
+@p("size", [0, 1, 5, 30])
+def test_copy_linear_steps(size):
+    mtm = MultiTapeMachine(COPY)
+    word = ["1" if n % 3 else "0" for n in range(size)]
+    mtm.tapes = [word, []]
+    with raises(TMLocked):
+        mtm.run(10 * size + 10)
+    assert mtm.steps == 2 * size + 2
+    assert mtm.mconf == "done"
+    assert mtm.tapes == [dict(enumerate(word))] * 2
+    assert mtm.indices == [size, 0]
+
+
+def test_priority_and_absence_queries():
+    mtm = MultiTapeMachine("a 1 | 1 -> P0 | P0 b\n"
+                           "  1 |   -> P2 | P2 b\n"
+                           "    | 1 -> P3 | P3 b\n")
+    for tapes, expected in [(["1", "1"], "0"), (["1", []], "2"),
+                            ([[], "1"], "3")]:
+        mtm.mconf = "a"
+        mtm.tapes = tapes
+        mtm.move()
+        assert mtm.tapes[0].get(0, mtm.tapes[1].get(0)) == expected
+    mtm.mconf = "a"
+    mtm.tapes = [[], []]
+    with raises(TMLocked):
+        mtm.move()
+
+
+def test_copy_is_independent():
+    mtm = MultiTapeMachine(COPY)
+    mtm.tapes = [["0", "1"], []]
+    other = mtm.copy()
+    mtm.run(3)
+    assert other.steps == 0
+    assert other.tapes == [{0: "0", 1: "1"}, {}]
+    assert other.indices == [0, 0]
+
+
+def test_reduced_machine():
+    mtm = MultiTapeMachine(COPY)
+    mtm.tapes = [["1", "0"], []]
+    mtm.indices = [0, 1]
+    reduced = ReducedMachine(mtm)
+    assert reduced.tape == {0: "[1|None", 1: "0|[None"}
+    assert reduced.decode() == ([{0: "1", 1: "0"}, {}], [0, 1])
+    with raises(TMLocked):
+        reduced.run(1000)
+    assert reduced.decode() == ([{0: "1", 1: "0"}, {1: "1", 2: "0"}], [2, 1])
+    assert reduced.mconf[:2] == ("scan", "done")
+
+
+def test_verify_reduction_quadratic_steps():
+    mtm = MultiTapeMachine(COPY)
+    counts = []
+    for size in [10, 20, 40]:
+        mtm.tapes = [["1"] * size, []]
+        counts.append(verify_reduction(mtm, 2 * size + 1))
+    assert counts[1] > 3 * counts[0]
+    assert counts[2] > 3 * counts[1]
+
+
+def test_verify_reduction_random_machines():
+    rnd = random.Random(32)
+    tasks = ["R", "L", "P0", "P1", "E", "N"]
+    queries = ["0", "1", "None", "Not 0", "", "[0 1]"]
+    for unused in range(30):
+        size = rnd.randint(1, 3)
+        lines = []
+        actions = [" | ".join(" ".join(rnd.choice(tasks)
+                                       for n in range(rnd.randint(0, 3)))
+                              for tape in range(size))
+                   for rule in range(6)]
+        for mconf in "abc":
+            lines.append("{} {} -> {} {}".format(
+                mconf, " | ".join(rnd.choice(queries) for n in range(size)),
+                actions.pop(), rnd.choice("abc")))
+            lines.append("{} -> {} {}".format(mconf, actions.pop(),
+                                              rnd.choice("abc")))
+        mtm = MultiTapeMachine("\n".join(lines), tapes=size)
+        mtm.tapes = [[rnd.choice(["0", "1", "None"]) for n in range(5)]
+                     for tape in range(size)]
+        mtm.indices = [rnd.randint(-2, 6) for tape in range(size)]
+        assert verify_reduction(mtm, 20) > 20
+
+
+def test_verify_reduction_max_moves():
+    mtm = MultiTapeMachine(COPY)
+    mtm.tapes = [["1"] * 10, []]
+    with raises(ValueError):
+        verify_reduction(mtm, 21, max_moves=50)
@@ -0,0 +1,64 @@
+#!/usr/bin/env py.test
+# -*- coding: utf-8 -*-
+# Created on Sun Oct 18 12:34:48 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Complexity profiler testing module """
+
+from __future__ import unicode_literals, print_function
+from tmprofile import fit_order, predict, profile, memory_report
+from pytest import mark, approx, importorskip
+import math
+p = mark.parametrize
+
+
+@p(("order", "func"), [
+    ("O(1)", lambda n: 7),
+    ("O(log n)", lambda n: 3 * math.log(n + 1) + 1),
+    ("O(n)", lambda n: 4 * n + 2),
+    ("O(n log n)", lambda n: 5 * n * math.log(n + 1) + 2),
+    ("O(n^2)", lambda n: n * n + 3),
+    ("O(2^n)", lambda n: 2 ** n + 3),
+])
+def test_fit_order(order, func):
+    sizes = [1, 2, 3, 5, 8, 13, 21]
+    fit = fit_order(sizes, [func(n) for n in sizes])
+    assert fit.order == order
+    assert predict(fit, 34) == approx(func(34), rel=.05)
+
+
+def test_fit_order_without_data():
+    assert fit_order([], []) is None
+    assert fit_order([3, 3], [5, 6]) is None
+
+
+def test_profile_with_extrapolation():
+    source = ( # Moves the rightmost "1" in the tape to its left end
+        "seek 1    -> R seek\n"
+        "     None -> L back\n"
+        "back 1    -> E L walk\n"
+        "walk 1    -> L walk\n"
+        "     None -> P1 stop\n"
+    )
+    sizes = [1, 2, 4, 8, 16, 32, 10 ** 6]
+    result = profile(source, lambda n: ["1"] * n, sizes, 10 ** 4,
+                     processes=1)
+    assert [row.size for row in result.rows] == sizes
+    assert [row.estimated for row in result.rows] == [False] * 6 + [True]
+    assert result.time.order == result.space.order == "O(n)"
+    assert result.rows[-1].steps == approx(2 * 10 ** 6 + 1, rel=.01)
+
+
+def test_memory_report():
+    importorskip("tracemalloc")
+    source = "a -> P1 R a"
+    report = memory_report(source, [], 5000)
+    assert (report.steps, report.stop) == (5000, "steps")
+    assert report.tape > 5000 * 8
+    assert report.trace < 1000 # No undo log
+    assert report.peak >= report.tape + report.rules
+    undo = memory_report(source, [], 5000, undo=True)
+    assert undo.trace > 5000 * 8
+    exceeded = memory_report(source, [], 5000, max_cells=100)
+    assert (exceeded.steps, exceeded.stop) == (100, "memory")
+    locked = memory_report("a 0 -> R a", ["0"] * 9, 50)
+    assert (locked.steps, locked.stop) == (9, "locked")
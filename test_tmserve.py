@@ -0,0 +1,141 @@
+#!/usr/bin/env py.test
+# -*- coding: utf-8 -*-
+# Created on Wed Oct 21 14:21:09 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Persistent daemon mode testing module """
+
+from __future__ import unicode_literals, print_function
+from tmserve import MachineCache, Server, request
+from threading import Thread
+import pytest
+import io, os, socket, time
+
+with io.open("examples/divisibility_by_3.tm", "r", encoding="utf-8") as f:
+    DIVISIBILITY_BY_3 = f.read()
+
+
+@pytest.fixture
+def machine_file(tmp_path):
+    filename = str(tmp_path / "machine.tm")
+    with io.open(filename, "w", encoding="utf-8") as f:
+        f.write(DIVISIBILITY_BY_3)
+    return filename
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = Server(str(tmp_path / "tm.sock"))
+    thread = Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def touch(filename, contents, mtime):
+    with io.open(filename, "w", encoding="utf-8") as f:
+        f.write(contents)
+    os.utime(filename, (mtime, mtime))
+
+
+class TestMachineCache(object):
+
+    def test_reuse_while_unchanged(self, machine_file):
+        cache = MachineCache()
+        tm = cache.machine(machine_file)
+        assert cache.machine(machine_file) is tm
+        assert cache.parses == 1
+
+    def test_same_hash_keeps_the_machine(self, machine_file):
+        cache = MachineCache()
+        tm = cache.machine(machine_file)
+        touch(machine_file, DIVISIBILITY_BY_3, time.time() + 10)
+        assert cache.machine(machine_file) is tm
+        assert cache.parses == 1
+
+    def test_changed_contents_reparse(self, machine_file):
+        cache = MachineCache()
+        tm = cache.machine(machine_file)
+        touch(machine_file, "a -> P1 R a", time.time() + 10)
+        assert cache.machine(machine_file) is not tm
+        assert cache.parses == 2
+
+
+class TestServer(object):
+
+    def test_request(self, server, machine_file):
+        response = request(server.server_address, machine_file, "1 1 0", 100)
+        assert not response["locked"]
+        assert response["steps"] == 100
+        assert response["mconf"] == "loop"
+        assert response["tape"] == [[0, "1"]]
+        assert "Resulting tape" in response["output"]
+        assert server.cache.parses == 1
+
+        # Same machine, warm
+        response = request(server.server_address, machine_file,
+                           ["1", "1", "1"], 100, window=1)
+        assert response["tape"] == [[0, "0"]]
+        assert server.cache.parses == 1
+
+    def test_cursor(self, server, machine_file):
+        touch(machine_file, "a -> P1 R P0 R a", time.time())
+        response = request(server.server_address, machine_file, [], 5,
+                           runs=5, cursor=6)
+        assert response["output"].endswith("\n1 0 1 0 [None]") # Head at 10
+        response = request(server.server_address, machine_file, [], 5,
+                           runs=2)
+        assert response["output"].endswith("from the index 2)")
+        assert "error" in request(server.server_address, machine_file, [],
+                                  10, runs=-1)
+
+    def test_memory_budget(self, server, machine_file):
+        touch(machine_file, "a -> P1 R a", time.time())
+        response = request(server.server_address, machine_file, [], 100,
+                           max_cells=10)
+        assert response["exceeded"]
+        assert response["steps"] == 10
+
+    def test_errors(self, server, machine_file, tmp_path):
+        missing = str(tmp_path / "missing.tm")
+        assert "error" in request(server.server_address, missing, [], 1)
+        touch(machine_file, "a ->", time.time())
+        assert "error" in request(server.server_address, machine_file, [], 1)
+
+        # Still serving
+        touch(machine_file, DIVISIBILITY_BY_3, time.time() + 10)
+        response = request(server.server_address, machine_file, "1 1", 50)
+        assert response["tape"] == [[0, "1"]]
+
+    def test_invalid_request(self, server):
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(server.server_address)
+        client.sendall(b"not json\n")
+        assert b"Invalid request" in client.recv(4096)
+        client.close()
+
+    def test_socket_removed(self, tmp_path):
+        path = str(tmp_path / "stale.sock")
+        Server(path).server_close()
+        assert not os.path.exists(path)
+
+    def test_stale_socket_replaced(self, tmp_path):
+        path = str(tmp_path / "stale.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path) # Never listening, as a daemon that died
+        stale.close()
+        assert os.path.exists(path)
+        Server(path).server_close()
+
+    def test_running_daemon_kept(self, server):
+        with pytest.raises(EnvironmentError):
+            Server(server.server_address)
+        assert os.path.exists(server.server_address)
+
+    def test_other_files_kept(self, machine_file):
+        with pytest.raises(EnvironmentError):
+            Server(machine_file)
+        with io.open(machine_file, "r", encoding="utf-8") as f:
+            assert f.read() == DIVISIBILITY_BY_3
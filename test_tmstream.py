@@ -0,0 +1,110 @@
+#!/usr/bin/env py.test
+# -*- coding: utf-8 -*-
+# Created on Tue Oct 20 11:52:19 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Delta frame streaming testing module """
+
+from __future__ import unicode_literals, print_function
+from pyturing import TuringMachine
+from tmstream import keyframe, frames, apply_frame
+from pytest import mark
+import itertools, json
+p = mark.parametrize
+
+SOURCE = ( # Counts in binary, from the right to the left
+    "inc None -> P1 back\n"
+    "    0    -> P1 back\n"
+    "    1    -> P0 L inc\n"
+    "back [0 1] -> R back\n"
+    "     None  -> L inc\n"
+)
+
+
+def fake_clock(period):
+    """ Clock function that advances period seconds after each call """
+    counter = itertools.count()
+    return lambda: next(counter) * period
+
+
+def replay(frame_list):
+    state = None
+    for frame in frame_list:
+        state = apply_frame(state, json.loads(json.dumps(frame)))
+    return state
+
+
+def configuration(tm):
+    return {"steps": tm.steps, "mconf": tm.mconf, "index": tm.index,
+            "tape": tm.tape}
+
+
+def test_keyframe():
+    tm = TuringMachine(SOURCE)
+    tm.tape = ["1", "None", "0"]
+    assert keyframe(tm) == {"type": "key", "steps": 0, "mconf": "inc",
+                            "index": 0, "tape": [[0, ["1"]], [2, ["0"]]]}
+
+
+def test_delta_frame_per_move():
+    tm = TuringMachine(SOURCE)
+    frame_list = list(frames(tm, 5, fps=None))
+    assert len(frame_list) == 6
+    assert frame_list[1] == {"type": "delta", "steps": 1, "mconf": "back",
+                             "index": 0, "cells": [[0, "1"]]}
+    assert frame_list[2]["cells"] == []
+    assert frame_list[-1]["locked"] is False
+    assert replay(frame_list) == configuration(tm)
+
+
+@p(("fps", "period", "every"), [
+    (1, .25, 4), # A frame after each 4 clock readings
+    (1, 1, 1), # A frame after each clock reading
+    (4, 1, 1),
+])
+def test_frame_rate(fps, period, every):
+    tm = TuringMachine(SOURCE)
+    frame_list = list(frames(tm, 256 * 100, fps=fps,
+                             clock=fake_clock(period)))
+    deltas = frame_list[1:-1]
+    assert len(deltas) == 99 // every # No clock reading in the last move
+    assert [frame["steps"] for frame in deltas] == \
+           list(range(256 * every, 256 * 100, 256 * every))
+    assert frame_list[-1]["steps"] == 256 * 100
+    assert replay(frame_list) == configuration(tm)
+
+
+def test_keyframes_and_late_joiners():
+    tm = TuringMachine(SOURCE)
+    frame_list = list(frames(tm, 1000, fps=None, keyframe_every=7))
+    kinds = [frame["type"] for frame in frame_list]
+    assert kinds[:9] == ["key"] + ["delta"] * 6 + ["key", "delta"]
+    assert replay(frame_list) == configuration(tm)
+    late = frame_list[20:] # Deltas before a keyframe are ignored
+    assert late[0]["type"] == "delta"
+    assert replay(late) == configuration(tm)
+
+
+def test_locked():
+    tm = TuringMachine("a -> P1 R b\nb -> R c")
+    frame_list = list(frames(tm, 10))
+    assert [frame["type"] for frame in frame_list] == ["key", "delta"]
+    assert frame_list[-1] == {"type": "delta", "steps": 2, "mconf": "c",
+                              "index": 2, "cells": [[0, "1"]],
+                              "locked": True, "exceeded": False}
+
+
+def test_memory_budget():
+    tm = TuringMachine("a -> P1 R a")
+    tm.max_cells = 5
+    frame_list = list(frames(tm, 100, fps=None))
+    assert frame_list[-1]["exceeded"] is True
+    assert frame_list[-1]["locked"] is False
+    assert frame_list[-1]["steps"] == 5
+
+
+def test_compact_frames():
+    tm = TuringMachine(SOURCE)
+    tm.tape = {idx: "x" for idx in range(10, 5000, 2)} # Far away squares
+    frame_list = list(frames(tm, 256 * 50, fps=1, clock=fake_clock(1)))
+    sizes = [len(json.dumps(frame)) for frame in frame_list[1:-1]]
+    assert max(sizes) * 50 < len(json.dumps(frame_list[0]))
@@ -0,0 +1,151 @@
+#!/usr/bin/env py.test
+# -*- coding: utf-8 -*-
+# Created on Mon Oct 19 16:40:12 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Universal Turing machine testing module """
+
+from __future__ import unicode_literals, print_function
+from pyturing import TMLocked, TuringMachine
+from tmutm import (encode, decode, universal_machine, is_cycle_start,
+                   run_guest, fast_forward, benchmark)
+from tmenum import enumerate_machines
+from pytest import mark, raises
+import itertools, tmutm
+p = mark.parametrize
+
+TURING_FIRST_EXAMPLE = (
+    "b None -> P0  R c\n"
+    "c None ->   R   e\n"
+    "e None -> P1  R f\n"
+    "f None ->   R   b\n"
+)
+
+BUSY_BEAVER_4 = (
+    "q1 None -> P1 R q2\n"
+    "   1    -> P1 L q2\n"
+    "q2 None -> P1 L q1\n"
+    "   1    -> E  L q3\n"
+    "q3 None -> P1 R q3\n"
+    "   1    -> P1 L q4\n"
+    "q4 None -> P1 R q4\n"
+    "   1    -> E  R q1\n"
+)
+
+
+def guest_tape(utm, tm, left):
+    """ Guest tape dict, with the symbols and indices of the machine """
+    guest = decode(utm)
+    symbols = tm.alphabet()
+    return {idx - left: symbols[symbol]
+            for idx, symbol in enumerate(guest.cells) if symbol}
+
+
+def test_encode():
+    tm = TuringMachine(TURING_FIRST_EXAMPLE)
+    assert "".join(encode(tm)) == \
+           "DADDCRDAA;DAADDRDAAA;DAAADDCCRDAAAA;DAAAADDRDA;::A___::H__"
+    tm.tape = ["1", "None", "0"]
+    tm.index = 1
+    tm.mconf = "e"
+    assert "".join(encode(tm, left=1)).split("::")[1:] == \
+           ["A___", "D__DCCH__DC_"]
+    tm.tape = ["2"]
+    with raises(ValueError):
+        encode(tm)
+
+
+def test_decode():
+    tm = TuringMachine(TURING_FIRST_EXAMPLE)
+    guest = decode(universal_machine(tm))
+    assert guest.rules == {(1, 0): (1, "R", 2), (2, 0): (0, "R", 3),
+                           (3, 0): (2, "R", 4), (4, 0): (0, "R", 1)}
+    assert (guest.state, guest.cells, guest.head) == (1, [0], 0)
+    assert (guest.states, guest.width) == (4, 2)
+    utm = universal_machine(tm)
+    utm.move()
+    assert not is_cycle_start(utm)
+    with raises(ValueError):
+        decode(utm)
+
+
+@p(("source", "steps", "left"), [
+    (TURING_FIRST_EXAMPLE, 8, 0),
+    (BUSY_BEAVER_4, 30, 10),
+])
+def test_plain_run_matches_native_run(source, steps, left):
+    tm = TuringMachine(source)
+    utm = universal_machine(tm, left)
+    assert run_guest(utm, steps) == steps
+    assert is_cycle_start(utm)
+    mconfs = tm.mconfs() # The standard description starts with tm.mconf
+    tm.run(steps)
+    guest = decode(utm)
+    assert guest_tape(utm, tm, left) == tm.tape
+    assert guest.head - left == tm.index
+    assert guest.state == mconfs.index(tm.mconf) + 1
+
+
+def test_accelerated_run_matches_plain_run():
+    machines = itertools.islice(enumerate_machines(2, 3, 30), 0, 400, 20)
+    for tm in [candidate.machine() for candidate in machines]:
+        utms = [universal_machine(tm, left=3) for unused in "ab"]
+        locked = []
+        for utm, accelerate in zip(utms, [False, True]):
+            try:
+                run_guest(utm, 12, accelerate)
+            except TMLocked:
+                locked.append(accelerate)
+        assert locked in ([], [False, True])
+        assert utms[0].tape == utms[1].tape
+        assert (utms[0].mconf, utms[0].index) == (utms[1].mconf,
+                                                  utms[1].index)
+
+
+def test_leftmost_cell():
+    tm = TuringMachine("a -> R b\nb -> L L c")
+    for accelerate in [False, True]:
+        utm = universal_machine(tm)
+        with raises(TMLocked):
+            run_guest(utm, 3, accelerate)
+        utm = universal_machine(tm, left=1)
+        assert run_guest(utm, 3, accelerate) == 3
+
+
+def test_fast_forward():
+    tm = TuringMachine(TURING_FIRST_EXAMPLE)
+    utm = universal_machine(tm)
+    assert fast_forward(utm, 1000) == 1000
+    assert utm.steps == 0
+    tm.run(1000)
+    assert guest_tape(utm, tm, 0) == tm.tape
+    run_guest(utm, 2) # Continues from the fast forwarded tape
+    tm.run(2)
+    assert guest_tape(utm, tm, 0) == tm.tape
+    utm.move()
+    with raises(ValueError):
+        fast_forward(utm, 1)
+
+
+def test_universal_machine_in_itself():
+    inner = universal_machine(TuringMachine(TURING_FIRST_EXAMPLE))
+    outer = universal_machine(inner, left=1) # Rewinding visits index -1
+    assert fast_forward(outer, 3000) == 3000
+    inner.run(3000)
+    assert guest_tape(outer, inner, 1) == inner.tape
+    assert decode(outer).head - 1 == inner.index
+
+
+def test_benchmark():
+    result = benchmark(TuringMachine(TURING_FIRST_EXAMPLE), 8)
+    assert result.guest_steps == 8 # Both runs ended with the same tape
+    assert result.plain_rate > 0 and result.accelerated_rate > 0
+    assert result.plain_seconds >= 0 and result.accelerated_seconds >= 0
+
+
+def test_benchmark_divergence(monkeypatch):
+    original = tmutm.run_guest
+    def run_guest(utm, steps, accelerate=False):
+        return original(utm, steps - accelerate, accelerate)
+    monkeypatch.setattr(tmutm, "run_guest", run_guest)
+    with raises(ValueError):
+        benchmark(TuringMachine(TURING_FIRST_EXAMPLE), 8)
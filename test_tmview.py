@@ -0,0 +1,87 @@
+#!/usr/bin/env py.test
+# -*- coding: utf-8 -*-
+# Created on Tue Oct 20 10:12:05 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Tape views testing module """
+
+from __future__ import unicode_literals, print_function
+from pyturing import TuringMachine
+from tmview import (Run, TapeView, tape_runs, view, window, render,
+                    as_dict, report)
+from pytest import mark
+p = mark.parametrize
+
+
+@p(("tape", "start", "stop", "max_runs", "expected"), [
+    ({}, 0, 3, None, ([Run(0, "None", 3)], None)),
+    ({0: "1", 1: "1", 2: "0", 4: "0"}, -1, 6, None, ([
+        Run(-1, "None", 1), Run(0, "1", 2), Run(2, "0", 1),
+        Run(3, "None", 1), Run(4, "0", 1), Run(5, "None", 1),
+    ], None)),
+    ({0: "1", 1: "1", 2: "0", 4: "0"}, 1, 4, None, ([
+        Run(1, "1", 1), Run(2, "0", 1), Run(3, "None", 1),
+    ], None)),
+    ({0: "1", 1: "1", 2: "0", 4: "0"}, 0, 5, 2, ([
+        Run(0, "1", 2), Run(2, "0", 1),
+    ], 3)),
+    ({-10 ** 9: "a", 10 ** 9: "b"}, -10 ** 9, 10 ** 9 + 1, None, ([
+        Run(-10 ** 9, "a", 1), Run(1 - 10 ** 9, "None", 2 * 10 ** 9 - 1),
+        Run(10 ** 9, "b", 1),
+    ], None)),
+])
+def test_tape_runs(tape, start, stop, max_runs, expected):
+    assert tape_runs(tape, start, stop, max_runs) == expected
+
+
+def test_view_and_paging():
+    tm = TuringMachine()
+    tm.tape = {-10 ** 9: "a", 0: "1", 1: "1", 2: "1", 10 ** 9: "b"}
+    tm.index = 1
+    first = view(tm, max_runs=2)
+    assert first == TapeView(start=-10 ** 9, stop=10 ** 9 + 1, head=1,
+                             runs=[Run(-10 ** 9, "a", 1),
+                                   Run(1 - 10 ** 9, "None", 10 ** 9 - 1)],
+                             cursor=0)
+    second = view(tm, cursor=first.cursor, max_runs=2)
+    assert second.runs == [Run(0, "1", 3), Run(3, "None", 10 ** 9 - 3)]
+    last = view(tm, cursor=second.cursor, max_runs=2)
+    assert last.runs == [Run(10 ** 9, "b", 1)]
+    assert last.cursor is None
+
+
+def test_window():
+    tm = TuringMachine()
+    tm.tape = {-10 ** 9: "a", 0: "1", 1: "1", 2: "1", 10 ** 9: "b"}
+    tm.index = 10 ** 9
+    assert window(tm, 2) == TapeView(start=10 ** 9 - 2, stop=10 ** 9 + 3,
+                                     head=10 ** 9, runs=[
+                                         Run(10 ** 9 - 2, "None", 2),
+                                         Run(10 ** 9, "b", 1),
+                                         Run(10 ** 9 + 1, "None", 2),
+                                     ], cursor=None)
+
+
+def test_render_and_as_dict():
+    tm = TuringMachine()
+    tm.tape = ["0", "1", "1", "1", "1", "1", "None", "None", "0"]
+    tm.index = 3
+    tape_view = view(tm)
+    assert render(tape_view) == "0 1 1 [1] 1 1 None None 0"
+    assert render(tape_view, max_repeat=1) == "0 1*2 [1] 1*2 None*2 0"
+    tm.index = 100
+    assert render(view(tm)) == "0 1*5 None None 0 None*91 [None]"
+    assert as_dict(window(tm, 0)) == {"start": 100, "stop": 101, "head": 100,
+                                      "runs": [[100, "None", 1]],
+                                      "cursor": None}
+
+
+def test_report_paging():
+    tm = TuringMachine()
+    tm.tape = {-10 ** 9: "a", 0: "1", 1: "1", 2: "1", 10 ** 9: "b"}
+    tm.index = 1
+    first = report(tm, max_runs=2)
+    assert first.endswith("(and more squares from the index 0)")
+    second = report(tm, max_runs=2, cursor=0)
+    assert "1 [1] 1" in second
+    assert second.endswith("(and more squares from the index 1000000000)")
+    assert report(tm, 1, cursor=1).splitlines()[-1] == "[1] 1"
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+# Created on Sun Oct 18 10:12:41 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Asyncio cooperative runs for Turing machines (Python 3.6+ only) """
+
+from collections import namedtuple
+import asyncio
+
+__all__ = ["Progress", "arun", "aprogress"]
+
+
+Progress = namedtuple("Progress", ["steps", "mconf", "index", "cells"])
+
+
+async def arun(tm, steps, yield_every=1000):
+    """
+    Coroutine that performs the given amount of moves in the Turing machine,
+    in batches of yield_every moves, giving the control back to the event
+    loop between batches. Cancelling the task stops the run between two
+    batches, so the machine is always left in a consistent configuration.
+    """
+    async for unused in aprogress(tm, steps, yield_every):
+        pass
+
+
+async def aprogress(tm, steps, yield_every=1000):
+    """
+    Asynchronous iterator version of arun, yielding a Progress snapshot
+    (steps counter, m-configuration, index and amount of non-blank squares)
+    after each batch of moves.
+    """
+    remaining = steps
+    while remaining > 0:
+        batch = min(yield_every, remaining)
+        tm.run(batch)
+        remaining -= batch
+        yield Progress(tm.steps, tm.mconf, tm.index, len(tm.tape))
+        await asyncio.sleep(0)
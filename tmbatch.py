@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Created on Sun Oct 18 11:02:36 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Batch engine: runs a single machine on several tapes in parallel """
+
+from __future__ import unicode_literals, print_function
+from collections import namedtuple
+from pyturing import TMLocked, TMMemoryExceeded, TuringMachine
+from tmdecide import Decider
+import multiprocessing, sys, time, tmmetrics
+
+__all__ = ["Result", "is_final", "execute", "run_batch"]
+
+# Python 2.x and 3.x compatibility
+if sys.version_info.major == 2:
+    range = xrange
+
+
+Result = namedtuple("Result", ["steps", "halted", "locked", "extent",
+                               "seconds", "mconf", "index", "tape",
+                               "certificate", "exceeded"])
+
+
+def is_final(tm, action):
+    """
+    Tells whether the action (pair of tasks and final m-configuration) for
+    the current configuration of the machine keeps it in that same complete
+    configuration forever, like the "loop -> loop" rule does.
+    """
+    tasks, mco = action
+    return mco == tm.mconf and all(task == "N" for task in tasks)
+
+
+def execute(tm, steps, decide=False):
+    """
+    Moves the machine at most the given amount of steps, stopping earlier
+    when it halts, i.e., when it gets locked or it reaches a final rule (see
+    is_final). Returns a Result whose extent is the amount of squares
+    between the leftmost and rightmost squares either visited by the head or
+    non-blank, and whose steps doesn't count the moves in the final rule.
+    It also stops when a move would exceed the machine memory budget (see
+    TuringMachine.check_budget), in which case the result is exceeded
+    (without halting).
+
+    When decide is True, a tmdecide.Decider runs alongside the machine, also
+    stopping it when it's proven that it never halts, in which case the
+    result certificate is the proof (otherwise it's None).
+
+    The run metrics (see tmmetrics) are updated once, at the end, where a
+    run exhausting the steps budget counts as a timeout.
+    """
+    tape = tm.tape
+    lo = min(min(tape), tm.index) if tape else tm.index
+    hi = max(max(tape), tm.index) if tape else tm.index
+    start_steps = tm.steps
+    start_time = time.time()
+    halted = locked = exceeded = False
+    decider = Decider(tm) if decide else None
+    certificate = None
+    for unused in range(steps):
+        try:
+            action = tm[tm.mconf, tm.scan()]
+        except TMLocked:
+            halted = locked = True
+            break
+        if is_final(tm, action):
+            halted = True
+            break
+        try:
+            tm.move()
+        except TMMemoryExceeded:
+            exceeded = True
+            break
+        if tm.index < lo:
+            lo = tm.index
+        elif tm.index > hi:
+            hi = tm.index
+        if decider:
+            certificate = decider.observe()
+            if certificate:
+                break
+    seconds = time.time() - start_time
+    tmmetrics.record_run(tm.steps - start_steps, seconds, locked=locked,
+                         timeout=not (halted or certificate or exceeded),
+                         exceeded=exceeded)
+    return Result(steps=tm.steps - start_steps, halted=halted,
+                  locked=locked, extent=hi - lo + 1, seconds=seconds,
+                  mconf=tm.mconf, index=tm.index, tape=tm.tape,
+                  certificate=certificate, exceeded=exceeded)
+
+
+_worker_machine = None # Machine parsed once per worker process
+
+
+def _init_worker(source):
+    global _worker_machine
+    _worker_machine = TuringMachine(source)
+
+
+def _run_job(job, machine=None):
+    tape, steps, decide, max_cells, max_bytes = job
+    tm = (_worker_machine if machine is None else machine).copy()
+    tm.tape = tape
+    tm.max_cells, tm.max_bytes = max_cells, max_bytes # After the input
+    return execute(tm, steps, decide)
+
+
+def run_batch(source, tapes, steps, processes=None, decide=False,
+              max_cells=None, max_bytes=None):
+    """
+    Runs the machine with the given source on every given tape (each a list
+    or a dict, as in TuringMachine.tape), returning the list of Result
+    instances in the same order of the tapes. The source is parsed only
+    once per worker process. With processes=1, everything runs in the
+    current process. See execute for the decide flag, and see
+    TuringMachine.check_budget for the per-run memory budget, which isn't
+    applied to the input tapes.
+    """
+    jobs = [(tape, steps, decide, max_cells, max_bytes) for tape in tapes]
+    if processes == 1: # Local machine, as threads might run other batches
+        machine = TuringMachine(source)
+        return [_run_job(job, machine) for job in jobs]
+    pool = multiprocessing.Pool(processes, _init_worker, (source,))
+    try:
+        return pool.map(_run_job, jobs)
+    finally:
+        pool.close()
+        pool.join()
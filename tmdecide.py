@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+# Created on Sun Oct 18 15:02:44 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Non-halting deciders: cyclers, translated cyclers and bouncers """
+
+from __future__ import unicode_literals, print_function
+from bisect import bisect_left
+from collections import deque, namedtuple
+from pyturing import TMLocked
+import sys
+
+__all__ = ["Certificate", "Decider", "decide"]
+
+# Python 2.x and 3.x compatibility
+if sys.version_info.major == 2:
+    range = xrange
+
+
+Certificate = namedtuple("Certificate", ["kind", "start", "period", "shift"])
+
+Record = namedtuple("Record", ["step", "mconf", "head", "cells", "clear",
+                               "full"])
+
+RECORDS = 64 # Latest records kept (and compared) in each side
+RECORD_CELLS = 256 # Squares stored in each record, up to the head
+
+MIRROR_TASKS = {"L": "R", "R": "L"}
+
+
+def _strip_blanks(cells):
+    """ Removes the leading blanks from a tuple of symbols """
+    for idx, symbol in enumerate(cells):
+        if symbol != "None":
+            return cells[idx:]
+    return ()
+
+
+def _last_cells(cells, size):
+    """ Last size symbols, padding with blanks on the left when needed """
+    if size > len(cells):
+        return ("None",) * (size - len(cells)) + cells
+    return cells[-size:]
+
+
+class Decider(object):
+    """
+    Non-halting decider that runs alongside the machine: self.observe()
+    should be called after each move, returning a Certificate instance when
+    it proves the machine will never halt (i.e., never get locked), or None
+    otherwise. The certificate kinds are:
+
+    - "cycler": the complete configuration at the start step repeats after
+      every period moves;
+    - "translated cycler": after the start step, the machine repeats the same
+      behaviour every period moves, shifted by shift squares, always on a
+      blank region at that side of the tape;
+    - "bouncer": the machine sweeps back and forth over a region that grows
+      by shift squares (a repeated word) in each sweep, the first of them
+      being the one from the start step that took period moves.
+
+    The translated cyclers and the bouncers are found with the records, the
+    complete configurations from the moves that take the head farther than
+    ever before in one side of the tape. Bouncers are proven by symbolically
+    running the machine over a tape with the repeated word, whose amount of
+    repetitions is unknown. Left side records are handled by mirroring the
+    tape, so everything is written in terms of the right side.
+
+    Only the latest RECORDS records of each side are kept, each with at
+    most RECORD_CELLS squares up to the head, so the cost per move doesn't
+    grow with the run length. Behaviours that don't fit in these bounds
+    aren't detected.
+    """
+    def __init__(self, tm, bouncers=True, bouncer_budget=10000):
+        self.tm = tm
+        self.bouncers = bouncers
+        self.bouncer_budget = bouncer_budget
+        self.start_step = tm.steps
+        self.lo = self.hi = tm.index # Visited squares range
+        tape = tm.tape # Squares beyond the visited range keep the input
+        self.tape_lo = min(tape) if tape else tm.index
+        self.tape_hi = max(tape) if tape else tm.index
+
+        # For each side, the (step, normalized head index) pairs of the
+        # moves whose index is the minimum since then (a monotonic stack)
+        self.minima = {1: [(tm.steps, tm.index)],
+                       -1: [(tm.steps, -tm.index)]}
+        self.records = {1: deque(maxlen=RECORDS), -1: deque(maxlen=RECORDS)}
+        self.counts = {1: 0, -1: 0} # Records found, including discarded ones
+        self.snapshot = tm.steps, getattr(tm, "mconf", None), tm.index, \
+                        dict(tm.tape)
+        self.next_snapshot = 1
+
+    def observe(self):
+        tm = self.tm
+        for sign in (1, -1):
+            minima = self.minima[sign]
+            value = sign * tm.index
+            while minima and minima[-1][1] >= value:
+                minima.pop()
+            minima.append((tm.steps, value))
+        certificate = self.check_cycler()
+        if certificate:
+            return certificate
+        if tm.index > self.hi:
+            self.hi = tm.index
+            return self.add_record(1)
+        if tm.index < self.lo:
+            self.lo = tm.index
+            return self.add_record(-1)
+
+    def check_cycler(self):
+        """ Brent's algorithm on the complete configuration snapshots """
+        tm = self.tm
+        step, mconf, index, tape = self.snapshot
+        if tm.mconf == mconf and tm.index == index and tm.tape == tape:
+            return Certificate("cycler", step, tm.steps - step, 0)
+        if tm.steps - self.start_step >= self.next_snapshot:
+            self.snapshot = tm.steps, tm.mconf, tm.index, dict(tm.tape)
+            self.next_snapshot *= 2
+
+    def add_record(self, sign):
+        """
+        Stores a record with the symbols from the leftmost square (either
+        non-blank or visited) to the head (the rightmost visited square),
+        after mirroring the tape when sign is -1. Only the last RECORD_CELLS
+        squares are stored, and the record is full when that's all of them.
+        The record is clear when there's only blanks after the head, i.e.,
+        when the head is already beyond every square of the input tape.
+        """
+        tm = self.tm
+        head = sign * tm.index
+        if sign == 1:
+            lo, clear = min(self.lo, self.tape_lo), tm.index >= self.tape_hi
+        else:
+            lo, clear = -max(self.hi, self.tape_hi), tm.index <= self.tape_lo
+        start = max(lo, head - RECORD_CELLS + 1)
+        tape = tm.tape
+        record = Record(step=tm.steps, mconf=tm.mconf, head=tm.index,
+                        cells=tuple(tape.get(sign * idx, "None")
+                                    for idx in range(start, head + 1)),
+                        clear=clear, full=start == lo)
+        self.records[sign].append(record)
+        self.counts[sign] += 1
+        count = self.counts[sign]
+        certificate = self.check_translated_cycler(sign, record)
+        if certificate is None and self.bouncers and record.full and \
+           count >= 4 and count & (count - 1) == 0:
+            certificate = self.check_bouncer(sign, record)
+        return certificate
+
+    def check_translated_cycler(self, sign, record):
+        """
+        The machine is a translated cycler when an older record with the
+        same m-configuration has the same symbols in the squares the head
+        visited since it (aligning both records by their head), with nothing
+        but blanks after the head in both. The behaviour from one record to
+        the other repeats forever, as the head never goes back farther.
+        """
+        if not record.clear:
+            return None
+        head = sign * record.head
+        minima = self.minima[sign]
+        for old in list(self.records[sign])[-2::-1]:
+            if old.mconf != record.mconf or not old.clear:
+                continue
+            # Leftmost (normalized) square visited since the old record
+            back = minima[bisect_left(minima, (old.step,))][1]
+            old_head = sign * old.head
+            span = old_head - back + 1 # Squares visited, aligned to heads
+            if (span > len(old.cells) and not old.full) or \
+               (span > len(record.cells) and not record.full):
+                continue # Not stored
+            if _last_cells(old.cells, span) == \
+               _last_cells(record.cells, span):
+                return Certificate("translated cycler", old.step,
+                                   record.step - old.step,
+                                   sign * (head - old_head))
+
+    def guess_bouncers(self, sign, record):
+        """
+        Generator of (older record, left, word, right, n) tuples, where the
+        older record is a record with the same m-configuration whose symbols
+        are ``left + word * n + right``, and the newer record symbols has the
+        word once more. The head is at the last symbol in right, and there's
+        only blank squares after it.
+        """
+        newer = _strip_blanks(record.cells)
+        candidates = [old for old in list(self.records[sign])[:-1]
+                          if old.mconf == record.mconf and old.clear and
+                             old.full]
+        seen = set()
+        for old in reversed(candidates[-4:]):
+            older = _strip_blanks(old.cells)
+            size = len(newer) - len(older)
+            if size <= 0:
+                continue
+            for split in range(len(older)):
+                if older[:split] != newer[:split] or \
+                   older[split:] != newer[split + size:]:
+                    continue
+                word = newer[split:split + size]
+                start = stop = split
+                while start >= size and older[start - size:start] == word:
+                    start -= size
+                while len(older) - stop > size and \
+                      older[stop:stop + size] == word:
+                    stop += size
+                guess = (older[:start], word, older[stop:],
+                         (stop - start) // size)
+                if guess not in seen:
+                    seen.add(guess)
+                    yield (old,) + guess
+
+    def check_bouncer(self, sign, record):
+        for old, left, word, right, count in self.guess_bouncers(sign,
+                                                                 record):
+            if _prove_bouncer(self.tm, sign, record.mconf, left, word, right,
+                              count, self.bouncer_budget):
+                return Certificate("bouncer", old.step,
+                                   record.step - old.step, sign * len(word))
+
+
+def _lookup(tm, sign, mconf, symbol):
+    """ Rule action with the tasks mirrored when sign is -1, or None """
+    try:
+        tasks, mco = tm[mconf, symbol]
+    except TMLocked:
+        return None
+    if sign == -1:
+        tasks = tuple(MIRROR_TASKS.get(task, task) for task in tasks)
+    return tasks, mco
+
+
+def _shift_rule(tm, sign, mconf, word, direction):
+    """
+    Runs the machine on a tape with the word alone, starting in its first
+    (direction is 1) or last (direction is -1) square with the given
+    m-configuration. When the head leaves the word through its other end
+    at the end of a rule, in the same m-configuration, returns the updated
+    word, otherwise returns None. When that happens, the machine goes
+    through any amount of repetitions of the word the same way.
+    """
+    cells = list(word)
+    size = len(cells)
+    idx = 0 if direction == 1 else size - 1
+    state = mconf
+    for unused in range(64 * size):
+        action = _lookup(tm, sign, state, cells[idx])
+        if action is None:
+            return None
+        tasks, mco = action
+        for pos, task in enumerate(tasks):
+            if task == "R":
+                idx += 1
+            elif task == "L":
+                idx -= 1
+            elif task == "E":
+                cells[idx] = "None"
+            elif task.startswith("P"):
+                cells[idx] = task[1:]
+            elif task != "N":
+                return None
+            if not 0 <= idx < size:
+                if pos == len(tasks) - 1 and mco == mconf and \
+                   idx == (size if direction == 1 else -1):
+                    return tuple(cells)
+                return None
+        state = mco
+    return None
+
+
+def _prove_bouncer(tm, sign, mconf, left, word, right, count, budget):
+    """
+    Symbolically runs the machine from the ``left + word * n + right``
+    tape, with the head at the last square of right (the rightmost visited
+    one) in the given m-configuration, and with any unknown n >= count.
+    It's a proof of non-halting when that configuration is reached again
+    with the word repeated n + 1 times (see _is_next_bouncer_step), as the
+    run doesn't depend on n: the head only goes through the repetitions
+    with shift rules.
+    """
+    if not right:
+        return False
+    sides = [list(left), list(right)]
+    current_word = word
+    side, idx = 1, len(right) - 1 # Head position
+    state = mconf
+    shift_rules = {}
+    for unused in range(budget):
+        action = _lookup(tm, sign, state, sides[side][idx])
+        if action is None:
+            return False
+        tasks, mco = action
+        for pos, task in enumerate(tasks):
+            last = pos == len(tasks) - 1
+            cells = sides[side]
+            if task == "E":
+                cells[idx] = "None"
+            elif task.startswith("P"):
+                cells[idx] = task[1:]
+            elif task == "R":
+                idx += 1
+                if idx == len(cells):
+                    if side == 1:
+                        cells.append("None")
+                    else: # Through the repetitions, to the right side
+                        key = mco, current_word, 1
+                        if key not in shift_rules:
+                            shift_rules[key] = _shift_rule(tm, sign, *key)
+                        if not last or shift_rules[key] is None:
+                            return False
+                        current_word = shift_rules[key]
+                        side, idx = 1, 0
+                        if not sides[1]:
+                            sides[1].append("None")
+            elif task == "L":
+                idx -= 1
+                if idx < 0:
+                    if side == 0:
+                        cells.insert(0, "None")
+                        idx = 0
+                    else: # Through the repetitions, to the left side
+                        key = mco, current_word, -1
+                        if key not in shift_rules:
+                            shift_rules[key] = _shift_rule(tm, sign, *key)
+                        if not last or shift_rules[key] is None:
+                            return False
+                        current_word = shift_rules[key]
+                        if not sides[0]:
+                            sides[0].append("None")
+                        side, idx = 0, len(sides[0]) - 1
+            elif task != "N":
+                return False
+        state = mco
+        if side == 1 and idx == len(sides[1]) - 1 and state == mconf and \
+           _is_next_bouncer_step(left, word, right, count, tuple(sides[0]),
+                                 current_word, tuple(sides[1])):
+            return True
+    return False
+
+
+def _is_next_bouncer_step(left, word, right, count,
+                          new_left, new_word, new_right):
+    """
+    Tells whether ``new_left + new_word * n + new_right`` is the same to
+    ``left + word * (n + 1) + right`` for every n >= count, where the leading
+    blanks don't matter. When new_word is a rotation of the word, its n
+    repetitions are the ``word[r:] + word * (n - 1) + word[:r]`` symbols.
+    Otherwise, new_word should be the word itself, and the extra repetition
+    might be split in both sides as a ``head`` and a ``tail``, when
+    ``head + tail == tail + head == word``.
+    """
+    size = len(word)
+    extra = 1
+    if new_word != word:
+        for r in range(1, size):
+            if new_word == word[r:] + word[:r] and count >= 1:
+                new_left += word[r:]
+                new_right = word[:r] + new_right
+                extra = 2
+                break
+        else:
+            return False
+    new_left = _strip_blanks(new_left)
+    for split in range(extra * size + 1):
+        prefix, suffix = (word * extra)[:split], (word * extra)[split:]
+        head, tail = word[:split % size], word[split % size:]
+        if (not head or tail + head == word) and \
+           new_right == suffix + right and \
+           new_left == _strip_blanks(left + prefix):
+            return True
+    return False
+
+
+def decide(tm, steps, bouncers=True):
+    """
+    Moves the machine at most the given amount of steps, stopping as soon
+    as a Decider proves it never halts, returning the Certificate (or None).
+    A TMLocked exception is raised as usual if the machine gets locked.
+    """
+    decider = Decider(tm, bouncers)
+    for unused in range(steps):
+        tm.move()
+        certificate = decider.observe()
+        if certificate:
+            return certificate
+    return None
@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+# Created on Wed Oct 21 09:14:27 2026
+# MIT Licensed. See COPYING.TXT for more information.
+"""
+Distributed batch engine: a coordinator hands out shards of work to worker
+processes on several hosts, using multiprocessing.managers
+"""
+
+from __future__ import unicode_literals, print_function
+from multiprocessing.managers import BaseManager
+from threading import Condition, Thread
+from pyturing import TuringMachine
+from tmbatch import execute
+import tmenum
+import binascii, getpass, multiprocessing, os, socket, sys, time, traceback
+
+__all__ = ["AUTHKEY_ENV", "LEASE", "RETRIES", "ShardFailed", "Coordinator",
+           "worker", "spawn_workers", "run_batch", "survey"]
+
+# Python 2.x and 3.x compatibility
+if sys.version_info.major == 2:
+    range = xrange
+
+AUTHKEY_ENV = "PYTURING_AUTHKEY" # Authentication key of a worker process
+LEASE = 30. # Seconds without a heartbeat for a worker to be considered dead
+RETRIES = 3 # Times a shard can be handed out again after a failure
+
+
+class ShardFailed(Exception):
+    """ A shard failed or its worker died more than the allowed retries """
+
+
+class _Dispatcher(object):
+    """
+    Shared state of the coordinator, served to the workers. The shards are
+    leased to the workers that ask for them (taking the pending ones in
+    order, then duplicating the oldest leased shard of another worker when
+    there's nothing pending, i.e., stealing it), and the first result of a
+    shard is the one kept. A shard whose worker fails or stops sending
+    heartbeats (dies) goes back to the pending ones.
+    """
+    def __init__(self, job, payloads, lease, retries):
+        self._job = job
+        self.payloads = payloads
+        self.lease = lease
+        self.retries = retries
+        self.pending = list(range(len(payloads)))
+        self.leases = {} # Shard index: {worker: lease time}
+        self.attempts = [0] * len(payloads)
+        self.results = {}
+        self.error = None
+        self.seen = {} # Worker: last heartbeat time
+        self.condition = Condition()
+
+    def job(self):
+        """ The (kind, parameters) pair shipped once per worker """
+        return self._job
+
+    def interval(self):
+        """ Seconds between the heartbeats of each worker """
+        return self.lease / 4
+
+    def heartbeat(self, worker):
+        with self.condition:
+            self.seen[worker] = time.time()
+
+    def take(self, worker):
+        """
+        Leases a shard to the worker, returning a ("shard", index, payload)
+        triple, or ("wait",) when every unfinished shard is already leased
+        to the worker, or ("done",) when there's nothing left to do.
+        """
+        with self.condition:
+            now = time.time()
+            self.seen[worker] = now
+            self._expire(now)
+            if self.error is not None or \
+               len(self.results) == len(self.payloads):
+                return ("done",)
+            if self.pending:
+                index = self.pending.pop(0)
+            else:
+                stealable = [(min(holders.values()), index)
+                             for index, holders in self.leases.items()
+                             if worker not in holders]
+                if not stealable:
+                    return ("wait",)
+                index = min(stealable)[1]
+            self.leases.setdefault(index, {})[worker] = now
+            return ("shard", index, self.payloads[index])
+
+    def finish(self, worker, index, result):
+        """ Stores the shard result, returning False if it was a duplicate """
+        with self.condition:
+            self.seen[worker] = time.time()
+            self.leases.get(index, {}).pop(worker, None)
+            if index in self.results:
+                return False
+            self.results[index] = result
+            self.leases.pop(index, None)
+            self.condition.notify_all()
+            return True
+
+    def fail(self, worker, index, error):
+        """ Gives the shard back after an exception in the worker """
+        with self.condition:
+            holders = self.leases.get(index, {})
+            holders.pop(worker, None)
+            self._retry(index, holders, error)
+
+    def _expire(self, now):
+        """ Gives back the shards leased only to dead workers """
+        dead = set(worker for worker, last in self.seen.items()
+                          if now - last > self.lease)
+        for index, holders in list(self.leases.items()):
+            for worker in dead.intersection(holders):
+                del holders[worker]
+                self._retry(index, holders, "Worker {} died".format(worker))
+
+    def _retry(self, index, holders, error):
+        if holders or index in self.results: # Someone else is on it
+            return
+        self.leases.pop(index, None)
+        self.attempts[index] += 1
+        if self.attempts[index] > self.retries:
+            self.error = "Shard {} failed: {}".format(index, error)
+            self.condition.notify_all()
+        elif index not in self.pending:
+            self.pending.insert(0, index)
+
+    def wait_result(self, index, timeout):
+        """ Result of the shard (blocking), raising ShardFailed on errors """
+        with self.condition:
+            while index not in self.results:
+                if self.error is not None:
+                    raise ShardFailed(self.error)
+                self.condition.wait(timeout)
+                self._expire(time.time())
+            return self.results[index]
+
+
+def _is_loopback(host):
+    try:
+        return socket.gethostbyname(host).startswith("127.")
+    except socket.error:
+        return False
+
+
+def _manager_class():
+    """ New BaseManager subclass, as register changes the class """
+    class Manager(BaseManager):
+        pass
+    return Manager
+
+
+def _connect(address, authkey):
+    manager = _manager_class()
+    manager.register("dispatcher")
+    manager = manager(address=address, authkey=authkey)
+    manager.connect()
+    return manager.dispatcher()
+
+
+class Coordinator(object):
+    """
+    Server that hands out the payloads (shards) of a job to the workers
+    connected to its address (see worker), as a context manager. The job is
+    a (kind, parameters) pair, where the kind is "batch" for the
+    parameters (source, steps, decide, max_cells, max_bytes) and tape lists
+    as payloads, or
+    "survey" for the parameters (states, symbols, max_steps, shards) and
+    shard numbers as payloads.
+
+    The workers exchange pickled data with the coordinator, so anyone who
+    knows the authentication key (bytes) can run code in it. When no key is
+    given, a random one is generated (see self.authkey), which is only
+    allowed on loopback addresses, as remote workers need to know the key.
+    """
+    def __init__(self, job, payloads, address=("127.0.0.1", 0),
+                 authkey=None, lease=LEASE, retries=RETRIES):
+        if authkey is None:
+            if not _is_loopback(address[0]):
+                raise ValueError("An authentication key is required for "
+                                 "listening on a non-loopback address")
+            authkey = binascii.hexlify(os.urandom(16))
+        self.dispatcher = _Dispatcher(job, list(payloads), lease, retries)
+        manager = _manager_class()
+        manager.register("dispatcher", callable=lambda: self.dispatcher)
+        self.server = manager(address=address, authkey=authkey).get_server()
+        self.address = self.server.address
+        self.authkey = authkey
+        self.thread = Thread(target=self._serve)
+        self.thread.daemon = True
+
+    def _serve(self):
+        try:
+            self.server.serve_forever()
+        except SystemExit: # Raised by the server when stopped
+            pass
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        stop_event = getattr(self.server, "stop_event", None)
+        if stop_event is not None: # Python 3
+            stop_event.set()
+
+    def results(self):
+        """
+        Generator of the shard results in the payloads order, as soon as
+        they're available. Raises ShardFailed when some shard fails more
+        than the allowed retries.
+        """
+        for index in range(len(self.dispatcher.payloads)):
+            yield self.dispatcher.wait_result(index,
+                                              self.dispatcher.lease / 4)
+
+
+def _heartbeats(address, authkey, name, interval, stopped):
+    dispatcher = _connect(address, authkey) # A connection per thread
+    while not stopped:
+        dispatcher.heartbeat(name)
+        time.sleep(interval)
+
+
+def worker(address, authkey, name=None, poll=.05):
+    """
+    Runs the shards handed out by the coordinator at the given (host, port)
+    address until there's nothing left to do, compiling the machine only
+    once. A background thread sends the heartbeats while a shard runs.
+    Returns the amount of shards finished.
+    """
+    if name is None:
+        name = "{}:{}".format(socket.gethostname(), os.getpid())
+    dispatcher = _connect(address, authkey)
+    kind, params = dispatcher.job()
+    if kind == "batch":
+        source, steps, decide, max_cells, max_bytes = params
+        machine = TuringMachine(source)
+    stopped = []
+    thread = Thread(target=_heartbeats, args=(address, authkey, name,
+                                              dispatcher.interval(), stopped))
+    thread.daemon = True
+    thread.start()
+    finished = 0
+    try:
+        while True:
+            task = dispatcher.take(name)
+            if task[0] == "done":
+                return finished
+            if task[0] == "wait":
+                time.sleep(poll)
+                continue
+            index, payload = task[1:]
+            try:
+                if kind == "batch":
+                    result = []
+                    for tape in payload:
+                        tm = machine.copy()
+                        tm.tape = tape
+                        tm.max_cells, tm.max_bytes = max_cells, max_bytes
+                        result.append(execute(tm, steps, decide))
+                else:
+                    result = tmenum._survey_shard(params[:3] + (payload,
+                                                               params[3]))
+            except Exception:
+                dispatcher.fail(name, index, traceback.format_exc())
+                continue
+            dispatcher.finish(name, index, result)
+            finished += 1
+    finally:
+        stopped.append(True)
+
+
+def spawn_workers(address, processes, authkey):
+    """ Starts local worker processes, returning them """
+    workers = [multiprocessing.Process(target=worker,
+                                       args=(address, authkey))
+               for unused in range(processes)]
+    for process in workers:
+        process.daemon = True
+        process.start()
+    return workers
+
+
+def _run(job, payloads, processes, address, authkey, lease, retries):
+    """ List of shard results, serving until the local workers finish """
+    with Coordinator(job, payloads, address, authkey, lease,
+                     retries) as coordinator:
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        workers = spawn_workers(coordinator.address, processes,
+                                coordinator.authkey)
+        try:
+            return list(coordinator.results())
+        finally:
+            for process in workers:
+                process.join()
+
+
+def run_batch(source, tapes, steps, processes=None, decide=False,
+              max_cells=None, max_bytes=None, shard_size=16,
+              address=("127.0.0.1", 0), authkey=None, lease=LEASE,
+              retries=RETRIES):
+    """
+    Distributed version of tmbatch.run_batch, returning the list of
+    tmbatch.Result instances in the tapes order. The tapes are split in
+    shards of shard_size tapes, handed out by a coordinator listening at
+    the given address to the workers connecting to it (see worker), and
+    also to the given amount of local worker processes (by default, one
+    per CPU). See Coordinator for the authentication key.
+    """
+    tapes = list(tapes)
+    shards = [tapes[idx:idx + shard_size]
+              for idx in range(0, len(tapes), shard_size)]
+    job = ("batch", (source, steps, decide, max_cells, max_bytes))
+    return [result for shard in _run(job, shards, processes, address,
+                                     authkey, lease, retries)
+                   for result in shard]
+
+
+def survey(states, symbols, max_steps, processes=None, shards=None,
+           address=("127.0.0.1", 0), authkey=None, lease=LEASE,
+           retries=RETRIES):
+    """
+    Distributed version of tmenum.survey, with the enumeration shards
+    handed out by a coordinator (see run_batch).
+    """
+    if shards is None:
+        shards = 4 * (processes or multiprocessing.cpu_count())
+    job = ("survey", (states, symbols, max_steps, shards))
+    return tmenum._merge_survey(_run(job, range(shards), processes, address,
+                                     authkey, lease, retries))
+
+
+if __name__ == "__main__": # Worker: python tmdist.py HOST:PORT
+    host, port = sys.argv[1].rsplit(":", 1)
+    authkey = os.environ.get(AUTHKEY_ENV) or \
+              getpass.getpass("Authentication key: ")
+    authkey = authkey.encode("utf-8")
+    print("Finished {} shards".format(worker((host, int(port)), authkey)))
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+# Created on Sun Oct 18 13:27:50 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Enumeration of all n-state, k-symbol machines in tree normal form """
+
+from __future__ import unicode_literals, print_function
+from collections import namedtuple
+from pyturing import TuringMachine
+import multiprocessing
+
+__all__ = ["Candidate", "Survey", "enumerate_machines", "survey"]
+
+
+class Candidate(object):
+    """
+    An enumerated machine, in Turing's normal form (every rule prints a
+    symbol, moves once and goes to an m-configuration). The steps attribute
+    is the amount of moves performed before getting locked when starting
+    with a blank tape, or None if it didn't get locked within the steps
+    budget. The TuringMachine instance and its descriptions are only
+    created when needed.
+    """
+    __slots__ = ["rules", "steps"]
+
+    def __init__(self, rules, steps):
+        self.rules = rules # Tuple of (key, action) pairs
+        self.steps = steps
+
+    @property
+    def halted(self):
+        return self.steps is not None
+
+    def machine(self):
+        tm = TuringMachine()
+        tm.update(self.rules)
+        tm.mconf = "q1"
+        return tm
+
+    def standard_description(self):
+        return self.machine().standard_description()
+
+    def description_number(self):
+        return self.machine().description_number()
+
+
+def _run_until_undefined(tm, max_steps):
+    """ Moves until reaching a rule not defined yet or the steps budget """
+    while tm.steps < max_steps:
+        if (tm.mconf, tm.scan()) not in tm:
+            return True
+        tm.move()
+    return False
+
+
+def _blank_beyond(tm, move):
+    """ Tells whether every square beyond the head in the direction is blank """
+    if move == "R":
+        return all(idx <= tm.index for idx in tm.tape)
+    return all(idx >= tm.index for idx in tm.tape)
+
+
+def enumerate_machines(states, symbols, max_steps, shard=0, shards=1,
+                       split_depth=3):
+    """
+    Generator of Candidate instances for every machine with the given
+    amount of m-configurations ("q1", "q2", ...) and symbols ("None", "1",
+    "2", ...) in tree normal form, i.e., a rule is only created when a run
+    from the blank tape reaches it, m-configurations and symbols are created
+    in the order they're needed, and the first move is to the right. That
+    avoids the machines that are isomorphic by renaming or mirroring, and
+    the rules that are never used. Machines are also pruned when they can't
+    halt: when every rule is defined, or when a rule keeps the m-configuration
+    scanning blank squares in a direction without anything else.
+
+    The search tree is split in shards by its nodes at split_depth (amount
+    of rules), so that running every shard (0 <= shard < shards) once gives
+    every machine exactly once.
+    """
+    mconfs = ["q{}".format(i) for i in range(1, states + 1)]
+    alphabet = ["None"] + [str(i) for i in range(1, symbols)]
+    counter = [0]
+
+    def search(tm, used_mconfs, used_symbols):
+        depth = len(tm)
+        if depth == split_depth:
+            counter[0] += 1
+            if (counter[0] - 1) % shards != shard:
+                return
+        owned = depth >= split_depth or shard == 0
+        snapshot = tm.steps
+        if not _run_until_undefined(tm, max_steps):
+            if owned:
+                yield Candidate(tuple(tm.items()), None)
+            return
+        if owned:
+            yield Candidate(tuple(tm.items()), tm.steps)
+        if depth + 1 == states * symbols: # No rule left for halting
+            return
+        mconf, symbol = tm.mconf, tm.scan()
+        for printed in alphabet[:min(used_symbols + 1, symbols)]:
+            for move in "LR" if depth else "R":
+                for mco in mconfs[:min(used_mconfs + 1, states)]:
+                    if mco == mconf and symbol == "None" == printed and \
+                       _blank_beyond(tm, move):
+                        continue
+                    child = tm.copy()
+                    child[mconf, symbol] = (("E" if printed == "None" else
+                                             "P" + printed, move), mco)
+                    for candidate in search(
+                            child,
+                            max(used_mconfs, mconfs.index(mco) + 1),
+                            max(used_symbols, alphabet.index(printed) + 1)):
+                        yield candidate
+
+    root = TuringMachine()
+    root.mconf = mconfs[0]
+    return search(root, 1, 1)
+
+
+Survey = namedtuple("Survey", ["machines", "halting", "holdouts",
+                               "champion_steps", "champion"])
+
+
+def _survey_shard(args):
+    states, symbols, max_steps, shard, shards = args
+    machines = halting = holdouts = 0
+    best = None
+    for candidate in enumerate_machines(states, symbols, max_steps,
+                                        shard, shards):
+        machines += 1
+        if candidate.halted:
+            halting += 1
+            if best is None or candidate.steps > best.steps:
+                best = candidate
+        else:
+            holdouts += 1
+    return (machines, halting, holdouts,
+            best and best.steps, best and best.standard_description())
+
+
+def survey(states, symbols, max_steps, processes=None, shards=None):
+    """
+    Busy beaver-like survey over the enumerate_machines results, with the
+    shards shared by a pool of worker processes. Returns a Survey instance
+    with the amount of enumerated machines, how many halted within the
+    max_steps budget and how many didn't (holdouts), and the standard
+    description of the halting machine with the most steps (the champion).
+    """
+    if shards is None:
+        shards = 4 * (processes or multiprocessing.cpu_count())
+    jobs = [(states, symbols, max_steps, shard, shards)
+            for shard in range(shards)]
+    if processes == 1:
+        results = [_survey_shard(job) for job in jobs]
+    else:
+        pool = multiprocessing.Pool(processes)
+        try:
+            results = pool.map(_survey_shard, jobs)
+        finally:
+            pool.close()
+            pool.join()
+    return _merge_survey(results)
+
+
+def _merge_survey(results):
+    """ Survey from the _survey_shard results """
+    champion = max((r for r in results if r[3] is not None),
+                   key=lambda r: r[3])
+    return Survey(machines=sum(r[0] for r in results),
+                  halting=sum(r[1] for r in results),
+                  holdouts=sum(r[2] for r in results),
+                  champion_steps=champion[3], champion=champion[4])
@@ -0,0 +1,477 @@
+# -*- coding: utf-8 -*-
+# Created on Tue Oct 20 14:08:51 2026
+# MIT Licensed. See COPYING.TXT for more information.
+"""
+Differential fuzzing of the Turing machine engines against a naive
+reference engine
+"""
+
+from __future__ import unicode_literals, print_function
+from collections import namedtuple, OrderedDict
+from pyturing import (TMLocked, TMMemoryExceeded, TMSyntaxError,
+                      TuringMachine, evaluate_symbol_query, rule_blocks,
+                      split_mconf, substitute)
+from tmbatch import execute
+from tmmulti import MultiTapeMachine
+import tmstream
+import os, random, shutil, sys, tempfile
+
+__all__ = ["Snapshot", "Case", "Divergence", "ENGINES", "UNSUPPORTED",
+           "register", "reference", "random_source", "random_tape",
+           "random_case", "compare", "shrink", "fuzz"]
+
+# Python 2.x and 3.x compatibility
+if sys.version_info.major == 2:
+    range = xrange
+
+SYMBOLS = ("0", "1", "x")
+MCONFS = ("a", "b", "c", "d")
+
+Snapshot = namedtuple("Snapshot", ["steps", "mconf", "index", "tape",
+                                   "locked", "exceeded"])
+
+Case = namedtuple("Case", ["source", "tape", "checkpoints", "max_cells"])
+
+Divergence = namedtuple("Divergence", ["engine", "case", "checkpoint",
+                                       "expected", "found"])
+
+ENGINES = OrderedDict() # Name: engine generator function
+UNSUPPORTED = {} # Name: features ("budget", "mfunctions") it doesn't have
+
+
+def register(name, unsupported=()):
+    """
+    Decorator for adding an engine to ENGINES. An engine is a generator
+    function that receives the machine source, the initial tape (list of
+    symbols from the index 0), the increasing amounts of moves where
+    the complete configuration should be compared and the memory budget
+    (max_cells, or None), yielding a Snapshot at each of these
+    checkpoints. Once the machine gets locked or the next move would exceed
+    the budget, the remaining snapshots are the same, with locked=True or
+    exceeded=True. The engines are skipped in the cases with the features
+    they don't support (see compare).
+    """
+    def decorator(func):
+        ENGINES[name] = func
+        UNSUPPORTED[name] = frozenset(unsupported)
+        return func
+    return decorator
+
+
+def snapshot(tm, locked=False, exceeded=False):
+    """ Snapshot of a TuringMachine complete configuration """
+    return Snapshot(steps=tm.steps, mconf=getattr(tm, "mconf", None),
+                    index=tm.index, tape=dict(tm.tape), locked=locked,
+                    exceeded=exceeded)
+
+
+def _drive(tm, checkpoints, advance, take=snapshot):
+    """
+    Generator of snapshots (using take) at the checkpoints, calling
+    advance(tm, n) to perform n moves, which should raise TMLocked when
+    the machine gets locked, or TMMemoryExceeded when the next move would
+    exceed the budget.
+    """
+    last = None
+    for checkpoint in checkpoints:
+        if last is None or not (last.locked or last.exceeded):
+            try:
+                advance(tm, checkpoint - tm.steps)
+                last = take(tm)
+            except TMLocked:
+                last = take(tm, locked=True)
+            except TMMemoryExceeded:
+                last = take(tm, exceeded=True)
+        yield last
+
+
+def _machine(source, tape, max_cells):
+    tm = TuringMachine(source)
+    tm.tape = tape
+    tm.max_cells = max_cells # After the input
+    return tm
+
+
+def _naive_action(tm, mconf, symbol):
+    """
+    Action for the configuration from the rules parsed by the machine,
+    without its lookup (absence rows and m-function instances): the
+    presence rules come first, then the first "inverse" rule whose symbols
+    don't include the given one. It's None when there's no rule.
+    """
+    action = tm.get((mconf, symbol)) # Not calling __missing__
+    if action is not None:
+        return action
+    name, args = split_mconf(mconf)
+    if not args or mconf in tm.inv_dict:
+        rules = tm.inv_dict.get(mconf, [])
+    else: # M-function call
+        params, templates = tm.mfunctions.get(name, (args, []))
+        if len(params) != len(args):
+            raise TMSyntaxError("Wrong amount of arguments")
+        mapping = dict(zip(params, args))
+        rules = []
+        for symbols_in, tasks, mco in templates:
+            symbs, flag = evaluate_symbol_query(*[mapping.get(s, s)
+                                                  for s in symbols_in])
+            tasks = tuple("P" + mapping.get(task[1:], task[1:])
+                          if task.startswith("P") else task
+                          for task in tasks)
+            action = tasks, substitute(mco, mapping)
+            if flag and symbol in symbs:
+                return action
+            if not flag:
+                rules.append((symbs, action))
+    for symbs, action in rules:
+        if symbol not in symbs:
+            return action
+    return None
+
+
+@register("reference")
+def reference(source, tape, checkpoints, max_cells=None):
+    """
+    Naive reference engine, where each move finds its action scanning the
+    rules (see _naive_action) and performs its tasks in a copy of the tape,
+    which is discarded when it has more than max_cells cells and more
+    cells than before.
+    """
+    tm = TuringMachine(source)
+    mconf = getattr(tm, "mconf", None)
+    cells = {idx: symbol for idx, symbol in enumerate(tape)
+                         if symbol != "None"}
+    index = steps = 0
+    locked = exceeded = False
+    for checkpoint in checkpoints:
+        while steps < checkpoint and not (locked or exceeded):
+            action = None if mconf is None else \
+                     _naive_action(tm, mconf, cells.get(index, "None"))
+            if action is None:
+                locked = True
+                break
+            tasks, mco = action
+            new_cells, new_index = dict(cells), index
+            for task in tasks:
+                if task == "R":
+                    new_index += 1
+                elif task == "L":
+                    new_index -= 1
+                elif task in ("E", "PNone"):
+                    new_cells.pop(new_index, None)
+                elif task.startswith("P"):
+                    new_cells[new_index] = task[1:]
+                elif task != "N":
+                    raise ValueError("Unknown task")
+            if max_cells is not None and \
+               len(cells) < len(new_cells) > max_cells:
+                exceeded = True
+                break
+            cells, index, mconf = new_cells, new_index, mco
+            steps += 1
+        yield Snapshot(steps=steps, mconf=mconf, index=index,
+                       tape=dict(cells), locked=locked, exceeded=exceeded)
+
+
+@register("move")
+def move_engine(source, tape, checkpoints, max_cells):
+    """ TuringMachine.move, called once per move """
+    def advance(tm, n):
+        for unused in range(n):
+            tm.move()
+    return _drive(_machine(source, tape, max_cells), checkpoints, advance)
+
+
+@register("run")
+def run_engine(source, tape, checkpoints, max_cells):
+    """ TuringMachine.run in batches """
+    return _drive(_machine(source, tape, max_cells), checkpoints,
+                  lambda tm, n: tm.run(n))
+
+
+@register("seek")
+def seek_engine(source, tape, checkpoints, max_cells):
+    """ Undo log: seeks beyond each checkpoint, then back to it """
+    def advance(tm, n):
+        target = tm.steps + n
+        try:
+            tm.seek(target + n)
+        except (TMLocked, TMMemoryExceeded):
+            if tm.steps < target:
+                raise
+        tm.seek(target)
+    tm = _machine(source, tape, max_cells)
+    tm.enable_undo()
+    return _drive(tm, checkpoints, advance)
+
+
+@register("resume")
+def resume_engine(source, tape, checkpoints, max_cells):
+    """ Checkpoint file stored and resumed by a new machine at each step """
+    path = tempfile.mkdtemp()
+    filename = os.path.join(path, "checkpoint.json")
+    tm = _machine(source, tape, max_cells)
+    locked = exceeded = False
+    try:
+        for checkpoint in checkpoints:
+            if not (locked or exceeded):
+                try:
+                    tm.run(checkpoint - tm.steps)
+                except TMLocked:
+                    locked = True
+                except TMMemoryExceeded:
+                    exceeded = True
+                tm.checkpoint(filename)
+                tm = TuringMachine(source)
+                tm.resume(filename)
+                tm.max_cells = max_cells
+            yield snapshot(tm, locked, exceeded)
+    finally:
+        shutil.rmtree(path)
+
+
+@register("recompile")
+def recompile_engine(source, tape, checkpoints, max_cells):
+    """ Machine incrementally recompiled from the reversed rule blocks """
+    tm = TuringMachine("\n".join(reversed(rule_blocks(source))))
+    tm.recompile(source)
+    tm.reset()
+    tm.tape = tape
+    tm.max_cells = max_cells
+    return _drive(tm, checkpoints, lambda tm, n: tm.run(n))
+
+
+@register("multi", unsupported=["budget", "mfunctions"])
+def multi_engine(source, tape, checkpoints, max_cells):
+    """ Single tape MultiTapeMachine, with its compiled tasks """
+    def take(mtm, locked=False, exceeded=False):
+        return Snapshot(steps=mtm.steps, mconf=getattr(mtm, "mconf", None),
+                        index=mtm.indices[0], tape=dict(mtm.tapes[0]),
+                        locked=locked, exceeded=exceeded)
+    mtm = MultiTapeMachine(source, tapes=1)
+    mtm.tapes = [tape]
+    return _drive(mtm, checkpoints, lambda mtm, n: mtm.run(n), take)
+
+
+@register("stream")
+def stream_engine(source, tape, checkpoints, max_cells):
+    """ Configuration rebuilt from the delta frames (tmstream) """
+    tm = _machine(source, tape, max_cells)
+    frames = tmstream.frames(tm, checkpoints[-1] if checkpoints else 0,
+                             fps=None, keyframe_every=7)
+    pending = list(checkpoints)
+    state = None
+    for frame in frames:
+        state = tmstream.apply_frame(state, frame)
+        snap = Snapshot(steps=state["steps"], mconf=state["mconf"],
+                        index=state["index"], tape=dict(state["tape"]),
+                        locked=bool(frame.get("locked")),
+                        exceeded=bool(frame.get("exceeded")))
+        while pending and (snap.locked or snap.exceeded or
+                           pending[0] == snap.steps):
+            pending.pop(0)
+            yield snap
+
+
+@register("batch")
+def batch_engine(source, tape, checkpoints, max_cells):
+    """
+    Batch engine (tmbatch.execute) until each checkpoint. It stops before
+    a final rule, which keeps the complete configuration, so only the steps
+    counter goes on.
+    """
+    def advance(tm, n):
+        if not hasattr(tm, "mconf"): # No rule
+            raise TMLocked("Locked")
+        result = execute(tm, n)
+        if result.locked:
+            raise TMLocked("Locked")
+        if result.exceeded:
+            raise TMMemoryExceeded("Exceeded")
+        if result.halted: # Final rule
+            tm.steps += n - result.steps
+    return _drive(_machine(source, tape, max_cells), checkpoints, advance)
+
+
+def _random_rule(rng, choices, tasks, mconfs):
+    """ Random (query, action) pair for a rule """
+    kind = rng.random()
+    if kind < .15:
+        query = ""
+    else:
+        group = rng.sample(choices, rng.randint(1, 2))
+        query = group[0] if len(group) == 1 else \
+                "[{}]".format(" ".join(group))
+        if kind < .4:
+            query = "Not " + query
+    action = [rng.choice(tasks) for unused in range(rng.randint(0, 3))]
+    return query, " ".join(action + [rng.choice(mconfs)])
+
+
+def random_source(rng, mconfs=MCONFS, symbols=SYMBOLS, rules=8):
+    """
+    Random machine source with at most the given amount of rules, using
+    grouping (indented lines keeping the m-configuration), continuation
+    lines, bracketed symbol sets, "Not" and empty (any) queries, "PNone"
+    erasure, comments and final m-configurations without rules. Some
+    sources have an m-function with a parameter (used as a symbol and as
+    an m-configuration), whose calls have the m-configurations as the
+    arguments.
+    """
+    choices = list(symbols) + ["None"]
+    tasks = ["R", "L", "E", "N", "PNone"] + ["P" + s for s in symbols]
+    outputs = list(mconfs) + ["halt"]
+    function = rng.random() < .3
+    if function:
+        outputs += ["f({})".format(mconf) for mconf in mconfs]
+    lines = []
+    for unused in range(rng.randint(1, rules)):
+        query, action = _random_rule(rng, choices, tasks, outputs)
+        grouped = lines and rng.random() < .4
+        mconf = "" if grouped else rng.choice(mconfs)
+        config = "  {}".format(query) if grouped else \
+                 "{} {}".format(mconf, query)
+        style = rng.random()
+        if style < .1: # Action in a continuation line
+            lines.extend([config + " ->", "    " + action])
+        elif style < .2 and not grouped: # Arrow in a continuation line
+            lines.extend([config, "    -> " + action])
+        elif style < .3 and not grouped: # Grouping after a lonely mconf
+            lines.extend([mconf, "  {} -> {}".format(query, action)])
+        else:
+            lines.append("{} -> {}".format(config, action))
+        if rng.random() < .1:
+            lines.append("# Comment -> " + action)
+    if function:
+        lines.append("f(A)")
+        for unused in range(rng.randint(1, 3)):
+            lines.append("  {} -> {}".format(*_random_rule(
+                rng, choices + ["A"], tasks + ["PA"], outputs + ["A"])))
+    return "\n".join(lines)
+
+
+def random_tape(rng, symbols=SYMBOLS, size=6):
+    """ Random tape (list of symbols from the index 0), with blanks """
+    return [rng.choice(list(symbols) + ["None"])
+            for unused in range(rng.randint(0, size))]
+
+
+def random_case(rng, steps=200, checkpoints=5):
+    """
+    Random Case with the given amount of random checkpoints, where some
+    cases have a memory budget of at most a cell more than the input tape
+    """
+    tape = random_tape(rng)
+    max_cells = None
+    if rng.random() < .3:
+        max_cells = len(tape) - tape.count("None") + rng.randint(0, 1)
+    return Case(source=random_source(rng), tape=tape,
+                checkpoints=sorted(rng.sample(range(1, steps + 1),
+                                              checkpoints)),
+                max_cells=max_cells)
+
+
+def _report(exc):
+    return "{}: {}".format(type(exc).__name__, exc)
+
+
+def compare(case, engines=None):
+    """
+    Runs every engine (names from ENGINES, all but the reference when not
+    given) in lockstep with the reference one, returning the first
+    Divergence found or None. An engine raising an exception diverges with
+    the exception text as the found snapshot. The engines aren't run on
+    the cases with a feature in their UNSUPPORTED set, i.e., a memory
+    budget ("budget") or m-function templates ("mfunctions").
+    """
+    if engines is None:
+        engines = [name for name in ENGINES if name != "reference"]
+    expected = list(reference(*case))
+    features = set()
+    if case.max_cells is not None:
+        features.add("budget")
+    if TuringMachine(case.source).mfunctions:
+        features.add("mfunctions")
+    for name in engines:
+        if UNSUPPORTED.get(name, frozenset()) & features:
+            continue
+        try:
+            for checkpoint, exp, found in zip(case.checkpoints, expected,
+                                              ENGINES[name](*case)):
+                if exp != found:
+                    return Divergence(name, case, checkpoint, exp, found)
+        except Exception as exc:
+            return Divergence(name, case, None, None, _report(exc))
+    return None
+
+
+def _candidates(case, checkpoint):
+    """ Smaller cases to try while shrinking, the simplest ones first """
+    source, tape, checkpoints, max_cells = case
+    if checkpoint is not None and checkpoints != [checkpoint]:
+        yield case._replace(checkpoints=[checkpoint])
+    if max_cells is not None:
+        yield case._replace(max_cells=None)
+    for steps in [1, checkpoints[-1] // 2, checkpoints[-1] - 1]:
+        if 0 < steps < checkpoints[-1]:
+            yield case._replace(checkpoints=[steps])
+    lines = source.splitlines()
+    for idx in range(len(lines)):
+        yield case._replace(source="\n".join(lines[:idx] + lines[idx + 1:]))
+    for idx in range(len(lines) - 1): # Rules split in continuation lines
+        yield case._replace(source="\n".join(lines[:idx] + lines[idx + 2:]))
+    for idx, line in enumerate(lines):
+        words = line.split(" ")
+        for widx in range(len(words)):
+            if words[widx] not in ("", "->"):
+                shorter = " ".join(words[:widx] + words[widx + 1:])
+                yield case._replace(source="\n".join(lines[:idx] + [shorter]
+                                                     + lines[idx + 1:]))
+    for idx in range(len(tape)):
+        yield case._replace(tape=tape[:idx] + tape[idx + 1:])
+        if tape[idx] != "None":
+            yield case._replace(tape=tape[:idx] + ["None"] + tape[idx + 1:])
+
+
+def shrink(divergence, engines=None):
+    """
+    Minimal reproducer of the divergence, greedily removing source lines,
+    words, tape squares and the memory budget, and reducing the amount of
+    moves while the engine (or any of the given engines) still diverges.
+    Candidates where the reference engine raises some exception are
+    skipped.
+    """
+    if engines is None:
+        engines = [divergence.engine]
+    changed = True
+    while changed:
+        changed = False
+        for case in _candidates(divergence.case, divergence.checkpoint):
+            try:
+                list(reference(*case))
+            except Exception: # Invalid source, like an unknown task
+                continue
+            result = compare(case, engines)
+            if result is not None:
+                divergence = result
+                changed = True
+                break
+    return divergence
+
+
+def fuzz(runs, seed=None, engines=None, steps=200):
+    """
+    Compares the engines in the given amount of random cases, returning
+    the list of shrunk divergences (empty when every engine agrees).
+    """
+    rng = random.Random(seed)
+    divergences = []
+    for unused in range(runs):
+        case = random_case(rng, steps)
+        try:
+            TuringMachine(case.source)
+        except TMSyntaxError:
+            continue
+        divergence = compare(case, engines)
+        if divergence is not None:
+            divergences.append(shrink(divergence, engines))
+    return divergences
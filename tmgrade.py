@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# Created on Wed Oct 21 15:48:30 2026
+# MIT Licensed. See COPYING.TXT for more information.
+"""
+Grading engine for Coding Dojos: runs a machine on several inputs,
+comparing the results with the expected outputs
+"""
+
+from __future__ import unicode_literals, print_function
+from collections import namedtuple
+from tmbatch import run_batch
+import hashlib, json
+
+__all__ = ["STEPS", "Case", "CASE_DEFAULTS", "Grade", "tape_hash",
+           "load_cases", "grade"]
+
+STEPS = 10 ** 5 # Default steps budget of each case
+
+Case = namedtuple("Case", ["tape", "expected", "halts", "mconf"])
+CASE_DEFAULTS = {"expected": None, "halts": True, "mconf": None}
+
+Grade = namedtuple("Grade", ["passed", "reason", "steps", "halted",
+                             "locked", "certificate", "mconf", "digest"])
+
+
+def tape_hash(tape):
+    """
+    Hash (hex digest) of a tape, as a whitespace-separated string or a list
+    of symbols from the index 0, or a dict (as TuringMachine.tape). The
+    blank ("None") squares are ignored, so equal tapes have equal hashes
+    regardless of how they're written.
+    """
+    if not isinstance(tape, dict):
+        if isinstance(tape, type("")):
+            tape = tape.split()
+        tape = dict(enumerate(tape))
+    cells = sorted([idx, symbol] for idx, symbol in tape.items()
+                                 if symbol != "None")
+    return hashlib.sha1(json.dumps(cells).encode("utf-8")).hexdigest()
+
+
+def _case(case):
+    """ Case from a Case, a dict (with the CASE_DEFAULTS) or a sequence """
+    if isinstance(case, Case):
+        return case
+    if isinstance(case, dict):
+        return Case(**dict(CASE_DEFAULTS, **case))
+    return Case(*case)
+
+
+def _load_tape(tape, name):
+    """ Tape from JSON, whose dict keys (indices) are strings """
+    if isinstance(tape, type("")):
+        return tape
+    if isinstance(tape, list) and \
+       all(isinstance(symbol, type("")) for symbol in tape):
+        return tape
+    if isinstance(tape, dict) and \
+       all(isinstance(symbol, type("")) for symbol in tape.values()):
+        try:
+            return {int(idx): symbol for idx, symbol in tape.items()}
+        except ValueError:
+            pass
+    raise ValueError("Invalid {} tape".format(name))
+
+
+def load_cases(data):
+    """
+    List of Case instances from JSON-decoded data, a list of dicts with
+    the Case fields (only the tape is required, see CASE_DEFAULTS). The
+    tapes are strings, lists of symbols or dicts whose keys are the
+    indices (as strings). Raises ValueError for invalid data.
+    """
+    if not isinstance(data, list):
+        raise ValueError("The cases should be a list")
+    cases = []
+    for item in data:
+        if not isinstance(item, dict) or "tape" not in item:
+            raise ValueError("Each case should be a dict with a tape")
+        unknown = set(item).difference(Case._fields)
+        if unknown:
+            raise ValueError("Unknown case fields: {}"
+                             .format(", ".join(sorted(unknown))))
+        case = Case(**dict(CASE_DEFAULTS, **item))
+        if case.halts not in (True, False, None):
+            raise ValueError("The halts field should be a boolean or null")
+        if not (case.mconf is None or isinstance(case.mconf, type(""))):
+            raise ValueError("The mconf field should be a string or null")
+        cases.append(case._replace(
+            tape=_load_tape(case.tape, "input"),
+            expected=None if case.expected is None else
+                     _load_tape(case.expected, "expected"),
+        ))
+    return cases
+
+
+def _verdict(case, result, expected_digest):
+    """ Reason why the result doesn't match the case, or None """
+    if result.exceeded:
+        return "Memory budget exceeded"
+    if case.halts is True and not result.halted:
+        if result.certificate:
+            return "Never halts ({})".format(result.certificate.kind)
+        return "Didn't halt within the steps budget"
+    if case.halts is False and not result.certificate:
+        if result.halted:
+            return "Halted"
+        return "Not proven to never halt within the steps budget"
+    if case.mconf is not None and result.mconf != case.mconf:
+        return "Wrong final m-configuration"
+    if expected_digest is not None and \
+       tape_hash(result.tape) != expected_digest:
+        return "Wrong output"
+    return None
+
+
+def grade(source, cases, steps=STEPS, processes=1, max_cells=None,
+          max_bytes=None):
+    """
+    Grades the machine with the given source on the cases, returning a
+    Grade for each case, in the same order. Each case input tape runs in
+    the batch engine with the decider, so it stops as soon as it halts (see
+    tmbatch.is_final) or as soon as it's proven to never halt. A case
+    passes when its expected halting behavior (halts True or False, or None
+    for any), final m-configuration (if given) and output tape (if given,
+    compared by tape_hash) all match. The cases can also be dicts, where
+    the missing fields get the CASE_DEFAULTS. The default single process
+    avoids the worker pool startup, which would be slower for small cases.
+    """
+    cases = [_case(case) for case in cases]
+    digests = [None if case.expected is None else tape_hash(case.expected)
+               for case in cases]
+    tapes = [case.tape.split() if isinstance(case.tape, type("")) else
+             case.tape for case in cases]
+    results = run_batch(source, tapes, steps, processes, decide=True,
+                        max_cells=max_cells, max_bytes=max_bytes)
+    grades = []
+    for case, result, digest in zip(cases, results, digests):
+        reason = _verdict(case, result, digest)
+        grades.append(Grade(
+            passed=reason is None,
+            reason=reason,
+            steps=result.steps,
+            halted=result.halted,
+            locked=result.locked,
+            certificate=result.certificate,
+            mconf=result.mconf,
+            digest=tape_hash(result.tape),
+        ))
+    return grades
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+# Created on Tue Oct 20 16:40:12 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Runtime metrics (counters and histograms) of the simulations """
+
+from __future__ import unicode_literals, print_function
+from collections import OrderedDict
+from threading import Lock
+
+__all__ = ["BUCKETS", "Counter", "Histogram", "Registry", "REGISTRY",
+           "counter", "histogram", "render", "record_run", "RUNS", "STEPS",
+           "LOCKS", "TIMEOUTS", "MEMORY_EXCEEDED", "RUN_SECONDS", "PARSE_SECONDS",
+           "BLOCKS_COMPILED", "BLOCK_CACHE_HITS", "MFUNCTION_INSTANCES",
+           "MFUNCTION_CACHE_HITS"]
+
+BUCKETS = (.0001, .001, .01, .1, 1, 10, 100) # Seconds, for the histograms
+
+
+class Counter(object):
+    """ Monotonically increasing value """
+    kind = "counter"
+
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.value = 0
+        self._lock = Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def samples(self):
+        """ List of (name, labels string, value) triples """
+        return [(self.name, "", self.value)]
+
+    def reset(self):
+        with self._lock:
+            self.value = 0
+
+
+class Histogram(object):
+    """ Distribution of the observed values in cumulative buckets """
+    kind = "histogram"
+
+    def __init__(self, name, help, buckets=BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self._lock = Lock()
+        self.reset()
+
+    def observe(self, value):
+        with self._lock:
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[idx] += 1
+                    break
+            self.count += 1
+            self.sum += value
+
+    def samples(self):
+        """ List of (name, labels string, value) triples """
+        with self._lock:
+            result, total = [], 0
+            for bound, count in zip(self.buckets, self.counts):
+                total += count
+                result.append((self.name + "_bucket",
+                               '{{le="{}"}}'.format(float(bound)), total))
+            result.append((self.name + "_bucket", '{le="+Inf"}', self.count))
+            result.append((self.name + "_sum", "", self.sum))
+            result.append((self.name + "_count", "", self.count))
+            return result
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * len(self.buckets)
+            self.count = 0
+            self.sum = 0.
+
+
+class Registry(OrderedDict):
+    """ Metrics by name, rendered in the Prometheus text format """
+
+    def counter(self, name, help):
+        """ Counter with the given name, created when needed """
+        return self._get(Counter, name, help)
+
+    def histogram(self, name, help, buckets=BUCKETS):
+        """ Histogram with the given name, created when needed """
+        return self._get(Histogram, name, help, buckets)
+
+    def _get(self, cls, name, *args):
+        if name not in self:
+            self[name] = cls(name, *args)
+        elif not isinstance(self[name], cls):
+            raise ValueError("Metric '{}' isn't a {}".format(name,
+                                                             cls.kind))
+        return self[name]
+
+    def samples(self):
+        """ Dict with the current value of every sample """
+        return OrderedDict((name + labels, value)
+                           for metric in self.values()
+                           for name, labels, value in metric.samples())
+
+    def render(self):
+        """ Text with every metric in the Prometheus exposition format """
+        lines = []
+        for metric in self.values():
+            lines.append("# HELP {} {}".format(metric.name, metric.help))
+            lines.append("# TYPE {} {}".format(metric.name, metric.kind))
+            lines.extend("{}{} {}".format(name, labels, value)
+                         for name, labels, value in metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """ Zeroes every metric """
+        for metric in self.values():
+            metric.reset()
+
+
+REGISTRY = Registry() # Default registry, for the metrics below
+counter = REGISTRY.counter
+histogram = REGISTRY.histogram
+render = REGISTRY.render
+
+RUNS = counter("pyturing_runs_total", "Runs (sequences of moves) performed")
+STEPS = counter("pyturing_steps_total", "Moves performed by the runs")
+LOCKS = counter("pyturing_locks_total",
+                "Runs stopped as the machine got locked")
+TIMEOUTS = counter("pyturing_timeouts_total",
+                   "Runs that exhausted the steps budget without halting")
+MEMORY_EXCEEDED = counter("pyturing_memory_exceeded_total",
+                          "Runs stopped by the tape memory budget")
+RUN_SECONDS = histogram("pyturing_run_seconds", "Run duration")
+PARSE_SECONDS = histogram("pyturing_parse_seconds",
+                          "Rules compilation (or recompilation) duration")
+BLOCKS_COMPILED = counter("pyturing_blocks_compiled_total",
+                          "Blocks of rules parsed")
+BLOCK_CACHE_HITS = counter("pyturing_block_cache_hits_total",
+                           "Blocks of rules reused when recompiling")
+MFUNCTION_INSTANCES = counter("pyturing_mfunction_instances_total",
+                              "M-function instances created")
+MFUNCTION_CACHE_HITS = counter("pyturing_mfunction_cache_hits_total",
+                               "M-function instances found in the cache")
+
+
+def record_run(steps, seconds, locked=False, timeout=False, exceeded=False):
+    """ Updates the run metrics, once per run (not once per move) """
+    RUNS.inc()
+    STEPS.inc(steps)
+    RUN_SECONDS.observe(seconds)
+    if locked:
+        LOCKS.inc()
+    if timeout:
+        TIMEOUTS.inc()
+    if exceeded:
+        MEMORY_EXCEEDED.inc()
@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+# Created on Mon Oct 19 09:14:03 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Multi-tape Turing machines and their reduction to a single tape """
+
+from __future__ import unicode_literals, print_function
+from collections import OrderedDict
+from itertools import product
+from pyturing import (TMSyntaxError, TMLocked, raw_rule_generator,
+                      evaluate_symbol_query, config_parser, action_parser,
+                      TuringMachine)
+import sys
+
+__all__ = ["TAPE_SEPARATOR", "split_tapes", "compile_tasks",
+           "MultiTapeMachine", "ReducedMachine", "verify_reduction"]
+
+# Python 2.x and 3.x compatibility
+if sys.version_info.major == 2:
+    range = xrange
+
+TAPE_SEPARATOR = "|"
+HEAD_MARK = "[" # Never part of a symbol, as it's a special token
+
+
+def split_tapes(tokens, tapes):
+    """
+    Splits the tokens in groups (one for each tape) separated by the
+    TAPE_SEPARATOR token. A single empty group means "nothing" for every
+    tape. Raises TMSyntaxError when the amount of groups isn't right.
+    """
+    groups = [[]]
+    for token in tokens:
+        if token == TAPE_SEPARATOR:
+            groups.append([])
+        else:
+            groups[-1].append(token)
+    if groups == [[]]:
+        return [[] for unused in range(tapes)]
+    if len(groups) != tapes:
+        raise TMSyntaxError("Expected {} tapes, found {}"
+                            .format(tapes, len(groups)))
+    return groups
+
+
+def compile_tasks(tasks):
+    """
+    Compiles a sequence of task strings for a single tape into a tuple of
+    ("P", symbol) and ("M", delta) operations, where "P" prints (or erases
+    when the symbol is "None") and "M" moves the head delta squares.
+    """
+    ops = []
+    for task in tasks:
+        if task == "R":
+            ops.append(("M", 1))
+        elif task == "L":
+            ops.append(("M", -1))
+        elif task == "E":
+            ops.append(("P", "None"))
+        elif task.startswith("P") and len(task) > 1:
+            ops.append(("P", task[1:]))
+        elif task != "N":
+            raise TMSyntaxError("Unknown task '{}'".format(task))
+    return tuple(ops)
+
+
+class MultiTapeMachine(OrderedDict):
+    """
+    Turing machine with several tapes, each one with its own head. The rules
+    use the same syntax of the TuringMachine rules, but with the symbol
+    queries and the behaviours of each tape separated by "|", like in::
+
+      copy
+        0    | None -> R | P0 R copy
+        1    | None -> R | P1 R copy
+        None | None -> done
+
+    Every tape query or behaviour might be empty, and when there's a single
+    empty group, it applies to all the tapes. The rules are stored with the
+    (m-configuration, tuple of scanned symbols) keys and (tuple of compiled
+    operations per tape, final m-configuration) values (see compile_tasks).
+    Rules with some absence query ("Not" or an empty query) have a lower
+    priority, and are stored in self.inv_dict.
+    """
+    def __init__(self, data="", tapes=None):
+        """
+        Constructor from the raw string data with the rules. The amount of
+        tapes is the largest amount of groups in a rule, when not given.
+        The starting complete configuration has the index 0 in every empty
+        tape, and the first m-configuration in data.
+        """
+        super(MultiTapeMachine, self).__init__()
+        rules = [config_parser(*config) + action_parser(*action)
+                 for config, action in raw_rule_generator(data)]
+        if tapes is None:
+            tapes = max([1] + [tokens.count(TAPE_SEPARATOR) + 1
+                               for rule in rules
+                               for tokens in (rule[1], rule[2])])
+        self.size = tapes
+        self._tapes = [{} for unused in range(tapes)]
+        self.indices = [0] * tapes
+        self.steps = 0
+        self.inv_dict = OrderedDict()
+        last_m = ""
+        for mconfs_in, symbols_in, tasks, mco in rules:
+            if mconfs_in == (" ",):
+                if not last_m:
+                    raise TMSyntaxError("Missing m-configuration in "
+                                        "the first rule")
+                mconfs_in = last_m
+            else:
+                if not last_m and not hasattr(self, "mconf"):
+                    self.mconf = mconfs_in[0]
+                last_m = mconfs_in
+            queries = [evaluate_symbol_query(*group)
+                       for group in split_tapes(symbols_in, tapes)]
+            act = (tuple(compile_tasks(group)
+                         for group in split_tapes(tasks, tapes)), mco)
+            for mci in mconfs_in:
+                if all(presence for symbs, presence in queries):
+                    for symbols in product(*[symbs for symbs, p in queries]):
+                        self.setdefault((mci, symbols), act)
+                else:
+                    self.inv_dict.setdefault(mci, []).append((queries, act))
+
+    @property
+    def tapes(self):
+        return self._tapes
+
+    @tapes.setter
+    def tapes(self, values):
+        if len(values) != self.size:
+            raise ValueError("Expected {} tapes".format(self.size))
+        self._tapes = [{k: v for k, v in (value.items()
+                                          if isinstance(value, dict)
+                                          else enumerate(value))
+                              if v != "None"}
+                       for value in values]
+
+    def scan(self):
+        """ Tuple with the symbol in each tape head ("None" for blank) """
+        return tuple(tape.get(idx, "None")
+                     for tape, idx in zip(self._tapes, self.indices))
+
+    def __missing__(self, key):
+        mci, symbols = key
+        for queries, act in self.inv_dict.get(mci, []):
+            if all((s in symbs) == presence
+                   for s, (symbs, presence) in zip(symbols, queries)):
+                return act
+        raise TMLocked("No rule found for the current configuration")
+
+    def move(self):
+        """ Perform one rule in the machine """
+        self.run(1)
+
+    def run(self, steps):
+        """
+        Perform the given amount of moves, raising TMLocked when there's no
+        rule for the current configuration.
+        """
+        tapes, indices = self._tapes, self.indices
+        pairs = list(zip(tapes, range(self.size)))
+        for unused in range(steps):
+            symbols = tuple(tape.get(indices[n], "None")
+                            for tape, n in pairs)
+            programs, mco = self[self.mconf, symbols]
+            for (tape, n), program in zip(pairs, programs):
+                for op, arg in program:
+                    if op == "M":
+                        indices[n] += arg
+                    elif arg == "None":
+                        tape.pop(indices[n], None)
+                    else:
+                        tape[indices[n]] = arg
+            self.mconf = mco
+            self.steps += 1
+
+    def copy(self):
+        """ Copy sharing the rules, but with its own complete configuration """
+        mtm = MultiTapeMachine(tapes=self.size)
+        mtm.update(self)
+        mtm.inv_dict.update(self.inv_dict)
+        mtm.indices = list(self.indices)
+        mtm.steps = self.steps
+        if hasattr(self, "mconf"):
+            mtm.mconf = self.mconf
+        mtm.tapes = self.tapes
+        return mtm
+
+    def normal_step(self, mconf, symbols):
+        """
+        Normalized rule, as a ((print or None, delta) for each tape, next
+        m-configuration) pair, where each tape prints at most a symbol and
+        then moves at most a square. The behaviours with more operations are
+        split using ("split", remaining pairs for each tape, m-configuration)
+        tuples as intermediate m-configurations.
+        """
+        if isinstance(mconf, tuple) and mconf[0] == "split":
+            pairs, mco = mconf[1:]
+        else:
+            programs, mco = self[mconf, symbols]
+            pairs = tuple(_print_move_pairs(program) for program in programs)
+        step = tuple(p[0] if p else (None, 0) for p in pairs)
+        rest = tuple(p[1:] for p in pairs)
+        return step, (("split", rest, mco) if any(rest) else mco)
+
+
+def _print_move_pairs(program):
+    """ Splits the compiled operations in (print or None, delta) pairs """
+    pairs, printing = [], None
+    for op, arg in program:
+        if op == "P":
+            printing = arg
+        else:
+            pairs.append((printing, arg))
+            printing = None
+    if printing is not None:
+        pairs.append((printing, 0))
+    return tuple(pairs)
+
+
+def _decode(cell, size):
+    """ Lists of symbols and head flags from a reduced machine square """
+    if cell == "None":
+        return ["None"] * size, [False] * size
+    parts = cell.split(TAPE_SEPARATOR)
+    heads = [part.startswith(HEAD_MARK) for part in parts]
+    return [part[1:] if head else part
+            for part, head in zip(parts, heads)], heads
+
+
+def _encode(symbols, heads):
+    """ Reduced machine square from the symbols and head flags """
+    if not any(heads) and all(symbol == "None" for symbol in symbols):
+        return "None"
+    return TAPE_SEPARATOR.join((HEAD_MARK if head else "") + symbol
+                               for symbol, head in zip(symbols, heads))
+
+
+class ReducedMachine(TuringMachine):
+    """
+    Single tape TuringMachine that simulates a MultiTapeMachine. Each square
+    holds the symbols of every tape in the same index, joined by "|", where
+    the squares with a head are marked with a "[" prefix. Each move of the
+    simulated machine is performed by:
+
+    - Sweeping right ("scan" m-configurations) from somewhere at the left of
+      every head, until all the scanned symbols are known;
+    - Sweeping left ("apply" m-configurations) from the rightmost head,
+      printing and moving the heads with the normalized rule (see
+      MultiTapeMachine.normal_step). Moving a head to the right takes a step
+      forward and back ("right" and "back" m-configurations), and moving it
+      to the left happens in the next square ("place" m-configuration when
+      it's past the leftmost head).
+
+    The m-configurations are tuples, and the rules are only created (and
+    memoized) when needed.
+    """
+    def __init__(self, mtm):
+        super(ReducedMachine, self).__init__()
+        self.mtm = mtm
+        size = mtm.size
+        cells = set(mtm.indices).union(*mtm.tapes)
+        self.tape = {idx: _encode([tape.get(idx, "None")
+                                   for tape in mtm.tapes],
+                                  [head == idx for head in mtm.indices])
+                     for idx in cells}
+        self.index = min(mtm.indices)
+        self.mconf = ("scan", mtm.mconf, (None,) * size)
+
+    def __missing__(self, key):
+        state, cell = key
+        act = self.transition(state, *_decode(cell, self.mtm.size))
+        self[key] = act
+        return act
+
+    def transition(self, state, symbols, heads):
+        kind = state[0]
+        if kind == "scan":
+            mconf, found = state[1:]
+            found = tuple(symbol if head and f is None else f
+                          for symbol, head, f in zip(symbols, heads, found))
+            if None in found:
+                return ("R",), ("scan", mconf, found)
+            step, mco = self.mtm.normal_step(mconf, found)
+            return (), ("apply", step, mco, (True,) * len(found),
+                        (False,) * len(found))
+        if kind == "apply":
+            step, mco, remaining, left = state[1:]
+            heads = [h or l for h, l in zip(heads, left)]
+            symbols = list(symbols)
+            left, right = [False] * len(heads), [False] * len(heads)
+            remaining = list(remaining)
+            for n, (printing, delta) in enumerate(step):
+                if heads[n] and remaining[n]:
+                    remaining[n] = False
+                    if printing is not None:
+                        symbols[n] = printing
+                    if delta:
+                        heads[n] = False
+                        (left if delta < 0 else right)[n] = True
+            new_cell = "P" + _encode(symbols, heads)
+            nxt = step, mco, tuple(remaining), tuple(left)
+            if any(right):
+                return (new_cell, "R"), ("right", tuple(right)) + nxt
+            if any(remaining):
+                return (new_cell, "L"), ("apply",) + nxt
+            if any(left):
+                return (new_cell, "L"), ("place", mco, tuple(left))
+            return (new_cell,), ("scan", mco, (None,) * len(heads))
+        if kind == "right":
+            right, step, mco, remaining, left = state[1:]
+            heads = [h or r for h, r in zip(heads, right)]
+            return ("P" + _encode(symbols, heads), "L"), \
+                   ("back", step, mco, remaining, left)
+        if kind == "back":
+            step, mco, remaining, left = state[1:]
+            if any(remaining):
+                return ("L",), ("apply", step, mco, remaining, left)
+            if any(left):
+                return ("L",), ("place", mco, left)
+            return (), ("scan", mco, (None,) * len(heads))
+        if kind == "place":
+            mco, left = state[1:]
+            heads = [h or l for h, l in zip(heads, left)]
+            return ("P" + _encode(symbols, heads),), \
+                   ("scan", mco, (None,) * len(heads))
+        raise TMLocked("Unknown reduced machine m-configuration")
+
+    def decode(self):
+        """
+        Tapes (list of dicts) and head indices of the simulated machine.
+        """
+        size = self.mtm.size
+        tapes = [{} for unused in range(size)]
+        indices = [None] * size
+        for idx, cell in self.tape.items():
+            symbols, heads = _decode(cell, size)
+            for n in range(size):
+                if symbols[n] != "None":
+                    tapes[n][idx] = symbols[n]
+                if heads[n]:
+                    indices[n] = idx
+        return tapes, indices
+
+    def is_move_start(self):
+        """
+        Tells whether the reduced machine is scanning for the symbols of a
+        move of the multi-tape machine, not having found any of them yet.
+        """
+        kind, mconf, found = (self.mconf + (None, None))[:3]
+        return kind == "scan" and not (isinstance(mconf, tuple) and
+                                       mconf[0] == "split") \
+                              and all(f is None for f in found)
+
+
+def verify_reduction(mtm, steps, max_moves=None):
+    """
+    Runs a copy of the multi-tape machine and its ReducedMachine in lockstep
+    for the given amount of moves (of the multi-tape machine), comparing the
+    tapes, the head indices and the m-configuration after each move. Returns
+    the amount of moves the reduced machine needed, raising a ValueError
+    when they diverge (or when it needs more than max_moves moves).
+    """
+    mtm = mtm.copy()
+    reduced = ReducedMachine(mtm.copy())
+    for step in range(steps):
+        mtm.move()
+        applied = False
+        while not (applied and reduced.is_move_start()):
+            if max_moves is not None and reduced.steps >= max_moves:
+                raise ValueError("Too many moves in the reduced machine")
+            reduced.move()
+            applied = applied or reduced.mconf[0] != "scan"
+        tapes, indices = reduced.decode()
+        if (tapes, indices, reduced.mconf[1]) != \
+           (mtm.tapes, mtm.indices, mtm.mconf):
+            raise ValueError("The reduced machine diverged in the move {}"
+                             .format(step + 1))
+    return reduced.steps
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+# Created on Sun Oct 18 11:40:12 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Time and space complexity profiler for Turing machines """
+
+from __future__ import unicode_literals, print_function, division
+from collections import namedtuple, OrderedDict
+from pyturing import TMLocked, TMMemoryExceeded, TuringMachine
+from tmbatch import run_batch
+import inspect, math, pyturing
+
+__all__ = ["ORDERS", "Fit", "Row", "Profile", "MemoryReport", "fit_order",
+           "predict", "profile", "memory_report"]
+
+
+def _power(base, exponent):
+    try:
+        return math.pow(base, exponent)
+    except OverflowError:
+        return float("inf")
+
+
+ORDERS = OrderedDict([ # From the slowest growth to the fastest one
+    ("O(1)",       lambda n: 1.),
+    ("O(log n)",   lambda n: math.log(n + 1)),
+    ("O(n)",       lambda n: n),
+    ("O(n log n)", lambda n: n * math.log(n + 1)),
+    ("O(n^2)",     lambda n: n ** 2),
+    ("O(n^3)",     lambda n: n ** 3),
+    ("O(2^n)",     lambda n: _power(2, n)),
+])
+
+Fit = namedtuple("Fit", ["order", "coefficient", "offset", "exponent",
+                         "error"])
+Row = namedtuple("Row", ["size", "steps", "extent", "seconds", "estimated"])
+Profile = namedtuple("Profile", ["rows", "time", "space"])
+MemoryReport = namedtuple("MemoryReport", ["peak", "tape", "rules", "trace",
+                                           "other", "steps", "stop"])
+
+# TuringMachine methods whose allocations are the tape and the trace buffer
+TAPE_METHODS = ["print", "perform", "tape"]
+TRACE_METHODS = ["move", "overwritten_cells", "enable_undo", "step_back"]
+
+
+def fit_order(sizes, values):
+    """
+    Finds the order in ORDERS that best fits the given values as a function
+    of the given positive sizes, i.e., the one whose affine model
+    ``value = coefficient * order(size) + offset`` has the least mean
+    squared relative error, with a positive coefficient. The simplest order
+    wins a tie. Also finds the exponent of the power law that best fits the
+    data in a logarithmic scale. Returns a Fit instance, or None when
+    there's less than two distinct sizes with positive values.
+    """
+    points = [(n, y) for n, y in zip(sizes, values) if n > 0 and y > 0]
+    if len(set(n for n, y in points)) < 2:
+        return None
+    log_ns = [math.log(n) for n, y in points]
+    log_ys = [math.log(y) for n, y in points]
+    mean_log_n = sum(log_ns) / len(points)
+    mean_log_y = sum(log_ys) / len(points)
+    exponent = (sum((ln - mean_log_n) * (ly - mean_log_y)
+                    for ln, ly in zip(log_ns, log_ys)) /
+                sum((ln - mean_log_n) ** 2 for ln in log_ns))
+    best = None
+    for order, func in ORDERS.items():
+        fs = [func(n) for n, y in points]
+        if not all(f < float("inf") for f in fs):
+            continue
+        ws = [y ** -2 for n, y in points] # Weights for the relative error
+        swff = sum(w * f * f for w, f in zip(ws, fs))
+        swf = sum(w * f for w, f in zip(ws, fs))
+        sw = sum(ws)
+        swfy = sum(w * f * y for w, f, (n, y) in zip(ws, fs, points))
+        swy = sum(w * y for w, (n, y) in zip(ws, points))
+        det = swff * sw - swf * swf
+        if abs(det) > 1e-12 * swff * sw:
+            coefficient = (swfy * sw - swf * swy) / det
+            offset = (swff * swy - swf * swfy) / det
+        else: # Constant order(size), the offset can't be told apart
+            coefficient, offset = swfy / swff, 0.
+        if coefficient <= 0:
+            continue
+        error = sum(w * (coefficient * f + offset - y) ** 2
+                    for w, f, (n, y) in zip(ws, fs, points)) / len(points)
+        if best is None or error < best.error - 1e-9:
+            best = Fit(order, coefficient, offset, exponent, error)
+    return best
+
+
+def predict(fit, size):
+    """ Estimated value for the given size, from a Fit instance """
+    return fit.coefficient * ORDERS[fit.order](size) + fit.offset
+
+
+def profile(source, generator, sizes, steps, processes=None, probes=4):
+    """
+    Measures how the amount of steps and the tape extent grow with the input
+    size, running the machine with the given source on the tapes
+    generator(n) for each n in sizes, using the batch engine.
+
+    The smallest probes sizes run first. The remaining sizes run only when
+    the amount of steps predicted from the probes fits in the steps budget,
+    otherwise their values are extrapolated. Sizes whose machine doesn't
+    halt within the budget are extrapolated as well. Returns a Profile
+    instance with a Row per size (sorted) and the time/space Fit instances
+    (None when there's not enough data).
+    """
+    sizes = sorted(set(sizes))
+    measured = OrderedDict()
+    def measure(batch_sizes):
+        tapes = [generator(n) for n in batch_sizes]
+        results = run_batch(source, tapes, steps, processes)
+        measured.update((n, r) for n, r in zip(batch_sizes, results)
+                                  if r.halted)
+        return fit_order(list(measured), [r.steps for r in measured.values()])
+    time_fit = measure(sizes[:probes])
+    remaining = [n for n in sizes[probes:]
+                   if time_fit is None or predict(time_fit, n) <= steps]
+    if remaining:
+        measure(remaining)
+    time_fit = fit_order(list(measured), [r.steps for r in measured.values()])
+    space_fit = fit_order(list(measured),
+                          [r.extent for r in measured.values()])
+    rows = []
+    for n in sizes:
+        if n in measured:
+            r = measured[n]
+            rows.append(Row(n, r.steps, r.extent, r.seconds, False))
+        else:
+            rows.append(Row(n,
+                int(round(predict(time_fit, n))) if time_fit else None,
+                int(round(predict(space_fit, n))) if space_fit else None,
+                None, True))
+    return Profile(rows, time_fit, space_fit)
+
+
+def _categories():
+    """
+    List of (first line, last line, category) triples for the pyturing
+    module functions and TuringMachine methods, where the category is
+    "tape", "trace" or "rules" (anything else in the module).
+    """
+    result = []
+    members = list(vars(pyturing.TuringMachine).items()) + \
+              list(vars(pyturing.InstanceTable).items()) + \
+              list(vars(pyturing).items())
+    for name, member in members:
+        if isinstance(member, property):
+            member = member.fset
+        member = getattr(member, "__wrapped__", member)
+        if not inspect.isfunction(member) or \
+           member.__module__ != "pyturing":
+            continue
+        lines, first = inspect.getsourcelines(member)
+        category = "tape" if name in TAPE_METHODS else \
+                   "trace" if name in TRACE_METHODS else "rules"
+        result.append((first, first + len(lines) - 1, category))
+    return result
+
+
+def memory_report(source, tape, steps, undo=False, max_cells=None,
+                  max_bytes=None, frames=25):
+    """
+    Runs the machine with the given source on the tape for the given
+    amount of steps using tracemalloc (Python 3.4+), returning a
+    MemoryReport with the peak traced memory and the memory at the end of
+    the run (all in bytes) allocated by the tape, the rules (including the
+    m-function instances), the trace buffer (the undo log, enabled with
+    the undo flag) and anything else. The steps field is the amount of
+    moves performed, and stop is "steps", "locked" or "memory" (for the
+    max_cells/max_bytes budget, see TuringMachine.check_budget), telling
+    why the run stopped.
+    """
+    import tracemalloc
+    ranges = _categories()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(frames)
+    try:
+        tracemalloc.clear_traces()
+        tm = TuringMachine(source)
+        if undo:
+            tm.enable_undo()
+        tm.tape = tape
+        tm.max_cells, tm.max_bytes = max_cells, max_bytes
+        stop = "steps"
+        try:
+            tm.run(steps)
+        except TMLocked:
+            stop = "locked"
+        except TMMemoryExceeded:
+            stop = "memory"
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    sizes = dict.fromkeys(["tape", "rules", "trace", "other"], 0)
+    for stat in snapshot.statistics("traceback"):
+        category = "other"
+        for frame in reversed(stat.traceback): # From the most recent frame
+            if frame.filename == pyturing.__file__ or \
+               frame.filename.endswith("pyturing.py"):
+                for first, last, name in ranges:
+                    if first <= frame.lineno <= last:
+                        category = name
+                        break
+                break
+        sizes[category] += stat.size
+    return MemoryReport(peak=peak, steps=tm.steps, stop=stop, **sizes)
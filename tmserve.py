@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+# Created on Wed Oct 21 13:36:05 2026
+# MIT Licensed. See COPYING.TXT for more information.
+"""
+Daemon that keeps the parsed machines warm for repeated CLI invocations,
+listening on a Unix socket, and its thin client
+"""
+
+from __future__ import unicode_literals, print_function
+from collections import namedtuple
+from threading import Lock
+import errno, hashlib, io, json, os, signal, socket, stat, sys
+
+try:
+    import socketserver
+except ImportError: # Python 2
+    import SocketServer as socketserver
+
+__all__ = ["Entry", "MachineCache", "run", "Server", "serve",
+           "request"]
+
+# The client only needs the imports above, the pyturing and tmview modules
+# are imported by the server functions, to keep the client startup fast
+
+Entry = namedtuple("Entry", ["mtime", "size", "digest", "machine"])
+
+
+class MachineCache(object):
+    """
+    Parsed machines by their source file name. A machine is reused while
+    the file modification time and size don't change, and also when they
+    change but the contents hash is the same. The parses counter tells how
+    many times a machine was parsed.
+    """
+    def __init__(self):
+        self.entries = {}
+        self.parses = 0
+        self.lock = Lock()
+
+    def machine(self, filename):
+        """ TuringMachine for the source in the file (shared, don't run) """
+        from pyturing import TuringMachine
+        filename = os.path.abspath(filename)
+        info = os.stat(filename)
+        with self.lock:
+            entry = self.entries.get(filename)
+            if entry and (entry.mtime, entry.size) == (info.st_mtime,
+                                                       info.st_size):
+                return entry.machine
+            with io.open(filename, "r", encoding="utf-8") as f:
+                source = f.read()
+            digest = hashlib.sha1(source.encode("utf-8")).hexdigest()
+            if entry and entry.digest == digest:
+                machine = entry.machine
+            else:
+                machine = TuringMachine(source)
+                self.parses += 1
+            self.entries[filename] = Entry(info.st_mtime, info.st_size,
+                                           digest, machine)
+            return machine
+
+
+def run(cache, req):
+    """
+    Response dict for the request dict with the machine file name, the
+    tape (whitespace-separated string or list of symbols from the index 0)
+    and the amount of moves, besides the optional window radius, maximum
+    amount of runs, cursor (see tmview.report) and memory budget
+    (max_cells and max_bytes). The
+    response has the last complete configuration, the locked/exceeded flags
+    and the output text, or just an error message.
+    """
+    from pyturing import TMLocked, TMMemoryExceeded, TMSyntaxError
+    import tmview
+    try:
+        tm = cache.machine(req["machine"]).copy()
+        tape = req.get("tape", [])
+        tm.tape = tape.split() if isinstance(tape, type("")) else tape
+        tm.max_cells = req.get("max_cells")
+        tm.max_bytes = req.get("max_bytes")
+        moves = int(req.get("moves", 0))
+        runs = int(req.get("runs") or tmview.MAX_RUNS)
+        if runs < 1:
+            raise ValueError("The runs should be positive")
+    except (EnvironmentError, TMSyntaxError, ValueError, KeyError,
+            TMMemoryExceeded) as exc:
+        return {"error": "{}: {}".format(type(exc).__name__, exc)}
+    lines = ["Running the machine from the index {}".format(tm.index)]
+    locked = exceeded = False
+    try:
+        tm.run(moves)
+    except TMLocked as exc:
+        locked = True
+        lines.append("Locked after {} moves: {}".format(tm.steps, exc))
+    except TMMemoryExceeded as exc:
+        exceeded = True
+        lines.append("Memory budget exceeded after {} moves: {}"
+                     .format(tm.steps, exc))
+    lines.append(tmview.report(tm, req.get("window"), runs,
+                               req.get("cursor")))
+    return {
+        "mconf": getattr(tm, "mconf", None),
+        "index": tm.index,
+        "steps": tm.steps,
+        "tape": sorted(tm.tape.items()),
+        "locked": locked,
+        "exceeded": exceeded,
+        "output": "\n".join(lines),
+    }
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """ A request (JSON line) and its response per connection """
+
+    def handle(self):
+        try:
+            req = json.loads(self.rfile.readline().decode("utf-8"))
+        except ValueError as exc:
+            response = {"error": "Invalid request: {}".format(exc)}
+        else:
+            response = run(self.server.cache, req)
+        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+
+def _remove_stale_socket(path):
+    """
+    Removes the socket file left by a daemon that's no longer running,
+    raising an EnvironmentError when the path is something else (like a
+    regular file) or the socket of a running daemon.
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except EnvironmentError as exc:
+        if exc.errno == errno.ENOENT:
+            return
+        raise
+    if not stat.S_ISSOCK(mode):
+        raise EnvironmentError(errno.EEXIST, "Not a socket", path)
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(path)
+    except EnvironmentError as exc:
+        if exc.errno != errno.ECONNREFUSED:
+            raise
+        os.remove(path) # Nobody listening
+        return
+    finally:
+        client.close()
+    raise EnvironmentError(errno.EADDRINUSE, "Daemon already running",
+                           path)
+
+
+class Server(socketserver.UnixStreamServer):
+    """
+    Daemon server for the requests (see run) sent to the Unix socket path,
+    handled one at a time with the machines in the cache. A stale socket
+    file in the path is replaced, but anything else raises an
+    EnvironmentError.
+    """
+    def __init__(self, path):
+        _remove_stale_socket(path)
+        socketserver.UnixStreamServer.__init__(self, path, _Handler)
+        self.cache = MachineCache()
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+def serve(server):
+    """
+    Runs the daemon (a Server, or a Unix socket path for a new one) until
+    it's interrupted or terminated
+    """
+    if not isinstance(server, Server):
+        server = Server(server)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit())
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+
+
+def request(path, machine, tape, moves, **kwargs):
+    """
+    Sends a request to the daemon listening at the Unix socket path,
+    returning the response dict (see run). The machine file name is sent
+    as an absolute path, as the daemon might have another working directory.
+    """
+    req = dict(kwargs, machine=os.path.abspath(machine), tape=tape,
+               moves=moves)
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(path)
+        client.sendall((json.dumps(req) + "\n").encode("utf-8"))
+        chunks = []
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        client.close()
+    return json.loads(b"".join(chunks).decode("utf-8"))
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# Created on Tue Oct 20 11:05:36 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Delta frame streaming of Turing machine runs, for live visualization """
+
+from __future__ import unicode_literals, print_function
+from pyturing import TMLocked, TMMemoryExceeded, encode_tape, decode_tape
+import sys, time
+
+__all__ = ["FPS", "KEYFRAME_EVERY", "keyframe", "frames", "apply_frame"]
+
+# Python 2.x and 3.x compatibility
+if sys.version_info.major == 2:
+    range = xrange
+
+FPS = 30 # Default frame rate
+KEYFRAME_EVERY = 100 # Default amount of frames between keyframes
+CLOCK_BATCH = 256 # Moves between clock readings
+
+
+def keyframe(tm):
+    """ Frame (dict) with the whole complete configuration """
+    return {
+        "type": "key",
+        "steps": tm.steps,
+        "mconf": getattr(tm, "mconf", None),
+        "index": tm.index,
+        "tape": encode_tape(tm.tape),
+    }
+
+
+def _offsets(tasks):
+    """ Index offsets of the squares printed or erased by the tasks """
+    offsets, offset = [], 0
+    for task in tasks:
+        if task == "R":
+            offset += 1
+        elif task == "L":
+            offset -= 1
+        elif task == "E" or task.startswith("P"):
+            offsets.append(offset)
+    return tuple(offsets)
+
+
+def frames(tm, steps, fps=FPS, keyframe_every=KEYFRAME_EVERY,
+           clock=time.time):
+    """
+    Generator of frames (JSON-friendly dicts) while running the machine for
+    the given amount of moves. It starts with a keyframe, followed by
+    "delta" frames with the steps counter, m-configuration, index and the
+    [index, symbol] pairs of the squares changed since the previous frame.
+    The changes are coalesced so that there's at most fps frames per second
+    (using the clock), or one delta frame per move when fps is None. After
+    every keyframe_every frames there's a keyframe instead, so a late
+    joiner can resync. The last frame has the changes since the previous
+    one, with a "locked" key that tells whether the machine got locked, and
+    an "exceeded" key that tells whether the run stopped as the next move
+    would exceed the machine memory budget (see TuringMachine.check_budget).
+    """
+    yield keyframe(tm)
+    touched = set()
+    offsets_cache = {}
+    interval = None if fps is None else 1. / fps
+    last_time = clock()
+    count = 0 # Frames since the last keyframe
+    locked = exceeded = False
+    for step in range(1, steps + 1):
+        try:
+            tasks = tm[getattr(tm, "mconf", None), tm.scan()][0]
+            if tasks not in offsets_cache:
+                offsets_cache[tasks] = _offsets(tasks)
+            index = tm.index
+            touched.update(index + offset for offset in offsets_cache[tasks])
+            tm.move()
+        except TMLocked:
+            locked = True
+            break
+        except TMMemoryExceeded:
+            exceeded = True
+            break
+        if step == steps:
+            break
+        if interval is not None:
+            if step % CLOCK_BATCH:
+                continue
+            now = clock()
+            if now - last_time < interval:
+                continue
+            last_time = now
+        count += 1
+        if count == keyframe_every:
+            count = 0
+            touched.clear()
+            yield keyframe(tm)
+        else:
+            yield _delta(tm, touched)
+    frame = _delta(tm, touched)
+    frame["locked"] = locked
+    frame["exceeded"] = exceeded
+    yield frame
+
+
+def _delta(tm, touched):
+    """ Delta frame with the touched squares, clearing them """
+    tape = tm.tape
+    frame = {
+        "type": "delta",
+        "steps": tm.steps,
+        "mconf": getattr(tm, "mconf", None),
+        "index": tm.index,
+        "cells": [[idx, tape.get(idx, "None")] for idx in sorted(touched)],
+    }
+    touched.clear()
+    return frame
+
+
+def apply_frame(state, frame):
+    """
+    Updates the state dict (with the "steps", "mconf", "index" and "tape"
+    keys, the tape being a dict) with the given frame, returning it. The
+    state should be None (or an empty dict) before the first keyframe,
+    and delta frames are ignored while there's no keyframe.
+    """
+    if state is None:
+        state = {}
+    if frame["type"] == "key":
+        state.update(frame)
+        state["tape"] = decode_tape(frame["tape"])
+    elif "tape" in state:
+        tape = state["tape"]
+        for idx, symbol in frame["cells"]:
+            if symbol == "None":
+                tape.pop(idx, None)
+            else:
+                tape[idx] = symbol
+        for key in ["steps", "mconf", "index"]:
+            state[key] = frame[key]
+    state.pop("type", None)
+    return state
@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+# Created on Mon Oct 19 14:21:08 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Universal Turing machine, for guests given by standard descriptions """
+
+from __future__ import unicode_literals, print_function
+from collections import namedtuple
+from pyturing import TuringMachine
+import re, sys, time
+
+__all__ = ["UTM_SOURCE", "Guest", "Benchmark", "encode", "decode",
+           "universal_machine", "is_cycle_start", "run_guest",
+           "fast_forward", "benchmark"]
+
+# Python 2.x and 3.x compatibility
+if sys.version_info.major == 2:
+    range = xrange
+
+
+UTM_SOURCE = """
+# Universal machine for standard descriptions. The tape is
+#
+#   <description> :: <register> :: <cells>
+#
+# where the register has the current state q_i as A^i, padded with "_"
+# squares, and each cell of the guest tape has the symbol S_j as C^j after
+# its first square (D, or H for the scanned one), padded with "_" squares.
+# Marked squares: d (current instruction), a (A), c (C), u (_).
+
+begin  D -> Pd st_find             # Each cycle starts here, at index 0
+
+# Compares the instruction state with the register, marking an A in both
+st_find
+  [d a]  -> R st_find
+  A      -> Pa st_reg
+  D      -> st_end                 # End of the instruction state
+st_reg
+  Not :: -> R st_reg
+  ::     -> R st_reg2
+st_reg2
+  a      -> R st_reg2
+  A      -> Pa st_back
+  [_ ::] -> mismatch
+st_back
+  Not d  -> L st_back
+  d      -> st_find
+st_end
+  Not :: -> R st_end
+  ::     -> R st_end2
+st_end2
+  a      -> R st_end2
+  A      -> mismatch
+  [_ ::] -> sy_back
+
+# Compares the instruction symbol with the scanned cell the same way
+sy_back
+  Not d  -> L sy_back
+  d      -> R sy_skip
+sy_skip
+  a      -> R sy_skip
+  D      -> R sy_find
+sy_find
+  c      -> R sy_find
+  C      -> Pc sy_cell
+  D      -> sy_end                 # End of the instruction symbol
+sy_cell
+  Not H  -> R sy_cell
+  H      -> R sy_cell2
+sy_cell2
+  c          -> R sy_cell2
+  C          -> Pc sy_back
+  Not [c C]  -> mismatch
+sy_end
+  Not H  -> R sy_end
+  H      -> R sy_end2
+sy_end2
+  c          -> R sy_end2
+  C          -> mismatch
+  Not [c C]  -> match
+
+# Unmarks everything and tries the next instruction (locks after the last)
+mismatch
+  a          -> PA L mismatch
+  c          -> PC L mismatch
+  d          -> PD R skip
+  Not [a c d] -> L mismatch
+skip
+  Not ;  -> R skip
+  ;      -> R next
+next
+  D      -> Pd st_find
+
+# Prints the symbol, erasing the scanned cell then copying the C squares
+match
+  Not H  -> L match
+  H      -> R clear
+clear
+  [c C]     -> P_ R clear
+  Not [c C] -> pr_back
+pr_back
+  Not d  -> L pr_back
+  d      -> R pr_skip1
+pr_skip1
+  a      -> R pr_skip1
+  D      -> R pr_skip2
+pr_skip2
+  c      -> R pr_skip2
+  D      -> R pr_find
+pr_find
+  c      -> R pr_find
+  C      -> Pc pr_cell
+  L      -> mv_L
+  R      -> mv_R
+  N      -> reg_back
+pr_cell
+  Not H  -> R pr_cell
+  H      -> R pr_cell2
+pr_cell2
+  C      -> R pr_cell2
+  _      -> PC pr_back
+
+# Moves the head mark (locks when leaving the leftmost cell)
+mv_L
+  Not H  -> R mv_L
+  H      -> L mv_L2
+mv_L2
+  [C _]  -> L mv_L2
+  D      -> PH R mv_L3
+mv_L3
+  [C _]  -> R mv_L3
+  H      -> PD reg_back
+mv_R
+  Not H  -> R mv_R
+  H      -> PD R mv_R2
+mv_R2
+  [C _]  -> R mv_R2
+  D      -> PH reg_back
+  None   -> PH ext
+
+# Appends a blank cell with the width of the previous one
+ext
+  Not D  -> L ext
+  D      -> R ext2
+ext2
+  [c u]  -> R ext2
+  C      -> Pc ext3
+  _      -> Pu ext3
+  H      -> ext_done
+ext3
+  Not None -> R ext3
+  None     -> P_ ext
+ext_done
+  c      -> PC L ext_done
+  u      -> P_ L ext_done
+  H      -> L ext_done
+  D      -> reg_back
+
+# Replaces the register contents by the next state
+reg_back
+  Not d  -> L reg_back
+  d      -> R reg_go
+reg_go
+  Not :: -> R reg_go
+  ::     -> R reg_clear
+reg_clear
+  [A a]  -> P_ R reg_clear
+  _      -> R reg_clear
+  ::     -> ns_back
+ns_back
+  Not d  -> L ns_back
+  d      -> R ns_skip1
+ns_skip1
+  a      -> R ns_skip1
+  D      -> R ns_skip2
+ns_skip2
+  c      -> R ns_skip2
+  D      -> R ns_skip3
+ns_skip3
+  c       -> R ns_skip3
+  [L R N] -> R ns_skip4
+ns_skip4
+  D      -> R ns_find
+ns_find
+  a      -> R ns_find
+  A      -> Pa ns_reg
+  ;      -> done
+ns_reg
+  Not :: -> R ns_reg
+  ::     -> R ns_reg2
+ns_reg2
+  A      -> R ns_reg2
+  _      -> PA ns_back
+
+# Unmarks the instruction and goes back to the beginning
+done
+  a          -> PA L done
+  c          -> PC L done
+  d          -> PD L rewind
+  Not [a c d] -> L done
+rewind
+  Not None -> L rewind
+  None     -> R begin
+"""
+
+INSTRUCTION_REGEX = re.compile("D(A+)D(C*)D(C*)([LRN])D(A+)")
+
+Guest = namedtuple("Guest", ["rules", "state", "cells", "head",
+                             "states", "width"])
+
+Benchmark = namedtuple("Benchmark", ["guest_steps", "plain_seconds",
+                                     "accelerated_seconds", "plain_rate",
+                                     "accelerated_rate"])
+
+
+def _work_area(state, cells, head, states, width):
+    """ Squares after the description: register and guest tape cells """
+    squares = ["::"] + ["A"] * state + ["_"] * (states - state) + ["::"]
+    for idx, symbol in enumerate(cells):
+        squares.append("H" if idx == head else "D")
+        squares.extend(["C"] * symbol + ["_"] * (width - symbol))
+    return squares
+
+
+def encode(tm, left=0):
+    """
+    Tape (list of symbols) for the universal machine to simulate the given
+    TuringMachine from its current complete configuration. The guest tape
+    cells go from the leftmost non-blank square or the head (minus the
+    extra left blank cells) to the rightmost one, as the universal machine
+    locks when the guest leaves its leftmost cell.
+    """
+    symbols = tm.alphabet()
+    states = max([len(tm.mconfs())] + [rule[4]
+                                        for rule in tm.standard_rules()])
+    cells = tm.tape
+    lo = min([tm.index] + list(cells)) - left
+    hi = max([tm.index] + list(cells))
+    unknown = set(cells.values()).difference(symbols)
+    if unknown:
+        raise ValueError("Symbols not in the rules: {}".format(
+                         ", ".join(sorted(unknown))))
+    return list(tm.standard_description()) + _work_area(
+        state=tm.mconfs().index(tm.mconf) + 1,
+        cells=[symbols.index(cells.get(idx, "None"))
+               for idx in range(lo, hi + 1)],
+        head=tm.index - lo,
+        states=states,
+        width=len(symbols) - 1,
+    )
+
+
+def universal_machine(tm, left=0):
+    """ Universal TuringMachine whose tape is encode(tm, left) """
+    utm = TuringMachine(UTM_SOURCE)
+    utm.tape = encode(tm, left)
+    return utm
+
+
+def is_cycle_start(utm):
+    """ Tells whether the universal machine is about to simulate a move """
+    return utm.mconf == "begin" and utm.index == 0
+
+
+def decode(utm):
+    """
+    Guest configuration from the universal machine tape at the start of a
+    cycle (see is_cycle_start), where the rules is a dict whose keys are
+    (state, symbol) pairs and whose values are (symbol, move, state)
+    triples, using the indices from the standard description.
+    """
+    if not is_cycle_start(utm):
+        raise ValueError("Not at the start of a universal machine cycle")
+    squares = [utm.tape.get(idx, "None")
+               for idx in range(max(utm.tape) + 1)]
+    sep = squares.index("::")
+    end = squares.index("::", sep + 1)
+    rules = {}
+    for instruction in "".join(squares[:sep]).split(";")[:-1]:
+        i, j, k, move, l = INSTRUCTION_REGEX.match(instruction).groups()
+        rules[len(i), len(j)] = len(k), move, len(l)
+    register = squares[sep + 1:end]
+    cells, head = [], None
+    for square in squares[end + 1:]:
+        if square in ("D", "H"):
+            if square == "H":
+                head = len(cells)
+            cells.append(0)
+        elif square == "C":
+            cells[-1] += 1
+    return Guest(rules=rules, state=register.count("A"), cells=cells,
+                 head=head, states=len(register),
+                 width=(len(squares) - end - 1) // len(cells) - 1)
+
+
+def fast_forward(utm, guest_steps):
+    """
+    Host-assisted run of the universal machine: the guest is decoded from
+    its tape and simulated natively, then the tape is encoded back exactly
+    as the universal machine would leave it, at the start of a cycle. The
+    guest steps that would lock the universal machine (no rule, or leaving
+    the leftmost cell) aren't simulated. Returns the amount of guest steps
+    simulated. The utm.steps counter isn't changed.
+    """
+    guest = decode(utm)
+    rules, state, cells, head = guest.rules, guest.state, \
+                                list(guest.cells), guest.head
+    done = 0
+    while done < guest_steps:
+        try:
+            symbol, move, new_state = rules[state, cells[head]]
+        except KeyError:
+            break
+        if move == "L" and head == 0:
+            break
+        cells[head] = symbol
+        if move == "R":
+            head += 1
+            if head == len(cells):
+                cells.append(0)
+        elif move == "L":
+            head -= 1
+        state = new_state
+        done += 1
+    if done:
+        start = min(idx for idx, square in utm.tape.items()
+                        if square == "::")
+        tape = {idx: square for idx, square in utm.tape.items()
+                if idx < start}
+        work = _work_area(state, cells, head, guest.states, guest.width)
+        tape.update(enumerate(work, start))
+        utm.tape = tape
+    return done
+
+
+def run_guest(utm, guest_steps, accelerate=False):
+    """
+    Runs the universal machine until it simulates the given amount of
+    guest steps (moves), using fast_forward when accelerate is True. It
+    should start at a cycle start, and it ends at one. Raises TMLocked
+    when the guest machine gets locked (or leaves its leftmost cell).
+    """
+    done = 0
+    while done < guest_steps:
+        if accelerate:
+            done += fast_forward(utm, guest_steps - done)
+            if done == guest_steps:
+                break
+        utm.move()
+        while not is_cycle_start(utm):
+            utm.move()
+        done += 1
+    return done
+
+
+def benchmark(tm, guest_steps, left=None):
+    """
+    Guest steps per second of the universal machine simulating the given
+    TuringMachine, without and with the host-assisted acceleration. The
+    default amount of extra left blank cells is the amount of steps.
+    """
+    if left is None:
+        left = guest_steps
+    plain, accelerated = [universal_machine(tm, left) for unused in "ab"]
+    start = time.time()
+    run_guest(plain, guest_steps)
+    middle = time.time()
+    run_guest(accelerated, guest_steps, accelerate=True)
+    end = time.time()
+    if plain.tape != accelerated.tape:
+        raise ValueError("The accelerated run diverged")
+    plain_seconds, accelerated_seconds = middle - start, end - middle
+    return Benchmark(
+        guest_steps=guest_steps,
+        plain_seconds=plain_seconds,
+        accelerated_seconds=accelerated_seconds,
+        plain_rate=guest_steps / max(plain_seconds, 1e-9),
+        accelerated_rate=guest_steps / max(accelerated_seconds, 1e-9),
+    )
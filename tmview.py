@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Created on Tue Oct 20 09:31:47 2026
+# MIT Licensed. See COPYING.TXT for more information.
+""" Bounded tape views, with collapsed runs and cursor-based paging """
+
+from __future__ import unicode_literals, print_function
+from collections import namedtuple
+from bisect import bisect_left
+
+__all__ = ["MAX_RUNS", "Run", "TapeView", "tape_runs", "view", "window",
+           "render", "as_dict", "report"]
+
+MAX_RUNS = 200 # Default maximum amount of runs in a single view (page)
+
+Run = namedtuple("Run", ["start", "symbol", "count"])
+
+TapeView = namedtuple("TapeView", ["start", "stop", "head", "runs",
+                                   "cursor"])
+
+
+def tape_runs(tape, start, stop, max_runs=None):
+    """
+    List of the runs (Run instances) of equal consecutive symbols in the
+    tape dict from the start index up to (but not including) the stop
+    index, with at most max_runs runs, and the index where the next run
+    would start (or None when it reached the stop index). Blank squares
+    (not in the tape dict) have the "None" symbol. The time it takes
+    depends on the amount of non-blank squares, not on the range size.
+    """
+    keys = sorted(tape)
+    idx = bisect_left(keys, start)
+    runs = []
+    pos = start
+    while pos < stop:
+        if max_runs is not None and len(runs) >= max_runs:
+            return runs, pos
+        following = keys[idx] if idx < len(keys) and keys[idx] < stop \
+                               else stop
+        if following > pos: # Blank squares before the next symbol
+            runs.append(Run(pos, "None", following - pos))
+            pos = following
+            continue
+        symbol = tape[pos]
+        count = 1
+        idx += 1
+        while idx < len(keys) and keys[idx] == pos + count < stop and \
+              tape[keys[idx]] == symbol:
+            count += 1
+            idx += 1
+        runs.append(Run(pos, symbol, count))
+        pos += count
+    return runs, None
+
+
+def view(tm, start=None, stop=None, cursor=None, max_runs=MAX_RUNS):
+    """
+    TapeView of the machine tape from the start index up to (but not
+    including) the stop index, which defaults to the range with every
+    non-blank square and the head. The cursor is the index where the view
+    begins, for the next pages (it's the cursor of the previous view).
+    """
+    tape = tm.tape
+    if start is None:
+        start = min([tm.index] + list(tape))
+    if stop is None:
+        stop = max([tm.index] + list(tape)) + 1
+    runs, next_cursor = tape_runs(tape, start if cursor is None else cursor,
+                                  stop, max_runs)
+    return TapeView(start=start, stop=stop, head=tm.index, runs=runs,
+                    cursor=next_cursor)
+
+
+def window(tm, radius, cursor=None, max_runs=MAX_RUNS):
+    """ TapeView with the squares at most radius squares from the head """
+    return view(tm, tm.index - radius, tm.index + radius + 1, cursor,
+                max_runs)
+
+
+def render(tape_view, max_repeat=3):
+    """
+    Whitespace-separated symbols of the view, where runs with more than
+    max_repeat squares are shown as ``symbol*count``, and the head symbol
+    is shown between brackets.
+    """
+    tokens = []
+    for start, symbol, count in tape_view.runs:
+        offset = tape_view.head - start
+        if 0 <= offset < count: # The head splits the run
+            parts = [(offset, symbol), (1, "[{}]".format(symbol)),
+                     (count - offset - 1, symbol)]
+        else:
+            parts = [(count, symbol)]
+        for size, token in parts:
+            if size > max_repeat:
+                tokens.append("{}*{}".format(token, size))
+            else:
+                tokens.extend([token] * size)
+    return " ".join(tokens)
+
+
+def as_dict(tape_view):
+    """ JSON-friendly dict from a TapeView, with runs as lists """
+    result = tape_view._asdict()
+    result["runs"] = [list(run) for run in tape_view.runs]
+    return dict(result)
+
+
+def report(tm, radius=None, max_runs=MAX_RUNS, cursor=None):
+    """
+    Text with the last complete configuration of the machine, showing the
+    tape view (a window when the radius is given) as the CLI does, from
+    the cursor index when given (the one told for the next page).
+    """
+    if radius is None:
+        tape_view = view(tm, cursor=cursor, max_runs=max_runs)
+    else:
+        tape_view = window(tm, radius, cursor, max_runs)
+    lines = [
+        "Last m-configuration: {}".format(getattr(tm, "mconf", None)),
+        "Last machine index on the tape: {}".format(tm.index),
+        "Resulting tape (from index {} to {}, with the head between "
+        "brackets):".format(tape_view.start, tape_view.stop - 1),
+        render(tape_view),
+    ]
+    if tape_view.cursor is not None:
+        lines.append("(and more squares from the index {})"
+                     .format(tape_view.cursor))
+    return "\n".join(lines)